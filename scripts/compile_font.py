@@ -0,0 +1,86 @@
+import sys, os, re, struct
+
+FONT_MAGIC = b"XFNT"
+
+def compile_font(input_file, output_file, width=None, height=None, start_letter=32):
+    """
+    Convert an X-GLCD 'C' font file into the binary .xfnt format loaded by XglcdFont.
+
+    Layout: magic, width, height, first letter, letter count, bytes per letter
+    (big-endian 16 bit), width table (one byte per letter), then the letters in
+    X-GLCD layout (width byte followed by the column bytes).
+
+    Args:
+        input_file: Path to the .c font file
+        output_file: Path to the .xfnt output file
+        width: Maximum letter width, read from the "GLCD FontSize" comment if omitted
+        height: Letter height, read from the "GLCD FontSize" comment if omitted
+        start_letter: ASCII code of the first letter
+    Returns:
+        bytes: The compiled font
+    """
+    with open(input_file, "r") as f:
+        source = f.read()
+
+    if width is None or height is None:
+        size = re.search(r"FontSize\s*:\s*(\d+)\s*x\s*(\d+)", source)
+        if size is None:
+            raise ValueError("Font size not found, pass width and height")
+        width, height = int(size.group(1)), int(size.group(2))
+
+    bytes_per_letter = ((max(height, 8) - 1) // 8 + 1) * width + 1
+    letters = bytearray()
+    for line in source.splitlines():
+        line = line.strip()
+        if not line.startswith("0x"):
+            continue
+        line = line.split("//")[0].strip().rstrip(",")
+        values = [int(b, 16) for b in line.split(",")]
+        if len(values) != bytes_per_letter:
+            raise ValueError(f"Letter {len(letters) // bytes_per_letter} has {len(values)} bytes, expected {bytes_per_letter}")
+        letters.extend(values)
+
+    letter_count = len(letters) // bytes_per_letter
+    if not 0 < letter_count < 256:
+        raise ValueError(f"Found {letter_count} letters, expected 1 to 255")
+
+    widths = bytes(letters[i * bytes_per_letter] for i in range(letter_count))
+    data = FONT_MAGIC + struct.pack(">BBBBH", width, height, start_letter, letter_count, bytes_per_letter) + widths + letters
+    if output_file.endswith(".py"):
+        with open(output_file, "w") as f:
+            f.write(font_module(data, input_file))
+    else:
+        with open(output_file, "wb") as f:
+            f.write(data)
+    return data
+
+def font_module(data, source_name):
+    """
+    Render compiled font data as a Python module with a FONT bytes constant.
+
+    Frozen into the MicroPython firmware, the constant stays in flash and
+    XglcdFont(FONT) reads it through memoryviews without copying it to the heap.
+
+    Args:
+        data: Compiled font data
+        source_name: Name of the font source, for the module comment
+    Returns:
+        str: Module source
+    """
+    lines = [f"# Compiled from {os.path.basename(source_name)} by compile_font.py, do not edit", "FONT = ("]
+    for i in range(0, len(data), 32):
+        lines.append("    b\"" + "".join(f"\\x{b:02x}" for b in data[i:i + 32]) + "\"")
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 5):
+        print("Usage: compile_font.py input.c output.xfnt|output.py [width height]")
+        print("Example: compile_font.py fonts/ILIFont10x19.c ../src/fonts/ILIFont10x19.xfnt")
+        print("Use the .py extension for a module to freeze into the firmware (font stays in flash)")
+        sys.exit(1)
+
+    size = (int(sys.argv[3]), int(sys.argv[4])) if len(sys.argv) == 5 else (None, None)
+    print(f"Compiling {sys.argv[1]} to {sys.argv[2]}")
+    data = compile_font(sys.argv[1], sys.argv[2], *size)
+    print(f"Compilation complete! ({len(data)} bytes)")
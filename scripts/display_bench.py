@@ -0,0 +1,49 @@
+import sys, os, time
+
+# Make the firmware sources and the host stand-ins of the tests importable
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+if not hasattr(time, "sleep_ms"):
+    time.sleep_ms = lambda ms: None
+
+from drivers.ILI9488 import ILI9488
+from drivers.xglcd_font import XglcdFont
+from fakes import FakePin, FakeSPI, measure
+
+def run_bench():
+    spi, cs, dc, rst = FakeSPI(), FakePin(), FakePin(), FakePin()
+    font = XglcdFont(os.path.join(ROOT, "src", "fonts", "ILIFont10x19.xfnt"))
+    price_font = XglcdFont(os.path.join(ROOT, "src", "fonts", "PriceFont15x33.xfnt"))
+    display = ILI9488(spi, cs, dc, rst, 0, font)
+
+    def price():
+        display.set_font(price_font)
+        display.text(343, 91, "1,79", ILI9488.BLACK, 2, ILI9488.WHITE, 6)
+        display.set_font(font)
+
+    cases = [
+        ("init_display", display.init_display),
+        ("rotate", lambda: display.rotate(0)),
+        ("set_window", lambda: display.set_window(10, 10, 20, 20)),
+        ("pixel", lambda: display.pixel(10, 10, ILI9488.RED)),
+        ("line 100px", lambda: display.line(0, 0, 99, 60, ILI9488.BLACK)),
+        ("line 45deg", lambda: display.line(0, 0, 99, 99, ILI9488.BLACK)),
+        ("hline", lambda: display.hline(0, 80, 480, ILI9488.BLACK)),
+        ("circle r=40", lambda: display.circle(240, 160, 40, ILI9488.BLACK)),
+        ("fill_circle r=40", lambda: display.fill_circle(240, 160, 40, ILI9488.BLUE)),
+        ("arc 270deg t=8", lambda: display.arc(240, 160, 60, 135, 45, ILI9488.GREEN, 8)),
+        ("fill_round_rect", lambda: display.fill_round_rect(332, 82, 148, 78, 10, ILI9488.GREEN)),
+        ("fill_rect 148x78", lambda: display.fill_rect(332, 82, 148, 78, ILI9488.GREEN)),
+        ("fill_screen", lambda: display.fill_screen(ILI9488.WHITE)),
+        ("text 'STATUS UNKNOWN'", lambda: display.text(90, 133, "STATUS UNKNOWN", ILI9488.BLACK, 1, ILI9488.WHITE)),
+        ("text price x2", price),
+    ]
+
+    print(f"{'primitive':<24}{'CS frames':>10}{'writes':>10}{'bytes':>10}{'DC toggles':>12}")
+    for name, action in cases:
+        frames, writes, sent, toggles = measure(display, cs, dc, action)
+        print(f"{name:<24}{frames:>10}{writes:>10}{sent:>10}{toggles:>12}")
+
+if __name__ == "__main__":
+    run_bench()
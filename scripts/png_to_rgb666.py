@@ -1,8 +1,97 @@
-import sys, ast
+import sys, ast, struct
 from PIL import Image
 
+RLE_MAGIC = b"RLE6"
+IDX_MAGIC = b"IDX6"
+
+def rgb666_to_rle666(rgb666_data, width, height):
+    """Run-length encode RGB666 pixel data (.rle666 format).
+
+    Layout: magic, width and height (big-endian 16 bit), then runs. A control
+    byte with the high bit set repeats the following pixel (control & 0x7F) + 1
+    times, otherwise (control + 1) literal pixels follow.
+
+    Args:
+        rgb666_data: Raw RGB666 data (3 bytes per pixel, row-major)
+        width: Image width in pixels
+        height: Image height in pixels
+    Returns:
+        bytes: Encoded image
+    """
+    pixels = [bytes(rgb666_data[i:i + 3]) for i in range(0, len(rgb666_data), 3)]
+    out = bytearray(RLE_MAGIC + struct.pack(">HH", width, height))
+    literal = []
+
+    def flush_literal():
+        while literal:
+            chunk = literal[:128]
+            del literal[:128]
+            out.append(len(chunk) - 1)
+            for pixel in chunk:
+                out.extend(pixel)
+
+    i = 0
+    while i < len(pixels):
+        run = 1
+        while i + run < len(pixels) and run < 128 and pixels[i + run] == pixels[i]:
+            run += 1
+        if run >= 2:
+            flush_literal()
+            out.append(0x80 | (run - 1))
+            out.extend(pixels[i])
+        else:
+            literal.append(pixels[i])
+        i += run
+    flush_literal()
+    return bytes(out)
+
+def rgb666_to_idx666(rgb666_data, width, height):
+    """Encode RGB666 pixel data as a palette-indexed image (.idx666 format).
+
+    The smallest bit depth (1, 2, 4 or 8 bits per pixel) that holds all colors
+    of the image is chosen, so the conversion is lossless.
+
+    Layout: magic, width and height (big-endian 16 bit), bits per pixel,
+    palette size - 1, palette (3 bytes per color), then the pixel indices
+    packed MSB first without row padding.
+
+    Args:
+        rgb666_data: Raw RGB666 data (3 bytes per pixel, row-major)
+        width: Image width in pixels
+        height: Image height in pixels
+    Returns:
+        bytes: Encoded image
+    Raises:
+        ValueError: If the image has more than 256 colors
+    """
+    pixels = [bytes(rgb666_data[i:i + 3]) for i in range(0, len(rgb666_data), 3)]
+    palette = sorted(set(pixels))
+    if len(palette) > 256:
+        raise ValueError(f"Image has {len(palette)} colors, at most 256 fit a palette")
+    bpp = next(b for b in (1, 2, 4, 8) if len(palette) <= 1 << b)
+    index = {color: i for i, color in enumerate(palette)}
+
+    out = bytearray(IDX_MAGIC + struct.pack(">HHBB", width, height, bpp, len(palette) - 1))
+    for color in palette:
+        out.extend(color)
+    byte = 0
+    bits = 0
+    for pixel in pixels:
+        byte = (byte << bpp) | index[pixel]
+        bits += bpp
+        if bits == 8:
+            out.append(byte)
+            byte = 0
+            bits = 0
+    if bits:
+        out.append(byte << (8 - bits))
+    return bytes(out)
+
 def png_to_rgb666(input_file, output_file=None, background=(255, 255, 255)):
     """Convert PNG to RGB666 with transparent pixels replaced by specified background.
+
+    If the output file name ends with .rle666 or .idx666, the run-length
+    encoded or palette-indexed format is written instead of raw pixels.
     
     Args:
         input_file: Path to PNG file
@@ -35,14 +124,20 @@ def png_to_rgb666(input_file, output_file=None, background=(255, 255, 255)):
     
     if output_file:
         with open(output_file, 'wb') as f:
-            f.write(rgb666_data)
+            if output_file.endswith(".rle666"):
+                f.write(rgb666_to_rle666(rgb666_data, width, height))
+            elif output_file.endswith(".idx666"):
+                f.write(rgb666_to_idx666(rgb666_data, width, height))
+            else:
+                f.write(rgb666_data)
     
     return bytes(rgb666_data)
 
 if __name__ == "__main__":
     if len(sys.argv) < 3:
-        print("Usage: png_to_rgb666.py input.png output.rgb666 [background]")
+        print("Usage: png_to_rgb666.py input.png output.rgb666|output.rle666|output.idx666 [background]")
         print("Example: png_to_rgb666.py icon.png icon.rgb666 (255,255,255)")
+        print("Use the .rle666 (run-length encoded) or .idx666 (palette, at most 256 colors) extension for smaller images")
         sys.exit(1)
 
     input_png = sys.argv[1]
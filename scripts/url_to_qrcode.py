@@ -1,4 +1,5 @@
 import sys, qrcode
+from PIL import Image
 
 if len(sys.argv) != 3:
     print("Usage: python url_to_qrcode.py <URL> <output_filename.png>")
@@ -18,6 +19,6 @@ qr = qrcode.QRCode(
 qr.add_data(url)
 qr.make(fit=True)
 img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
-img = img.resize((100, 100))
+img = img.resize((100, 100), Image.NEAREST) # Keep the modules pure black and white (1 bit per pixel as .idx666)
 img.save(output_file)
 print(f"QR code saved as {output_file}")
\ No newline at end of file
@@ -8,7 +8,7 @@ graphics operations like drawing pixels, lines, rectangles, and text, as well
 as displaying images.
 """
 
-import time, machine
+import io, math, time
 
 # ILI9488 Display Controller Commands
 TFT_NOP = 0x00      # No Operation
@@ -23,7 +23,39 @@ TFT_CASET = 0x2A    # Column Address Set
 TFT_PASET = 0x2B    # Page Address Set
 TFT_RAMWR = 0x2C    # Memory Write
 TFT_RAMRD = 0x2E    # Memory Read
+TFT_VSCRDEF = 0x33  # Vertical Scrolling Definition
 TFT_MADCTL = 0x36   # Memory Access Control
+TFT_VSCRSADD = 0x37 # Vertical Scrolling Start Address
+
+SCROLL_LINES = 480 # Lines along the native (portrait) vertical axis that hardware scrolling moves
+STRIPE_ROWS = 20  # Full-width pixel rows held by the shared stripe buffer
+
+# Run-length encoded RGB666 images (.rle666): magic, width and height (big-endian 16 bit), then runs.
+# A control byte with the high bit set repeats the following pixel (control & 0x7F) + 1 times,
+# otherwise (control + 1) literal pixels follow.
+RLE_MAGIC = b"RLE6"
+
+# Palette-indexed RGB666 images (.idx666): magic, width and height (big-endian 16 bit), bits per pixel
+# (1, 2, 4 or 8), palette size - 1, palette (3 bytes per color), then the pixel indices packed MSB first.
+IDX_MAGIC = b"IDX6"
+
+# Power-on register configuration as (command, parameters, delay in ms after the command)
+INIT_SEQUENCE = (
+    (0xE0, b"\x00\x03\x09\x08\x16\x0A\x3F\x78\x4C\x09\x0A\x08\x16\x1A\x0F", 0), # Positive Gamma Control
+    (0xE1, b"\x00\x16\x19\x03\x0F\x05\x32\x45\x46\x04\x0E\x0D\x35\x37\x0F", 0), # Negative Gamma Control
+    (0xC0, b"\x17\x15", 0),               # Power Control 1
+    (0xC1, b"\x41", 0),                   # Power Control 2
+    (0xC5, b"\x00\x12\x80", 0),           # VCOM Control
+    (0x3A, b"\x66", 0),                   # Pixel Interface Format, 18-bit colour for SPI (RGB666)
+    (0xB0, b"\x00", 0),                   # Interface Mode Control
+    (0xB1, b"\xA0", 0),                   # Frame Rate Control
+    (0xB4, b"\x02", 0),                   # Display Inversion Control
+    (0xB6, b"\x02\x02\x3B", 0),           # Display Function Control
+    (0xB7, b"\xC6", 0),                   # Entry Mode Set
+    (0xF7, b"\xA9\x51\x2C\x82", 0),       # Adjust Control 3
+    (TFT_SLPOUT, None, 120),              # Exit Sleep Mode
+    (TFT_DISPON, None, 25)                # Turn Display On
+)
 
 def RGB(r, g, b):
     """Converts individual R, G, B color components into a tuple.
@@ -38,6 +70,183 @@ def RGB(r, g, b):
     """
     return r, g, b
 
+def _half_line(slope, offset, sign):
+    """Returns the X-range of a pixel row on one side of a ray through the center.
+
+    Solves sign * (slope * x - offset) >= 0 for x.
+
+    Args:
+        slope (float): Factor of x.
+        offset (float): Value slope * x is compared with.
+        sign (int): 1 for slope * x >= offset, -1 for slope * x <= offset.
+
+    Returns:
+        tuple: Inclusive integer range (lo, hi), empty if lo > hi.
+    """
+    if -1e-9 < slope < 1e-9:
+        return (-9999, 9999) if sign * -offset >= -1e-9 else (1, 0)
+    bound = offset / slope
+    if (sign > 0) == (slope > 0):
+        return math.ceil(bound - 1e-9), 9999
+    return -9999, math.floor(bound + 1e-9)
+
+def _intersect(a, b):
+    return max(a[0], b[0]), min(a[1], b[1])
+
+class StreamReader:
+    """Buffered reader for decoding images from a stream in small chunks."""
+
+    def __init__(self, stream, buffer_size=256):
+        """
+        Initializes the reader.
+
+        Args:
+            stream: Object providing readinto(), e.g. an open file or io.BytesIO.
+            buffer_size (int, optional): Size of the read-ahead buffer for single bytes. Defaults to 256.
+        """
+        self.stream = stream
+        self.buf = bytearray(buffer_size)
+        self.pos = 0
+        self.length = 0
+
+    def byte(self):
+        """Returns the next byte of the stream.
+
+        Returns:
+            int: The byte value.
+
+        Raises:
+            EOFError: If the stream ended.
+        """
+        if self.pos == self.length:
+            self.length = self.stream.readinto(self.buf) or 0
+            self.pos = 0
+            if not self.length:
+                raise EOFError("Image data ended early")
+        value = self.buf[self.pos]
+        self.pos += 1
+        return value
+
+    def readinto(self, dest):
+        """Fills a buffer completely, reading large blocks straight from the stream.
+
+        Args:
+            dest (memoryview): Buffer to fill.
+
+        Raises:
+            EOFError: If the stream ended.
+        """
+        total = len(dest)
+        got = min(total, self.length - self.pos)
+        dest[:got] = memoryview(self.buf)[self.pos:self.pos + got]
+        self.pos += got
+        while got < total:
+            count = self.stream.readinto(dest[got:])
+            if not count:
+                raise EOFError("Image data ended early")
+            got += count
+
+class Transaction:
+    """Batches command and data writes into a single chip select frame.
+
+    Chip select stays asserted while the transaction is open, the data/command
+    line is only toggled when switching between command and data bytes, and
+    single bytes are sent from a preallocated scratch buffer. Transactions can
+    be nested, only the outermost one asserts and releases chip select.
+
+    Usage:
+        with display.transaction() as tx:
+            tx.cmd(TFT_MADCTL).data_byte(0x28)
+    """
+
+    def __init__(self, spi, cs, dc):
+        """
+        Initializes the transaction builder.
+
+        Args:
+            spi (machine.SPI): Configured SPI bus object.
+            cs (machine.Pin): Chip Select pin object.
+            dc (machine.Pin): Data/Command pin object.
+        """
+        self.spi = spi
+        self.cs = cs
+        self.dc = dc
+        self._depth = 0
+        self._mode = -1 # Current level of the data/command line, -1 if unknown
+        self._byte = bytearray(1)
+        self.queue = None
+        self.recorder = None
+
+    def __enter__(self):
+        if self._depth == 0 and self.queue is None:
+            self._mode = -1
+            self.cs.value(0) # Assert Chip Select
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+        if self._depth == 0 and self.queue is None:
+            self.cs.value(1) # De-assert Chip Select
+        return False
+
+    def _write(self, mode, data):
+        """Writes bytes with the data/command line at the given level.
+
+        Args:
+            mode (int): 0 for command bytes, 1 for data bytes.
+            data (bytes): Buffer to send.
+        """
+        if self.recorder is not None:
+            self.recorder.write(mode, data)
+        if self.queue is not None:
+            self.queue.write(mode, data)
+            return
+        if self._mode != mode:
+            self.dc.value(mode) # Set Data/Command mode
+            self._mode = mode
+        self.spi.write(data)
+
+    def cmd(self, cmd, params=None):
+        """Sends a command byte, optionally followed by its parameter bytes.
+
+        Args:
+            cmd (int): The command byte to send.
+            params (bytes, optional): Parameter bytes for the command. Defaults to None.
+
+        Returns:
+            Transaction: The transaction itself, for chaining.
+        """
+        self._byte[0] = cmd
+        self._write(0, self._byte)
+        if params:
+            self.data(params)
+        return self
+
+    def data(self, data):
+        """Sends data bytes.
+
+        Args:
+            data (bytes): Buffer to send (bytes, bytearray or memoryview).
+
+        Returns:
+            Transaction: The transaction itself, for chaining.
+        """
+        self._write(1, data)
+        return self
+
+    def data_byte(self, value):
+        """Sends a single data byte from the scratch buffer.
+
+        Args:
+            value (int): The byte to send.
+
+        Returns:
+            Transaction: The transaction itself, for chaining.
+        """
+        self._byte[0] = value
+        return self.data(self._byte)
+
 class ILI9488:
     """Driver for the ILI9488 TFT LCD display controller.
 
@@ -57,7 +266,7 @@ class ILI9488:
     ORANGE  = RGB(255, 165, 0)
     PURPLE  = RGB(128, 0, 128)
 
-    def __init__(self, spi, cs, dc, rst, rotation=0, font = None):
+    def __init__(self, spi, cs, dc, rst, rotation=0, font = None, chunk_size=4096):
         """
         Initializes the ILI9488 display driver.
 
@@ -68,6 +277,7 @@ class ILI9488:
             rst (machine.Pin): Reset pin object.
             rotation (int, optional): Initial screen rotation in degrees (0, 90, 180, 270). Defaults to 0.
             font (XglcdFont, optional): Default font object to use for text rendering. Defaults to None.
+            chunk_size (int, optional): Size of the buffer images are streamed from files through. Defaults to 4096.
         """
         self.spi = spi
         self.cs = cs
@@ -77,6 +287,19 @@ class ILI9488:
         self.height = 320 # Default height for 0/180 rotation
         self.rotation = rotation
         self.font = font
+        # Shared stripe buffer for solid fills and text composition, allocated once
+        self._stripe = bytearray(3 * 480 * STRIPE_ROWS)
+        self._stripe_color = None # Color the stripe is currently filled with, None if it holds other data
+        self._stripe_filled = 0   # Number of bytes filled with that color
+        self._index_table = None  # Expansion table of the last indexed image as (key, table)
+        # Chunk buffer for streaming images from files, allocated once
+        self._chunk = bytearray(chunk_size)
+        # Scratch buffers for window addresses and single pixels
+        self._window = bytearray(4)
+        self._pixel = bytearray(3)
+        self._scroll = bytearray(6)
+        self._tx = Transaction(spi, cs, dc)
+        self.queue = None
 
         # Configure control pins as outputs and set initial states
         self.cs.init(self.cs.OUT, value=1)
@@ -119,8 +342,8 @@ class ILI9488:
             print("Invalid rotation value, skipping...")
 
         # Send new configuration to display
-        self.write_cmd(TFT_MADCTL)
-        self.write_data(madctl)
+        with self._tx as tx:
+            tx.cmd(TFT_MADCTL).data_byte(madctl)
 
     def reset(self):
         """Performs a hardware reset of the display controller."""
@@ -129,16 +352,55 @@ class ILI9488:
         self.rst.value(1) # Pull RST high
         time.sleep_ms(50)
 
+    def transaction(self):
+        """Returns the transaction builder of this display.
+
+        All writes made inside a `with display.transaction() as tx:` block share one chip select frame.
+
+        Returns:
+            Transaction: The (reusable) transaction builder.
+        """
+        return self._tx
+
+    def attach_queue(self, queue):
+        """Routes all subsequent writes through a flush queue.
+
+        Drawing calls then return as soon as their bytes are queued, call flush() as a barrier.
+
+        Args:
+            queue (FlushQueue): The queue to attach, or None to write synchronously again.
+        """
+        self.flush()
+        self.queue = queue
+        self._tx.queue = queue
+
+    def record(self, recorder):
+        """Passes all subsequent writes to a recorder as well, e.g. to capture a snapshot of what is drawn.
+
+        Args:
+            recorder: Object providing write(mode, data), or None to stop recording.
+        """
+        self._tx.recorder = recorder
+
+    def flush(self, wait=True):
+        """Submits queued writes and optionally waits until they have been sent.
+
+        Does nothing if no flush queue is attached.
+
+        Args:
+            wait (bool, optional): Block until all queued bytes are on the bus. Defaults to True.
+        """
+        if self.queue is not None:
+            self.queue.flush(wait)
+
     def write_cmd(self, cmd):
         """Writes a command byte to the display controller.
 
         Args:
             cmd (int): The command byte to send.
         """
-        self.cs.value(0) # Assert Chip Select
-        self.dc.value(0) # Set Data/Command to Command mode
-        self.spi.write(bytearray([cmd]))
-        self.cs.value(1) # De-assert Chip Select
+        with self._tx as tx:
+            tx.cmd(cmd)
 
     def write_data(self, data):
         """Writes data bytes to the display controller.
@@ -146,109 +408,21 @@ class ILI9488:
         Args:
             data (int or bytes): The data to send. Can be a single byte (int) or a bytearray/bytes object.
         """
-        self.cs.value(0) # Assert Chip Select
-        self.dc.value(1) # Set Data/Command to Data mode
-        if isinstance(data, int):
-            self.spi.write(bytearray([data]))
-        else:
-            self.spi.write(data)
-        self.cs.value(1) # De-assert Chip Select
+        with self._tx as tx:
+            if isinstance(data, int):
+                tx.data_byte(data)
+            else:
+                tx.data(data)
 
     def init_display(self):
         """Initializes the ILI9488 display with a sequence of commands and data.
         This sequence configures gamma, power, VCOM, pixel format, frame rate, and other display parameters.
         """
-        # Positive Gamma Control
-        self.write_cmd(0xE0)
-        self.write_data(0x00)
-        self.write_data(0x03)
-        self.write_data(0x09)
-        self.write_data(0x08)
-        self.write_data(0x16)
-        self.write_data(0x0A)
-        self.write_data(0x3F)
-        self.write_data(0x78)
-        self.write_data(0x4C)
-        self.write_data(0x09)
-        self.write_data(0x0A)
-        self.write_data(0x08)
-        self.write_data(0x16)
-        self.write_data(0x1A)
-        self.write_data(0x0F)
-
-        # Negative Gamma Control
-        self.write_cmd(0XE1)
-        self.write_data(0x00)
-        self.write_data(0x16)
-        self.write_data(0x19)
-        self.write_data(0x03)
-        self.write_data(0x0F)
-        self.write_data(0x05)
-        self.write_data(0x32)
-        self.write_data(0x45)
-        self.write_data(0x46)
-        self.write_data(0x04)
-        self.write_data(0x0E)
-        self.write_data(0x0D)
-        self.write_data(0x35)
-        self.write_data(0x37)
-        self.write_data(0x0F)
-
-        # Power Control 1
-        self.write_cmd(0XC0)
-        self.write_data(0x17)
-        self.write_data(0x15)
-
-        # Power Control 2
-        self.write_cmd(0xC1)
-        self.write_data(0x41)
-
-        # VCOM Control
-        self.write_cmd(0xC5)
-        self.write_data(0x00)
-        self.write_data(0x12)
-        self.write_data(0x80)
-
-        # Pixel Interface Format
-        self.write_cmd(0x3A)
-        self.write_data(0x66) # 18-bit colour for SPI (RGB666)
-
-        # Interface Mode Control
-        self.write_cmd(0xB0)
-        self.write_data(0x00)
-
-        # Frame Rate Control
-        self.write_cmd(0xB1)
-        self.write_data(0xA0)
-
-        # Display Inversion Control
-        self.write_cmd(0xB4)
-        self.write_data(0x02)
-
-        # Display Function Control
-        self.write_cmd(0xB6)
-        self.write_data(0x02)
-        self.write_data(0x02)
-        self.write_data(0x3B)
-
-        # Entry Mode Set
-        self.write_cmd(0xB7)
-        self.write_data(0xC6)
-
-        # Adjust Control 3
-        self.write_cmd(0xF7)
-        self.write_data(0xA9)
-        self.write_data(0x51)
-        self.write_data(0x2C)
-        self.write_data(0x82)
-
-        # Exit Sleep Mode
-        self.write_cmd(TFT_SLPOUT)
-        time.sleep_ms(120)
-
-        # Turn Display On
-        self.write_cmd(TFT_DISPON)
-        time.sleep_ms(25)
+        with self._tx as tx:
+            for cmd, params, delay in INIT_SEQUENCE:
+                tx.cmd(cmd, params)
+                if delay:
+                    time.sleep_ms(delay)
 
     def fill_screen(self, color):
         """Fills the entire display with a single color.
@@ -256,17 +430,7 @@ class ILI9488:
         Args:
             color (tuple): RGB color (r, g, b) to fill the screen with.
         """
-        self.set_window(0, 0, self.width - 1, self.height - 1)
-        r, g, b = color
-        # Create a buffer for one row of pixels
-        buf = bytearray(3 * self.width)
-        for i in range(self.width):
-            buf[3 * i] = r
-            buf[3 * i + 1] = g
-            buf[3 * i + 2] = b
-        # Write the buffer for each row to fill the screen
-        for i in range(self.height):
-            self.write_data(buf)
+        self.fill_rect(0, 0, self.width, self.height, color)
 
     def fill_rect(self, x, y, width, height, color):
         """Draws a filled rectangle on the display.
@@ -278,34 +442,45 @@ class ILI9488:
             height (int): Height of the rectangle.
             color (tuple): RGB color (r, g, b) to fill the rectangle with.
         """
-        # Validate coordinates to ensure they are within display bounds
-        if x >= self.width or y >= self.height:
-            return
-            
-        # Clamp rectangle dimensions to display boundaries
+        # Clamp rectangle to display boundaries
         x_end = min(x + width - 1, self.width - 1)
         y_end = min(y + height - 1, self.height - 1)
-        
-        # Calculate actual dimensions after clamping
-        actual_width = x_end - x + 1
-        actual_height = y_end - y + 1
-        
-        # Set the drawing window to the rectangle area
-        self.set_window(x, y, x_end, y_end)
-        
-        # Prepare color data for one row of the rectangle
-        r, g, b = color
-        buf = bytearray(3 * actual_width)
-        
-        # Fill buffer with the specified color
-        for i in range(actual_width):
-            buf[3 * i] = r
-            buf[3 * i + 1] = g
-            buf[3 * i + 2] = b
-        
-        # Write the color buffer for each row to draw the filled rectangle
-        for _ in range(actual_height):
-            self.write_data(buf)
+        x = max(x, 0)
+        y = max(y, 0)
+        if x > x_end or y > y_end:
+            return
+
+        # The window wraps around on its own, so the whole area is one stream of pixels
+        remaining = 3 * (x_end - x + 1) * (y_end - y + 1)
+        stripe = self.__color_stripe(color, remaining)
+        burst = len(stripe)
+
+        # Set the drawing window to the rectangle area and send the stripe in large bursts
+        with self._tx as tx:
+            self.set_window(x, y, x_end, y_end)
+            while remaining > burst:
+                tx.data(stripe)
+                remaining -= burst
+            tx.data(stripe[:remaining])
+
+    def __color_stripe(self, color, length):
+        """Returns the shared stripe buffer filled with a solid color.
+
+        The stripe is only refilled when the color changes or more bytes are needed than already filled.
+
+        Args:
+            color (tuple): RGB color (r, g, b).
+            length (int): Number of bytes that will be sent, a multiple of 3.
+
+        Returns:
+            memoryview: Stripe filled with the color, up to `length` bytes long.
+        """
+        length = min(length, len(self._stripe))
+        if color != self._stripe_color or length > self._stripe_filled:
+            self.__fill_buffer(memoryview(self._stripe), length, color)
+            self._stripe_color = color
+            self._stripe_filled = length
+        return memoryview(self._stripe)[:self._stripe_filled]
 
     def set_window(self, x0, y0, x1, y1):
         """Sets the active window (drawing area) on the display.
@@ -316,19 +491,61 @@ class ILI9488:
             x1 (int): End column address.
             y1 (int): End page (row) address.
         """
-        self.write_cmd(TFT_CASET) # Column address set
-        self.write_data(x0 >> 8)
-        self.write_data(x0 & 0xFF)
-        self.write_data(x1 >> 8)
-        self.write_data(x1 & 0xFF)
+        with self._tx as tx:
+            window = self._window
+            window[0] = x0 >> 8
+            window[1] = x0 & 0xFF
+            window[2] = x1 >> 8
+            window[3] = x1 & 0xFF
+            tx.cmd(TFT_CASET, window) # Column address set
+
+            window[0] = y0 >> 8
+            window[1] = y0 & 0xFF
+            window[2] = y1 >> 8
+            window[3] = y1 & 0xFF
+            tx.cmd(TFT_PASET, window) # Page address set
+
+            tx.cmd(TFT_RAMWR) # Memory write command to prepare for pixel data
+
+    def define_scroll(self, top_fixed, scroll_lines, bottom_fixed=None):
+        """Defines the hardware scrolling area.
+
+        The panel scrolls along its native 480-line axis, which is the screen X-axis in landscape
+        (rotation 0 and 180) and the Y-axis in portrait. The scrolling area always spans the full
+        other axis, e.g. in rotation 0 it is a full-height band of columns that moves horizontally.
+        Lines are counted in frame memory order, from the left edge in rotation 0.
+
+        Args:
+            top_fixed (int): Number of fixed lines before the scrolling area.
+            scroll_lines (int): Number of lines in the scrolling area.
+            bottom_fixed (int, optional): Number of fixed lines after the scrolling area. Defaults to the rest.
+
+        Raises:
+            ValueError: If the areas do not add up to SCROLL_LINES.
+        """
+        if bottom_fixed is None:
+            bottom_fixed = SCROLL_LINES - top_fixed - scroll_lines
+        if min(top_fixed, scroll_lines, bottom_fixed) < 0 or top_fixed + scroll_lines + bottom_fixed != SCROLL_LINES:
+            raise ValueError("Scroll areas must add up to 480 lines")
+        params = self._scroll
+        params[0], params[1] = top_fixed >> 8, top_fixed & 0xFF
+        params[2], params[3] = scroll_lines >> 8, scroll_lines & 0xFF
+        params[4], params[5] = bottom_fixed >> 8, bottom_fixed & 0xFF
+        with self._tx as tx:
+            tx.cmd(TFT_VSCRDEF, params)
 
-        self.write_cmd(TFT_PASET) # Page address set
-        self.write_data(y0 >> 8)
-        self.write_data(y0 & 0xFF)
-        self.write_data(y1 >> 8)
-        self.write_data(y1 & 0xFF)
+    def scroll(self, line):
+        """Sets the frame memory line shown first in the scrolling area.
 
-        self.write_cmd(TFT_RAMWR) # Memory write command to prepare for pixel data
+        Frame memory itself is not changed, window writes keep addressing it unscrolled.
+
+        Args:
+            line (int): Frame memory line, between the first and the last line of the scrolling area.
+        """
+        params = self._scroll
+        params[0], params[1] = line >> 8, line & 0xFF
+        with self._tx as tx:
+            tx.cmd(TFT_VSCRSADD, memoryview(params)[:2])
 
     def pixel(self, x, y, color):
         """Draws a single pixel at the specified coordinates.
@@ -338,11 +555,11 @@ class ILI9488:
             y (int): Y-coordinate of the pixel.
             color (tuple): RGB color (r, g, b) of the pixel.
         """
-        self.set_window(x, y, x, y)
-        r, g, b = color
-        self.write_data(r)
-        self.write_data(g)
-        self.write_data(b)
+        with self._tx as tx:
+            self.set_window(x, y, x, y)
+            pixel = self._pixel
+            pixel[0], pixel[1], pixel[2] = color
+            tx.data(pixel)
 
     def hline(self, x, y, w, color):
         """Draws a horizontal line.
@@ -353,14 +570,7 @@ class ILI9488:
             w (int): Width (length) of the line.
             color (tuple): RGB color (r, g, b) of the line.
         """
-        self.set_window(x, y, x + w - 1, y)
-        r, g, b = color
-        buf = bytearray(3 * w)
-        for i in range(w):
-            buf[3 * i] = r
-            buf[3 * i + 1] = g
-            buf[3 * i + 2] = b
-        self.write_data(buf)
+        self.fill_rect(x, y, w, 1, color)
 
     def vline(self, x, y, h, color):
         """Draws a vertical line.
@@ -371,14 +581,7 @@ class ILI9488:
             h (int): Height (length) of the line.
             color (tuple): RGB color (r, g, b) of the line.
         """
-        self.set_window(x, y, x, y + h - 1)
-        r, g, b = color
-        buf = bytearray(3 * h)
-        for i in range(h):
-            buf[3 * i] = r
-            buf[3 * i + 1] = g
-            buf[3 * i + 2] = b
-        self.write_data(buf)
+        self.fill_rect(x, y, 1, h, color)
 
     def rect(self, x, y, w, h, color):
         """Draws an unfilled rectangle.
@@ -390,14 +593,18 @@ class ILI9488:
             h (int): Height of the rectangle.
             color (tuple): RGB color (r, g, b) of the rectangle borders.
         """
-        self.hline(x, y, w, color)
-        self.hline(x, y + h - 1, w, color)
-        self.vline(x, y, h, color)
-        self.vline(x + w - 1, y, h, color)
+        with self._tx:
+            self.hline(x, y, w, color)
+            self.hline(x, y + h - 1, w, color)
+            self.vline(x, y, h, color)
+            self.vline(x + w - 1, y, h, color)
 
     def line(self, x0, y0, x1, y1, color):
         """Draws a line between two points using Bresenham's algorithm.
 
+        The pixels are grouped into horizontal runs (mostly horizontal lines) or vertical runs
+        (mostly vertical lines), each sent as one filled span.
+
         Args:
             x0 (int): Starting X-coordinate.
             y0 (int): Starting Y-coordinate.
@@ -410,18 +617,227 @@ class ILI9488:
         sx = 1 if x0 < x1 else -1
         sy = 1 if y0 < y1 else -1
         err = dx - dy
+        run_x = x0
+        run_y = y0
+
+        with self._tx:
+            while True:
+                if x0 == x1 and y0 == y1:
+                    break
+                e2 = 2 * err
+                step_x = e2 > -dy
+                step_y = e2 < dx
+                if dx >= dy and step_y:
+                    # Row changes, send the horizontal run collected so far
+                    self.fill_rect(min(run_x, x0), y0, abs(x0 - run_x) + 1, 1, color)
+                    run_x = x0 + sx
+                    run_y = y0 + sy
+                elif dx < dy and step_x:
+                    # Column changes, send the vertical run collected so far
+                    self.fill_rect(x0, min(run_y, y0), 1, abs(y0 - run_y) + 1, color)
+                    run_x = x0 + sx
+                    run_y = y0 + sy
+                if step_x:
+                    err -= dy
+                    x0 += sx
+                if step_y:
+                    err += dx
+                    y0 += sy
+            self.fill_rect(min(run_x, x0), min(run_y, y0), abs(x0 - run_x) + 1, abs(y0 - run_y) + 1, color)
+
+    def circle(self, x0, y0, r, color):
+        """Draws the outline of a circle.
+
+        Args:
+            x0 (int): X-coordinate of the center.
+            y0 (int): Y-coordinate of the center.
+            r (int): Radius of the circle.
+            color (tuple): RGB color (r, g, b) of the circle.
+        """
+        self.__round_shape(x0, y0, x0, y0, r, color, False)
+
+    def fill_circle(self, x0, y0, r, color):
+        """Draws a filled circle.
+
+        Args:
+            x0 (int): X-coordinate of the center.
+            y0 (int): Y-coordinate of the center.
+            r (int): Radius of the circle.
+            color (tuple): RGB color (r, g, b) to fill the circle with.
+        """
+        self.__round_shape(x0, y0, x0, y0, r, color, True)
+
+    def round_rect(self, x, y, w, h, r, color):
+        """Draws the outline of a rectangle with rounded corners.
+
+        Args:
+            x (int): X-coordinate of the top-left corner.
+            y (int): Y-coordinate of the top-left corner.
+            w (int): Width of the rectangle.
+            h (int): Height of the rectangle.
+            r (int): Corner radius, limited to half of the shorter side.
+            color (tuple): RGB color (r, g, b) of the rectangle borders.
+        """
+        r = max(0, min(r, (w - 1) // 2, (h - 1) // 2))
+        self.__round_shape(x + r, y + r, x + w - 1 - r, y + h - 1 - r, r, color, False)
+
+    def fill_round_rect(self, x, y, w, h, r, color):
+        """Draws a filled rectangle with rounded corners.
+
+        Args:
+            x (int): X-coordinate of the top-left corner.
+            y (int): Y-coordinate of the top-left corner.
+            w (int): Width of the rectangle.
+            h (int): Height of the rectangle.
+            r (int): Corner radius, limited to half of the shorter side.
+            color (tuple): RGB color (r, g, b) to fill the rectangle with.
+        """
+        r = max(0, min(r, (w - 1) // 2, (h - 1) // 2))
+        self.__round_shape(x + r, y + r, x + w - 1 - r, y + h - 1 - r, r, color, True)
+
+    def arc(self, x0, y0, r, start_angle, end_angle, color, thickness=1):
+        """Draws an arc (a ring segment) of a circle.
+
+        Angles are in degrees, measured clockwise from the positive X-axis (3 o'clock), and the
+        arc runs clockwise from start_angle to end_angle. Each pixel row of the ring is clipped
+        to the angle range and sent as at most two spans per side of the center.
+
+        Args:
+            x0 (int): X-coordinate of the center.
+            y0 (int): Y-coordinate of the center.
+            r (int): Outer radius of the arc.
+            start_angle (float): Angle where the arc starts.
+            end_angle (float): Angle where the arc ends.
+            color (tuple): RGB color (r, g, b) of the arc.
+            thickness (int, optional): Width of the ring in pixels. Defaults to 1.
+        """
+        sweep = (end_angle - start_angle) % 360 or 360
+        a = math.radians(start_angle)
+        b = math.radians(start_angle + sweep)
+        ax, ay = math.cos(a), math.sin(a)
+        bx, by = math.cos(b), math.sin(b)
+        outer = self.__circle_extents(r)
+        inner_r = r - thickness
+        inner = self.__circle_extents(inner_r) if inner_r >= 0 else None
+
+        with self._tx:
+            for dy in range(-r, r + 1):
+                xo = outer[abs(dy)]
+                if inner is None or abs(dy) > inner_r:
+                    segments = ((-xo, xo),)
+                else:
+                    xi = inner[abs(dy)]
+                    segments = ((-xo, -xi - 1), (xi + 1, xo))
+                if sweep >= 360:
+                    ranges = ((-xo, xo),)
+                else:
+                    # Half-planes left of the start ray and right of the end ray
+                    after_start = _half_line(ay, ax * dy, -1)
+                    before_end = _half_line(by, bx * dy, 1)
+                    if sweep <= 180:
+                        ranges = (_intersect(after_start, before_end),)
+                    else:
+                        ranges = (after_start, before_end)
+                for s0, s1 in segments:
+                    for lo, hi in ranges:
+                        lo = max(s0, lo)
+                        hi = min(s1, hi)
+                        if lo <= hi:
+                            self.fill_rect(x0 + lo, y0 + dy, hi - lo + 1, 1, color)
+
+    def __octant_runs(self, r):
+        """Yields the runs of the first octant of a midpoint circle.
+
+        Args:
+            r (int): Radius of the circle.
+
+        Yields:
+            tuple: (first x, last x, y) of every run of pixels sharing a row, from the top down.
+        """
+        x = 0
+        y = r
+        d = 1 - r
+        start = 0
+        while x <= y:
+            if d < 0:
+                d += 2 * x + 3
+            else:
+                yield start, x, y
+                start = x + 1
+                d += 2 * (x - y) + 5
+                y -= 1
+            x += 1
+        if start < x:
+            yield start, x - 1, y
+
+    def __circle_extents(self, r):
+        """Returns the half-widths of a filled midpoint circle per row offset.
+
+        Args:
+            r (int): Radius of the circle.
+
+        Returns:
+            list: Half-width of the circle at row offsets 0 to r from the center.
+        """
+        extents = [0] * (r + 1)
+        for xa, xb, y in self.__octant_runs(r):
+            extents[y] = max(extents[y], xb)
+            for x in range(xa, xb + 1):
+                extents[x] = max(extents[x], y)
+        return extents
 
-        while True:
-            self.pixel(x0, y0, color)
-            if x0 == x1 and y0 == y1:
-                break
-            e2 = 2 * err
-            if e2 > -dy:
-                err -= dy
-                x0 += sx
-            if e2 < dx:
-                err += dx
-                y0 += sy
+    def __round_shape(self, left, top, right, bottom, r, color, filled):
+        """Draws a circle stretched to a rounded rectangle from spans.
+
+        The corner arcs are centered on (left, top), (right, top), (left, bottom) and
+        (right, bottom). Runs of the first circle octant are mirrored into all eight
+        octants, horizontal runs become row spans and their mirror images column spans.
+        A filled shape is sent as one span per row, rows of equal width are merged.
+
+        Args:
+            left (int): X-coordinate of the left corner centers.
+            top (int): Y-coordinate of the upper corner centers.
+            right (int): X-coordinate of the right corner centers.
+            bottom (int): Y-coordinate of the lower corner centers.
+            r (int): Radius of the corners.
+            color (tuple): RGB color (r, g, b) of the shape.
+            filled (bool): Fill the shape instead of drawing its outline.
+        """
+        if r < 0 or left > right or top > bottom:
+            return
+        fill_rect = self.fill_rect
+        inner_w = right - left + 1
+        with self._tx:
+            if filled:
+                extents = self.__circle_extents(r)
+                # The rows between the corner centers have the full width
+                dy = 1
+                while dy <= r and extents[dy] == r:
+                    dy += 1
+                fill_rect(left - r, top - dy + 1, inner_w + 2 * r, bottom - top + 2 * dy - 1, color)
+                while dy <= r:
+                    half = extents[dy]
+                    first = dy
+                    while dy <= r and extents[dy] == half:
+                        dy += 1
+                    fill_rect(left - half, top - dy + 1, inner_w + 2 * half, dy - first, color)
+                    fill_rect(left - half, bottom + first, inner_w + 2 * half, dy - first, color)
+                return
+            # Straight edges between the corners
+            fill_rect(left + 1, top - r, inner_w - 2, 1, color)
+            fill_rect(left + 1, bottom + r, inner_w - 2, 1, color)
+            fill_rect(left - r, top + 1, 1, bottom - top - 1, color)
+            fill_rect(right + r, top + 1, 1, bottom - top - 1, color)
+            for xa, xb, y in self.__octant_runs(r):
+                length = xb - xa + 1
+                fill_rect(left - xb, top - y, length, 1, color)
+                fill_rect(right + xa, top - y, length, 1, color)
+                fill_rect(left - xb, bottom + y, length, 1, color)
+                fill_rect(right + xa, bottom + y, length, 1, color)
+                fill_rect(left - y, top - xb, 1, length, color)
+                fill_rect(right + y, top - xb, 1, length, color)
+                fill_rect(left - y, bottom + xa, 1, length, color)
+                fill_rect(right + y, bottom + xa, 1, length, color)
     
     def text(self, x, y, text_str, color,  scale=1, background_color=None, spacing=1):
         """Draws text on the display using the currently set font.
@@ -442,46 +858,75 @@ class ILI9488:
         if scale < 1:
             scale = 1  # Ensure scale is at least 1
 
-        current_x = x
+        if background_color is None:
+            # Transparent gaps between characters, draw each glyph separately
+            current_x = x
+            for char_code in text_str:
+                # Get (cached) character bitmap data from the font object
+                char_data, char_width, char_height = self.font.get_glyph(char_code, color, background_color, scale)
+                if char_data:
+                    with self._tx as tx:
+                        self.set_window(current_x, y, current_x + char_width - 1, y + char_height - 1)
+                        tx.data(char_data)
+
+                    # Advance cursor position for the next character
+                    current_x += char_width + spacing
+            return
+
+        # Collect the glyphs of the whole string and compute its bounding box
+        glyphs = []
+        text_width = -spacing
         for char_code in text_str:
-            # Get character bitmap data from the font object
-            char_data, char_width, char_height = self.font.get_letter(char_code, color, background_color)
-            if char_data:
-                scaled_width = char_width * scale
-                scaled_height = char_height * scale
-                
-                if scale == 1:
-                    # If no scaling, write original character data directly
-                    self.set_window(current_x, y, current_x + char_width - 1, y + char_height - 1)
-                    self.write_data(char_data)
-                else:
-                    # Create a buffer for the scaled character
-                    scaled_data = bytearray(3 * scaled_width * scaled_height)
-                    src_idx = 0
-                    dest_idx = 0
-                    
-                    # Scale character pixels
-                    for _ in range(char_height):
-                        row_buffer = bytearray(3 * scaled_width)
-                        row_idx = 0
-                        
-                        for _ in range(char_width):
-                            pixel = char_data[src_idx:src_idx+3]
-                            src_idx += 3
-                            for _ in range(scale):
-                                row_buffer[row_idx:row_idx+3] = pixel
-                                row_idx += 3
-                        
-                        for _ in range(scale):
-                            scaled_data[dest_idx:dest_idx+len(row_buffer)] = row_buffer
-                            dest_idx += len(row_buffer)
-                    
-                    # Draw the scaled character
-                    self.set_window(current_x, y, current_x + scaled_width - 1, y + scaled_height - 1)
-                    self.write_data(scaled_data)
-                
-                # Advance cursor position for the next character
-                current_x += scaled_width + spacing
+            glyph = self.font.get_glyph(char_code, color, background_color, scale)
+            if glyph[0]:
+                glyphs.append(glyph)
+                text_width += glyph[1] + spacing
+        if not glyphs:
+            return
+        text_height = glyphs[0][2]
+        row_bytes = 3 * text_width
+
+        # Compose the string row-major into the stripe buffer, band by band if it does not fit at once
+        buf = memoryview(self._stripe)
+        self._stripe_color = None
+        band_rows = max(1, min(text_height, len(buf) // row_bytes))
+        if band_rows * row_bytes > len(buf):
+            # A single row is wider than the buffer (off-screen text), fall back to a temporary buffer
+            buf = memoryview(bytearray(row_bytes))
+        self.__fill_buffer(buf, band_rows * row_bytes, background_color)
+
+        with self._tx as tx:
+            self.set_window(x, y, x + text_width - 1, y + text_height - 1)
+            for band_start in range(0, text_height, band_rows):
+                rows = min(band_rows, text_height - band_start)
+                offset = 0
+                for char_data, char_width, _ in glyphs:
+                    glyph_row_bytes = 3 * char_width
+                    src = memoryview(char_data)
+                    for row in range(rows):
+                        src_start = (band_start + row) * glyph_row_bytes
+                        dest_start = row * row_bytes + offset
+                        buf[dest_start:dest_start + glyph_row_bytes] = src[src_start:src_start + glyph_row_bytes]
+                    # Spacing columns keep the background color from the initial fill
+                    offset += glyph_row_bytes + 3 * spacing
+                tx.data(buf[:rows * row_bytes])
+
+    def __fill_buffer(self, buf, length, color):
+        """Fills the first bytes of a buffer with a repeated RGB color.
+
+        The color is written once and then doubled with slice copies, avoiding a per-pixel loop.
+
+        Args:
+            buf (memoryview): Buffer to fill.
+            length (int): Number of bytes to fill, a multiple of 3.
+            color (tuple): RGB color (r, g, b).
+        """
+        buf[0], buf[1], buf[2] = color
+        filled = 3
+        while filled < length:
+            chunk = min(filled, length - filled)
+            buf[filled:filled + chunk] = buf[:chunk]
+            filled += chunk
 
     def set_font(self, font_obj):
         """Sets the font object to be used for subsequent text drawing operations.
@@ -493,14 +938,185 @@ class ILI9488:
     
     def image(self, x, y, w, h, data):
         """Displays an RGB666 image on the display at the specified coordinates.
+
+        Run-length encoded (RLE_MAGIC) and palette-indexed (IDX_MAGIC) images are decoded on the fly.
         
         Args:
             x (int): X-coordinate of the top-left corner of the image.
             y (int): Y-coordinate of the top-left corner of the image.
             w (int): Width of the image in pixels.
             h (int): Height of the image in pixels.
-            data (bytes): Raw RGB666 image data (3 bytes per pixel) as a bytearray or bytes object.
+            data (bytes): Raw RGB666 image data (3 bytes per pixel) or an encoded image as a bytearray or bytes object.
+        """
+        if len(data) != 3 * w * h:
+            if data[:4] == RLE_MAGIC:
+                self.image_rle(x, y, io.BytesIO(data))
+                return
+            if data[:4] == IDX_MAGIC:
+                self.image_indexed(x, y, io.BytesIO(data))
+                return
+        with self._tx as tx:
+            self.set_window(x, y, x + w - 1, y + h - 1)
+            tx.data(data)
+
+    def image_file(self, x, y, w, h, source):
+        """Streams an image from an open file or a path to the display.
+
+        Raw images are read in chunks into a preallocated buffer, encoded images are decoded
+        on the fly, so memory use does not depend on the image size.
+
+        Args:
+            x (int): X-coordinate of the top-left corner of the image.
+            y (int): Y-coordinate of the top-left corner of the image.
+            w (int): Width of the image in pixels.
+            h (int): Height of the image in pixels.
+            source: Path of the image file or a file object opened in binary mode.
+
+        Raises:
+            EOFError: If the file ends before the image is complete.
+        """
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                self.image_file(x, y, w, h, f)
+            return
+
+        start = source.tell()
+        magic = source.read(4)
+        source.seek(start)
+        if magic == RLE_MAGIC:
+            self.image_rle(x, y, source)
+            return
+        if magic == IDX_MAGIC:
+            self.image_indexed(x, y, source)
+            return
+
+        chunk = memoryview(self._chunk)
+        remaining = 3 * w * h
+        with self._tx as tx:
+            self.set_window(x, y, x + w - 1, y + h - 1)
+            while remaining:
+                count = source.readinto(chunk[:min(len(chunk), remaining)])
+                if not count:
+                    raise EOFError("Image data ended early")
+                tx.data(chunk[:count])
+                remaining -= count
+
+    def image_rle(self, x, y, stream):
+        """Decodes a run-length encoded RGB666 image from a stream straight to the display.
+
+        Pixels are decoded into the stripe buffer and sent in chunks of whole rows, so only the
+        compressed runs and one chunk are held in memory at any time.
+
+        Args:
+            x (int): X-coordinate of the top-left corner of the image.
+            y (int): Y-coordinate of the top-left corner of the image.
+            stream: Object providing readinto(), positioned at the start of the image header.
+
+        Raises:
+            ValueError: If the stream does not contain a run-length encoded image.
         """
-        self.set_window(x, y, x + w - 1, y + h - 1)
-        self.write_data(data)
+        reader = StreamReader(stream)
+        header = memoryview(bytearray(8))
+        reader.readinto(header)
+        if bytes(header[:4]) != RLE_MAGIC:
+            raise ValueError("Not a run-length encoded image")
+        w = (header[4] << 8) | header[5]
+        h = (header[6] << 8) | header[7]
+
+        out = memoryview(self._stripe)
+        self._stripe_color = None
+        capacity = max(1, len(out) // (3 * w)) * 3 * w
+        used = 0
+        remaining = w * h
+        with self._tx as tx:
+            self.set_window(x, y, x + w - 1, y + h - 1)
+            while remaining:
+                control = reader.byte()
+                count = min((control & 0x7F) + 1, remaining)
+                remaining -= count
+                if control & 0x80:
+                    # Repeated pixel, filled by slice doubling
+                    color = (reader.byte(), reader.byte(), reader.byte())
+                    while count:
+                        pixels = min(count, (capacity - used) // 3)
+                        self.__fill_buffer(out[used:], 3 * pixels, color)
+                        used += 3 * pixels
+                        count -= pixels
+                        if used == capacity:
+                            tx.data(out[:used])
+                            used = 0
+                else:
+                    # Literal pixels, read straight into the chunk
+                    length = 3 * count
+                    while length:
+                        part = min(length, capacity - used)
+                        reader.readinto(out[used:used + part])
+                        used += part
+                        length -= part
+                        if used == capacity:
+                            tx.data(out[:used])
+                            used = 0
+            if used:
+                tx.data(out[:used])
+
+    def image_indexed(self, x, y, stream):
+        """Expands a palette-indexed image from a stream straight to the display.
+
+        Every packed byte is expanded through a lookup table (byte value to RGB666 pixels) into
+        the stripe buffer, which is sent whenever it is full. The table of the last image is kept,
+        so images sharing a palette do not rebuild it.
+
+        Args:
+            x (int): X-coordinate of the top-left corner of the image.
+            y (int): Y-coordinate of the top-left corner of the image.
+            stream: Object providing readinto(), positioned at the start of the image header.
+
+        Raises:
+            ValueError: If the stream does not contain a palette-indexed image.
+        """
+        reader = StreamReader(stream)
+        header = memoryview(bytearray(10))
+        reader.readinto(header)
+        bpp = header[8]
+        if bytes(header[:4]) != IDX_MAGIC or bpp not in (1, 2, 4, 8):
+            raise ValueError("Not a palette-indexed image")
+        w = (header[4] << 8) | header[5]
+        h = (header[6] << 8) | header[7]
+        palette = bytearray(3 * (header[9] + 1))
+        reader.readinto(memoryview(palette))
+
+        # Lookup table from a packed byte to the RGB666 bytes of its pixels
+        pixels_per_byte = 8 // bpp
+        step = 3 * pixels_per_byte
+        key = bytes(palette) + bytes([bpp])
+        if self._index_table is None or self._index_table[0] != key:
+            table = bytearray(256 * step)
+            mask = (1 << bpp) - 1
+            colors = len(palette) // 3
+            pos = 0
+            for value in range(256):
+                for k in range(pixels_per_byte):
+                    index = (value >> (8 - bpp * (k + 1))) & mask
+                    if index < colors:
+                        table[pos:pos + 3] = palette[3 * index:3 * index + 3]
+                    pos += 3
+            self._index_table = (key, table)
+        table = memoryview(self._index_table[1])
 
+        out = memoryview(self._stripe)
+        self._stripe_color = None
+        packed = memoryview(self._chunk)[:len(out) // step]
+        remaining = 3 * w * h
+        with self._tx as tx:
+            self.set_window(x, y, x + w - 1, y + h - 1)
+            while remaining:
+                count = min(len(packed), (remaining + step - 1) // step)
+                reader.readinto(packed[:count])
+                used = 0
+                for i in range(count):
+                    start = packed[i] * step
+                    out[used:used + step] = table[start:start + step]
+                    used += step
+                used = min(used, remaining) # The last byte may hold padding bits
+                tx.data(out[:used])
+                remaining -= used
@@ -1,16 +1,27 @@
 """XGLCD Font Utility."""
+from collections import OrderedDict
 from math import ceil, floor
 
+# Compiled font files (.xfnt): magic, width, height, first letter, letter
+# count, bytes per letter (big-endian 16 bit), width table (one byte per
+# letter), then the letters in X-GLCD layout (width byte + column bytes).
+FONT_MAGIC = b'XFNT'
+FONT_HEADER_SIZE = 10
+
 
 class XglcdFont(object):
     """Font data in X-GLCD format.
 
     Attributes:
-        letters: A bytearray of letters (columns consist of bytes)
+        letters: Buffer of letters (columns consist of bytes)
+        widths: Pixel width of every letter
         width: Maximum pixel width of font
         height: Pixel height of font
         start_letter: ASCII number of first letter
         height_bytes: How many bytes comprises letter height
+        cache_size: Byte budget of the rendered glyph cache
+        cache_hits: Number of glyph lookups served from the cache
+        cache_misses: Number of glyph lookups that had to be rendered
 
     Note:
         Font files can be generated with the free version of MikroElektronika
@@ -18,21 +29,43 @@ class XglcdFont(object):
         The font file must be in X-GLCD 'C' format.
         To save text files from this font creator program in Win7 or higher
         you must use XP compatibility mode or you can just use the clipboard.
+        Fonts precompiled with scripts/compile_font.py (.xfnt) load without
+        parsing and carry their dimensions in the header.  Compiled into a
+        frozen module, a font stays in flash and takes no heap.
     """
 
     # Dict to translate bitwise values to byte position
     BIT_POS = {1: 0, 2: 2, 4: 4, 8: 6, 16: 8, 32: 10, 64: 12, 128: 14, 256: 16}
 
-    def __init__(self, path, width, height, start_letter=32, letter_count=96):
+    def __init__(self, path, width=None, height=None, start_letter=32,
+                 letter_count=96, cache_size=16384):
         """Constructor for X-GLCD Font object.
 
         Args:
-            path (string): Full path of font file
-            width (int): Maximum width in pixels of each letter
-            height (int): Height in pixels of each letter
+            path (string): Full path of font file (.c or precompiled .xfnt),
+                or compiled font data such as the FONT constant of a module
+                generated by scripts/compile_font.py (used without copying).
+            width (int): Maximum width in pixels of each letter.  Taken from
+                the header for .xfnt files.
+            height (int): Height in pixels of each letter.  Taken from the
+                header for .xfnt files.
             start_letter (int): First ASCII letter.  Default is 32.
             letter_count (int): Total number of letters.  Default is 96.
+            cache_size (int): Byte budget for rendered glyphs.  Default is
+                16384, 0 disables the cache.
         """
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.__cache = OrderedDict()
+        self.__cache_bytes = 0
+        self.__atlases = {}
+        if not isinstance(path, str):
+            self.__use_compiled_font(memoryview(path))
+            return
+        if path.endswith('.xfnt'):
+            self.__load_binary_font(path)
+            return
         self.width = width
         self.height = max(height, 8)
         self.start_letter = start_letter
@@ -69,7 +102,57 @@ class XglcdFont(object):
                 mv[offset: offset + bytes_per_letter] = bytearray(
                     int(b, 16) for b in line.split(','))
                 offset += bytes_per_letter
+        # Width table, the first byte of every letter
+        self.widths = bytearray(self.letters[i * bytes_per_letter]
+                                for i in range(self.letter_count))
     
+    def __load_binary_font(self, path):
+        """Load a precompiled binary font file.
+
+        The letter data is read into one buffer with a single readinto.
+
+        Args:
+            path (string): Full path of font file.
+        Raises:
+            ValueError: If the file is not a compiled font.
+        """
+        with open(path, 'rb') as f:
+            header = f.read(FONT_HEADER_SIZE)
+            if len(header) != FONT_HEADER_SIZE or header[:4] != FONT_MAGIC:
+                raise ValueError('Not a compiled font file')
+            data = bytearray(FONT_HEADER_SIZE + header[7] * (
+                ((header[8] << 8) | header[9]) + 1))
+            mv = memoryview(data)
+            mv[:FONT_HEADER_SIZE] = header
+            if f.readinto(mv[FONT_HEADER_SIZE:]) != len(data) - FONT_HEADER_SIZE:
+                raise ValueError('Compiled font file is truncated')
+        self.__use_compiled_font(mv)
+
+    def __use_compiled_font(self, mv):
+        """Use compiled font data in place.
+
+        The header (see FONT_MAGIC) is followed by the letter width table
+        and the letters in X-GLCD layout.  Both are kept as memoryviews
+        into the given data, so a bytes constant of a frozen module is
+        read straight from flash.
+
+        Args:
+            mv (memoryview): Compiled font data.
+        Raises:
+            ValueError: If the data is not a compiled font.
+        """
+        if bytes(mv[:4]) != FONT_MAGIC:
+            raise ValueError('Not a compiled font')
+        self.width = mv[4]
+        self.height = max(mv[5], 8)
+        self.start_letter = mv[6]
+        self.letter_count = mv[7]
+        self.bytes_per_letter = (mv[8] << 8) | mv[9]
+        letters_start = FONT_HEADER_SIZE + self.letter_count
+        self.widths = mv[FONT_HEADER_SIZE:letters_start]
+        self.letters = mv[letters_start:letters_start +
+                          self.letter_count * self.bytes_per_letter]
+
     def lit_bits(self, n):
         """Return positions of 1 bits only."""
         while n:
@@ -77,79 +160,199 @@ class XglcdFont(object):
             yield self.BIT_POS[b]
             n ^= b
 
-    def get_letter(self, letter, color, background=0):
-        """Convert letter byte data to pixels.
+    def __letter_spans(self, letter_ord, scale):
+        """Return the pre-scaled atlas entry of a letter.
+
+        Atlases are built lazily per scale.  Each entry holds the scaled
+        letter width and, per source row, the foreground runs as flat
+        (start, end) byte offsets into a scaled RGB666 row, so rendering a
+        letter only copies runs instead of decoding bits.
 
         Args:
-            letter (string): Letter to return (must exist within font).
-            color (int): RGB color value.
-            background (int): RGB background color (default: black).
+            letter_ord (int): Index of the letter within the font.
+            scale (int): Scaling factor.
         Returns:
-            (bytearray): Pixel data in RGB666 format (3 bytes per pixel).
-            (int, int): Letter width and height.
+            (int, list): Scaled letter width and per-row run offsets.
         """
+        atlas = self.__atlases.get(scale)
+        if atlas is None:
+            atlas = self.__atlases[scale] = {}
+        entry = atlas.get(letter_ord)
+        if entry is not None:
+            return entry
 
-        # Convert foreground color
-        fg_r8, fg_g8, fg_b8 = color
-        
-        # Convert background color if provided
-        if background:
-            bg_r8, bg_g8, bg_b8 = background
-
-        # Get index of letter
-        letter_ord = ord(letter) - self.start_letter
-
-        # Confirm font contains letter
-        if letter_ord >= self.letter_count:
-            print('Font does not contain character: ' + letter)
-            return b'', 0, 0
         bytes_per_letter = self.bytes_per_letter
         offset = letter_ord * bytes_per_letter
-        mv = memoryview(self.letters[offset:offset + bytes_per_letter])
+        mv = memoryview(self.letters)[offset:offset + bytes_per_letter]
 
         # Get width of letter (specified by first byte)
         letter_width = mv[0]
         letter_height = self.height
-        # Calculate total pixels in the letter
-        total_pixels = letter_width * letter_height
-        
-        # Create buffer (3 bytes per pixel for RGB666)
-        if background:
-            buf = bytearray([bg_r8, bg_g8, bg_b8] * total_pixels)
-        else:
-            buf = bytearray(total_pixels * 3)  # Default to black background
-
         # Calculate bytes per column (segments of 8 rows)
         bytes_per_col = ceil(letter_height / 8)
-        col = 0
-        segment = 0
 
-        # Process each data byte after the width byte
+        # Collect the lit columns of every row as a bit mask
+        masks = [0] * letter_height
         for i in range(1, len(mv)):
             byte = mv[i]
-            row_in_segment = 0
-            
-            # Process each bit in the byte
+            col, segment = divmod(i - 1, bytes_per_col)
+            row = segment * 8
             while byte:
-                if byte & 1:
-                    # Calculate position in buffer (row-major order)
-                    row = segment * 8 + row_in_segment
-                    if row < letter_height:
-                        # Position: (row * letter_width + col) * 3
-                        pos = (row * letter_width + col) * 3
-                        buf[pos] = fg_r8
-                        buf[pos + 1] = fg_g8
-                        buf[pos + 2] = fg_b8
+                if byte & 1 and row < letter_height:
+                    masks[row] |= 1 << col
                 byte >>= 1
-                row_in_segment += 1
-            
-            # Move to next segment or next column
-            segment += 1
-            if segment >= bytes_per_col:
-                segment = 0
-                col += 1
+                row += 1
+
+        # Convert the masks to runs of lit pixels in scaled byte offsets
+        step = 3 * scale
+        rows = []
+        for mask in masks:
+            runs = []
+            col = 0
+            while mask:
+                if mask & 1:
+                    start = col
+                    while mask & 1:
+                        mask >>= 1
+                        col += 1
+                    runs.append(start * step)
+                    runs.append(col * step)
+                else:
+                    mask >>= 1
+                    col += 1
+            rows.append(runs)
+
+        entry = atlas[letter_ord] = (letter_width * scale, rows)
+        return entry
+
+    def __render_letter(self, letter, color, background, scale):
+        """Render letter pixels at the given scale from its atlas entry.
+
+        Nearest-neighbour scaling: every lit source pixel becomes a
+        scale x scale block.  The cost depends on the number of runs, not on
+        the number of scaled pixels.
+
+        Args:
+            letter (string): Letter to render (must exist within font).
+            color (int): RGB color value.
+            background (int): RGB background color (default: black).
+            scale (int): Scaling factor.
+        Returns:
+            (bytearray): Pixel data in RGB666 format (3 bytes per pixel).
+            (int, int): Scaled letter width and height.
+        """
+        # Get index of letter
+        letter_ord = ord(letter) - self.start_letter
 
-        return buf, letter_width, letter_height
+        # Confirm font contains letter
+        if letter_ord >= self.letter_count:
+            print('Font does not contain character: ' + letter)
+            return b'', 0, 0
+
+        scaled_width, rows = self.__letter_spans(letter_ord, scale)
+        scaled_height = self.height * scale
+        row_bytes = 3 * scaled_width
+
+        # Create buffer (3 bytes per pixel for RGB666), default to black background
+        buf = bytearray(row_bytes * scaled_height)
+        if not scaled_width:
+            return buf, scaled_width, scaled_height
+        mv = memoryview(buf)
+        if background:
+            _fill(mv, len(buf), background)
+
+        # One row of foreground pixels to copy the runs from
+        fg = memoryview(bytearray(row_bytes))
+        _fill(fg, row_bytes, color)
+
+        offset = 0
+        for runs in rows:
+            if runs:
+                for i in range(0, len(runs), 2):
+                    start = runs[i]
+                    end = runs[i + 1]
+                    mv[offset + start:offset + end] = fg[start:end]
+                # Repeat the row for the remaining scaled rows
+                for k in range(1, scale):
+                    dest = offset + k * row_bytes
+                    mv[dest:dest + row_bytes] = mv[offset:offset + row_bytes]
+            offset += row_bytes * scale
+
+        return buf, scaled_width, scaled_height
+
+    def get_letter(self, letter, color, background=0):
+        """Convert letter byte data to pixels.
+
+        Args:
+            letter (string): Letter to return (must exist within font).
+            color (int): RGB color value.
+            background (int): RGB background color (default: black).
+        Returns:
+            (bytearray): Pixel data in RGB666 format (3 bytes per pixel).
+            (int, int): Letter width and height.
+        """
+        return self.__render_letter(letter, color, background, 1)
+
+    def get_glyph(self, letter, color, background=0, scale=1):
+        """Return rendered letter pixels, served from the glyph cache.
+
+        Rendered buffers are kept in a least recently used cache keyed by
+        (letter, color, background, scale) until the byte budget is
+        exhausted.  The returned buffer is shared, callers must not modify
+        it.
+
+        Args:
+            letter (string): Letter to return (must exist within font).
+            color (int): RGB color value.
+            background (int): RGB background color (default: black).
+            scale (int): Scaling factor.  Default is 1.
+        Returns:
+            (bytearray): Pixel data in RGB666 format (3 bytes per pixel).
+            (int, int): Scaled letter width and height.
+        """
+        key = (letter, color, background, scale)
+        cache = self.__cache
+        glyph = cache.pop(key, None)
+        if glyph is not None:
+            # Re-insert to mark the glyph as most recently used
+            cache[key] = glyph
+            self.cache_hits += 1
+            return glyph
+        self.cache_misses += 1
+
+        glyph = self.__render_letter(letter, color, background, max(scale, 1))
+        buf = glyph[0]
+
+        size = len(buf)
+        if 0 < size <= self.cache_size:
+            # Evict least recently used glyphs until the new one fits
+            while self.__cache_bytes + size > self.cache_size:
+                oldest = next(iter(cache))
+                self.__cache_bytes -= len(cache.pop(oldest)[0])
+            cache[key] = glyph
+            self.__cache_bytes += size
+        return glyph
+
+    def cache_info(self):
+        """Return glyph cache statistics.
+
+        Returns:
+            (dict): Hits, misses, cached entries, used bytes and budget.
+        """
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "entries": len(self.__cache),
+            "bytes": self.__cache_bytes,
+            "budget": self.cache_size
+        }
+
+    def clear_cache(self):
+        """Drop all cached glyphs and reset the hit/miss counters."""
+        self.__cache = OrderedDict()
+        self.__cache_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def measure_text(self, text, scale=1, spacing=1):
         """Measure length of text string in pixels.
@@ -162,10 +365,27 @@ class XglcdFont(object):
             int: length of text
         """
         length = 0
+        widths = self.widths
         for letter in text:
-            # Get index of letter
+            # Add length of letter (0 if not in the font) and spacing
             letter_ord = ord(letter) - self.start_letter
-            offset = letter_ord * self.bytes_per_letter
-            # Add length of letter and spacing
-            length += self.letters[offset] * scale + spacing
+            if 0 <= letter_ord < self.letter_count:
+                length += widths[letter_ord] * scale
+            length += spacing
         return length
+
+
+def _fill(buf, length, color):
+    """Fill the first bytes of a buffer with a repeated RGB color.
+
+    Args:
+        buf (memoryview): Buffer to fill.
+        length (int): Number of bytes to fill, a multiple of 3.
+        color (tuple): RGB color (r, g, b).
+    """
+    buf[0], buf[1], buf[2] = color
+    filled = 3
+    while filled < length:
+        chunk = min(filled, length - filled)
+        buf[filled:filled + chunk] = buf[:chunk]
+        filled += chunk
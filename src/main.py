@@ -1,5 +1,9 @@
 # Import required libraries, drivers, and manager classes
-import os, time, machine, socket
+import os, time, machine
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
 from machine import SPI, Pin
 from managers.DisplayManager import DisplayManager
 from managers.FileManager import FileManager
@@ -7,28 +11,41 @@ from managers.StationManager import StationManager
 from managers.TimeManager import TimeManager
 from managers.WlanManager import WlanManager
 from managers.WeatherManager import WeatherManager
+from managers.DataCacheManager import DataCacheManager
+from managers.ScheduleManager import ScheduleManager
+from managers.RecoveryManager import RecoveryManager
 from drivers.xglcd_font import XglcdFont
 from drivers.XPT2046 import Touch
 from updater import UpdateManager
+from net import http
 
 # Configuration constants
 WLAN_TIMEOUT = 30           # Timeout in seconds for WLAN connection attempts
 REQUEST_TIMEOUT = 5         # Timeout in seconds for network requests
+REFRESH_TIMEOUT = 10        # Timeout in seconds for the data requests of a refresh, which run at the same time
 UPDATE_HOUR = 3             # Hour of the day (24-hour format) when automatic updates are checked
-LOOP_DELAY = 0.2            # Delay in seconds for the main loop iteration
+TICKER_DELAY = 0.04         # Delay in seconds for the main loop iteration while the ticker is scrolling
+LIGHT_SLEEP = False         # Use light sleep between tasks, off because the WLAN connection may drop during light sleep
 
-# Time tuple indices for readability
-T_DAY = 2
-T_HOUR = 3
-T_MINUTE = 4
-T_SECOND = 5
+# Set the timeout of the HTTP clients shared by all managers to prevent indefinite blocking
+http.client().timeout = REQUEST_TIMEOUT
+http.async_client().timeout = REQUEST_TIMEOUT
 
-# Set a global timeout for socket operations to prevent indefinite blocking
-socket.socket().settimeout(REQUEST_TIMEOUT)
+def load_font(name, cache_size=16384):
+    """
+    Loads a font from a module frozen into the firmware (font_<name>, generated by compile_font.py) if available,
+    so its data stays in flash, otherwise from the compiled font file.
+    """
+    try:
+        source = __import__(f"font_{name}").FONT
+    except ImportError:
+        source = f"fonts/{name}.xfnt"
+    return XglcdFont(source, cache_size=cache_size)
 
 # Initialize manager instances
 fmgr = FileManager()
-dspm = DisplayManager(XglcdFont("fonts/ILIFont10x19.c", 10, 19), XglcdFont("fonts/PriceFont15x33.c", 15, 33))
+# The price font is drawn at scale 2 (~6 KB per glyph), so it gets a larger glyph cache
+dspm = DisplayManager(load_font("ILIFont10x19"), load_font("PriceFont15x33", cache_size=49152))
 upmr = UpdateManager()
 
 def exit_if_process_fails(error_code, error_text, display_manager, file_manager, wlan_manager=None):
@@ -37,9 +54,10 @@ def exit_if_process_fails(error_code, error_text, display_manager, file_manager,
     If the error code starts with '1', it waits for a touch input before restarting.
     """
     if error_code is not "OK":
-        # Get QR code image for the specific error and display it
-        qr_code = file_manager.get_image_file("error", error_code)
+        # Get QR code image for the specific error and stream it to the display
+        qr_code = file_manager.get_image_path("error", error_code)
         display_manager.draw_error(error_code, error_text, qr_code)
+        display_manager.flush()
         
         # Close file and WLAN managers to clean up resources
         file_manager.close()
@@ -64,7 +82,7 @@ def update_firmware(display_manager, update_manager, file_manager, wlan_manager)
     current_version, update_version = update_manager.update_available()
     if current_version != update_version: # Check if a new version is available
         # Display update screen and progress
-        display_manager.draw_update_screen(file_manager.get_image_file("symbol", "update"), current_version, update_version)
+        display_manager.draw_update_screen(file_manager.get_image_path("symbol", "update"), current_version, update_version)
         
         display_manager.draw_update_action("Downloading update...")
         exit_if_process_fails(*update_manager.download_update(), display_manager, file_manager, wlan_manager)
@@ -76,25 +94,98 @@ def update_firmware(display_manager, update_manager, file_manager, wlan_manager)
         # Rename current main.py and updater.py to perform update
         os.rename("main.py", "main_OLD.py")
         os.rename("updater.py", "main.py") # New updater.py becomes main.py to handle the actual update
+        display_manager.flush()
         machine.reset() # Reboot to run the the updater script
 
+def draw_main_layout(display_manager, file_manager, data_cache_manager):
+    """
+    Draws the main layout and fills it with the last known data, grayed out until fresh data arrives.
+    """
+    station_labels = file_manager.get_configuration_value("station_labels")
+    display_manager.draw_main_layout(
+        [file_manager.get_image_path("station", label[0]) for label in station_labels],
+        [file_manager.get_image_path("symbol", "thermometer"), 
+        file_manager.get_image_path("symbol", "raindrop"),
+        file_manager.get_image_path("symbol", "lowest-temperature"),
+        file_manager.get_image_path("symbol", "highest-temperature")],
+        station_labels,
+        file_manager.get_configuration_value("fuel_type")
+    )
+    draw_cached_data(display_manager, file_manager, data_cache_manager)
+
+def draw_cached_data(display_manager, file_manager, data_cache_manager):
+    """
+    Draws the last known data grayed out, e.g. until fresh data arrives or while the network is down.
+    """
+    cached_weather = data_cache_manager.get_weather_data()
+    if cached_weather is not None:
+        weather_data, weather_icon_name = cached_weather
+        display_manager.draw_weather_data(weather_data, file_manager.get_image_path("weather", weather_icon_name),
+                                          [True] * len(weather_data))
+    cached_stations = data_cache_manager.get_station_data()
+    if cached_stations is not None:
+        station_statuses, fuel_prices = cached_stations
+        display_manager.draw_station_data(station_statuses, fuel_prices, [True] * len(station_statuses))
+
+async def refresh_data(display_manager, file_manager, data_cache_manager, weather_manager, station_manager, timestamp, timezone):
+    """
+    Fetches weather and station data at the same time and draws each as soon as it arrives.
+    Values that could not be fetched within REFRESH_TIMEOUT fall back to the last known ones.
+    The connections are closed afterwards, they would time out long before the next refresh.
+    """
+    async def refresh_weather():
+        weather_data, weather_icon_name = await weather_manager.get_weather_data_async(timestamp, timezone, REFRESH_TIMEOUT)
+        weather_data, weather_icon_name, stale = data_cache_manager.resolve_weather_data(weather_data, weather_icon_name)
+        display_manager.draw_weather_data(weather_data, file_manager.get_image_path("weather", weather_icon_name), stale)
+
+    async def refresh_stations():
+        station_statuses, fuel_prices = await station_manager.get_station_data_async(REFRESH_TIMEOUT)
+        display_manager.draw_station_data(*data_cache_manager.resolve_station_data(station_statuses, fuel_prices))
+
+    try:
+        await asyncio.gather(refresh_weather(), refresh_stations())
+    finally:
+        http.async_client().close()
+
+def sleep_between_tasks(seconds):
+    """
+    Sleeps until the next scheduled task is due, in light sleep if enabled.
+    """
+    if LIGHT_SLEEP:
+        machine.lightsleep(int(seconds * 1000))
+    else:
+        time.sleep(seconds)
+
 def main():
     """
     Main function to initialize the system, connect to WLAN, synchronize time, fetch data, and run the display loop.
     """
-    # Initial display: "Please wait..."
-    dspm.draw_waiting_screen()
+    # Initial display: the main layout of the last boot, or "Please wait..." if none was saved
+    snapshot_shown = dspm.draw_boot_snapshot()
+    if not snapshot_shown:
+        dspm.draw_waiting_screen()
 
     # SD card and configuration validation
     exit_if_process_fails(*fmgr.open_sd_card(), dspm, fmgr)
     exit_if_process_fails(*fmgr.validate_sd_card_contents(), dspm, fmgr)
 
+    # Last known data, keyed by the configuration it was fetched for
+    dcmg = DataCacheManager(f"{fmgr.get_configuration_value('weather_lat')},{fmgr.get_configuration_value('weather_long')}",
+                            f"{','.join(fmgr.get_configuration_value('station_ids'))};{fmgr.get_configuration_value('fuel_type')}")
+
+    # With a snapshot on screen, the layout and the last known data are shown right away without waiting for the network
+    if snapshot_shown:
+        draw_main_layout(dspm, fmgr, dcmg)
+
     # WLAN connection
     wlnm = WlanManager()
     wlnm.connect(fmgr.get_configuration_value("wlan_ssid"), fmgr.get_configuration_value("wlan_psk"))
-    dspm.draw_waiting_for_wlan(fmgr.get_image_file("symbol", "wlan"), fmgr.get_configuration_value("wlan_ssid"))
+    # The WLAN waiting screen would replace the snapshot, so it is only drawn without one
+    if not snapshot_shown:
+        dspm.draw_waiting_for_wlan(fmgr.get_image_path("symbol", "wlan"), fmgr.get_configuration_value("wlan_ssid"))
     for i in range(WLAN_TIMEOUT + 1):
-        dspm.draw_wlan_waiting_time(WLAN_TIMEOUT - i)
+        if not snapshot_shown:
+            dspm.draw_wlan_waiting_time(WLAN_TIMEOUT - i)
         if wlnm.is_connected_boolean():
             break
         time.sleep(1)
@@ -104,9 +195,10 @@ def main():
     exit_if_process_fails(*wlnm.device_online(), dspm, fmgr, wlnm)
 
     # Time synchronization and timezone setup
-    tmgr = TimeManager()
+    tmgr = TimeManager(fmgr.get_configuration_value("timezone_rule"))
     exit_if_process_fails(*tmgr.sync_time(), dspm, fmgr, wlnm)
     tmgr.set_timezone()
+    http.client().close()
 
     # Initialize data managers
     wmgr = WeatherManager(fmgr.get_configuration_value("weather_lat"), fmgr.get_configuration_value("weather_long"))
@@ -114,85 +206,95 @@ def main():
                           fmgr.get_configuration_value("fuel_type"),
                           fmgr.get_configuration_value("tankerkoenig_api_key"))
 
-    # Draw the main layout of the display
-    dspm.draw_main_layout(
-        [fmgr.get_image_file("station", label[0]) for label in fmgr.get_configuration_value("station_labels")],
-        [fmgr.get_image_file("symbol", "thermometer"), 
-        fmgr.get_image_file("symbol", "raindrop"),
-        fmgr.get_image_file("symbol", "lowest-temperature"),
-        fmgr.get_image_file("symbol", "highest-temperature")],
-        fmgr.get_configuration_value("station_labels"),
-        fmgr.get_configuration_value("fuel_type")
-    )
+    # Draw the main layout of the display, unless it is already shown
+    if not snapshot_shown:
+        draw_main_layout(dspm, fmgr, dcmg)
     
-    # Initial data fetch and display
+    # Initial data fetch and display, values that could not be fetched fall back to the last known ones
     dspm.draw_weekday_date_time(tmgr.get_timedate())
-    weather_data, weather_icon_name = wmgr.get_weather_data(tmgr.get_timestamp(), tmgr.get_tz_identifier())
-    dspm.draw_weather_data(weather_data, weather_icon_name, fmgr.get_image_file("weather", weather_icon_name))
-    dspm.draw_station_data(*stmr.get_station_data())
+    asyncio.run(refresh_data(dspm, fmgr, dcmg, wmgr, stmr, tmgr.get_timestamp(), tmgr.get_tz_identifier()))
 
-    # Variables for main loop control
-    previous_day = -1
-    previous_hour = -1
-    previous_minute = -1
-    data_can_be_updated = False
-    perform_update_check = False
+    # Periodic tasks, due at local times
+    def update_time_and_date():
+        """Updates time and date on the display, every minute."""
+        dspm.draw_weekday_date_time(tmgr.get_timedate())
 
-    # Main loop, runs (technically) forever until the next firmware update
-    while True:
-        t = tmgr.get_timestamp()
-
-        # Daily tasks, re-enable update check for the new day
-        if previous_day != t[T_DAY]:
-            previous_day = t[T_DAY]
-            perform_update_check = True
-
-        # Hourly tasks, sync NTP clock, set timezone (relevant for summer/winter time switching)
-        if previous_hour != t[T_HOUR]:
-            previous_hour = t[T_HOUR]
-            exit_if_process_fails(*wlnm.is_connected(), dspm, fmgr, wlnm)
-            exit_if_process_fails(*wlnm.device_online(), dspm, fmgr, wlnm)
-            exit_if_process_fails(*tmgr.sync_time(), dspm, fmgr, wlnm)
+    # Network faults at runtime are retried with backoff while the display shows the last known data grayed out.
+    # The device is only restarted once an upstream fails more often in a row than its retry budget allows.
+    rcvm = RecoveryManager()
+    rcvm.register("wlan", base_delay=2, max_delay=120, budget=20)     # About half an hour
+    rcvm.register("internet", base_delay=2, max_delay=120, budget=20)
+    rcvm.register("ntp", base_delay=60, max_delay=600, budget=24)     # Synced every hour, the clock keeps running meanwhile
+    degraded = False
+    retry_scheduled = False
+
+    def connection_available():
+        """Checks WLAN and internet access, a failure switches to the degraded mode and schedules a retry."""
+        nonlocal degraded, retry_scheduled
+        for name, probe, message in (("wlan", wlnm.is_connected, "WLAN connection lost, reconnecting..."),
+                                     ("internet", wlnm.device_online, "No internet connection, retrying...")):
+            if not rcvm.check(name, probe):
+                exit_if_process_fails(*rcvm.exhausted(), dspm, fmgr, wlnm)
+                if not degraded:
+                    degraded = True
+                    draw_cached_data(dspm, fmgr, dcmg)
+                    dspm.show_ticker_message(message)
+                if not retry_scheduled:
+                    retry_scheduled = True
+                    scheduler.add_once(retry_connection, rcvm.time_until_retry(name))
+                return False
+        if degraded:
+            degraded = False
+            dspm.show_ticker_message("Connection restored")
+        return True
+
+    def retry_connection():
+        """Retries the failed upstream, once it works again the data is updated right away."""
+        nonlocal retry_scheduled
+        retry_scheduled = False
+        if rcvm.is_down("wlan"):
+            wlnm.reconnect(fmgr.get_configuration_value("wlan_ssid"), fmgr.get_configuration_value("wlan_psk"))
+        update_data()
+
+    def synchronize_time():
+        """Syncs the NTP clock and sets the timezone (relevant for summer/winter time switching), every hour."""
+        if not connection_available():
+            return
+        if not rcvm.check("ntp", tmgr.sync_time):
+            exit_if_process_fails(*rcvm.exhausted(), dspm, fmgr, wlnm)
+        tmgr.set_timezone()
+
+    def check_for_update():
+        """Checks for firmware updates if enabled, every day at UPDATE_HOUR, right before the data update."""
+        if fmgr.get_configuration_value("automatic_updates") and connection_available():
+            update_firmware(dspm, upmr, fmgr, wlnm)
+
+    def update_data():
+        """Fetches weather and station data at the same time and displays each as soon as it arrives, every 5 minutes."""
+        if not connection_available():
+            return
+        if not tmgr.get_timezone_set():
             tmgr.set_timezone()
+        asyncio.run(refresh_data(dspm, fmgr, dcmg, wmgr, stmr, tmgr.get_timestamp(), tmgr.get_tz_identifier()))
+
+    # The schedule follows the local time, tasks due at the same time run in the order they are added.
+    # Data updates run every 5 minutes at XX:01:01, XX:06:01, XX:11:01, etc.
+    # This is because of the station opening times, which get precise updates at these times.
+    # Example: A station closes at 23:00. When fetching data from tankerkeonig API at 23:00,
+    #          the station appears to be open. When fetching at 23:01, it will appear as closed.
+    scheduler = ScheduleManager(tmgr.get_local_time, sleep_between_tasks)
+    scheduler.add(synchronize_time, 3600)
+    scheduler.add(update_time_and_date, 60)
+    scheduler.add(check_for_update, 24 * 3600, UPDATE_HOUR * 3600 + 61)
+    scheduler.add(update_data, 300, 61)
 
-        # Minute-by-minute tasks, update time and date on display
-        if previous_minute != t[T_MINUTE]:
-            previous_minute = t[T_MINUTE]
-            dspm.draw_weekday_date_time(tmgr.get_timedate())
-
-        # Control flag to allow data updates once every 5 minutes
-        if (t[T_MINUTE] - 1) % 5 != 0 and not data_can_be_updated:
-            data_can_be_updated = True
-
-        # Data update logic, runs every 5 minutes at XX:01, XX:06, XX:11, etc.
-        # This is because of the station opening times, which get precise updates at these times.
-        # Example: A station closes at 23:00. When fetching data from tankerkeonig API at 23:00,
-        #          the station appears to be open. When fetching at 23:01, it will appear as closed.
-        if (data_can_be_updated and t[T_SECOND] >= 1 and (t[T_MINUTE] - 1) % 5 == 0):
-            data_can_be_updated = False
-            exit_if_process_fails(*wlnm.is_connected(), dspm, fmgr, wlnm)
-            exit_if_process_fails(*wlnm.device_online(), dspm, fmgr, wlnm)
-            if not tmgr.get_timezone_set():
-                tmgr.set_timezone()
-
-            # Check for firmware updates if enabled and at the specified hour and perform a timezone update.
-            # The timezone update ensures
-            if (fmgr.get_configuration_value("automatic_updates") and perform_update_check and t[T_HOUR] == UPDATE_HOUR):
-                update_firmware(dspm, upmr, fmgr, wlnm)
-                perform_update_check = False
-            
-            # Fetch and display weather data
-            weather_data, weather_icon_name = wmgr.get_weather_data(t, tmgr.get_tz_identifier())
-            if(dspm.currently_displayed.get("weather_icon_name") != weather_icon_name):
-                dspm.draw_weather_data(weather_data, weather_icon_name, fmgr.get_image_file("weather", weather_icon_name))
-            else:
-                dspm.draw_weather_data(weather_data, weather_icon_name)
-            
-            # Fetch and display station data
-            dspm.draw_station_data(*stmr.get_station_data())
-
-        # Take a short nap    
-        time.sleep(LOOP_DELAY)
+    # Main loop, runs (technically) forever until the next firmware update
+    while True:
+        scheduler.run_pending()
+        # The blocking client only serves one-off requests (timezone lookup, update check), its connections are not kept
+        http.client().close()
+        # Sleep until the next task is due, or only for one ticker step while messages are scrolling
+        scheduler.sleep(TICKER_DELAY if dspm.step_ticker() else None)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,223 @@
+# Import required libraries
+import os, struct, time
+
+class DataCacheManager:
+    """Persists the last successfully fetched weather and station data across reboots.
+
+    The cache file on flash holds one section for the weather and one for the stations:
+    save time (big-endian 32 bit), key, value count, then the values, strings are prefixed
+    with their length. A section is only used while its key matches the configuration it was
+    fetched for.
+    """
+    __CACHE_PATH = "data.cache"
+    __CACHE_MAGIC = b"LKG1"
+    __SAVE_INTERVAL = 3600  # Seconds after which unchanged data is saved again to refresh its time
+    __MAX_AGE = 24 * 3600   # Seconds after which saved data is no longer shown
+    __WEATHER_UNAVAILABLE = "----"
+    __STATUS_UNKNOWN = "STATUS UNKNOWN"
+
+    def __init__(self, weather_key, station_key):
+        """
+        Initializes the DataCacheManager and loads the cache file.
+
+        Args:
+            weather_key (str): Identifies the weather configuration (e.g., the coordinates).
+            station_key (str): Identifies the station configuration (e.g., station IDs and fuel type).
+        """
+        self.weather_key = weather_key
+        self.station_key = station_key
+        self.weather = None  # [time, values], values are the weather data followed by the icon name
+        self.stations = None # [time, values], values are the station statuses followed by the prices
+        self.__load()
+
+    def __read_string(self, data, offset):
+        """
+        Reads a length-prefixed string.
+
+        Args:
+            data (bytes): Cache file contents.
+            offset (int): Position of the length byte.
+
+        Returns:
+            tuple: The string and the position after it.
+        """
+        length = data[offset]
+        return data[offset + 1:offset + 1 + length].decode(), offset + 1 + length
+
+    def __write_string(self, out, value):
+        """
+        Appends a length-prefixed string.
+
+        Args:
+            out (bytearray): Buffer to append to.
+            value (str): The string, truncated to 255 bytes.
+        """
+        value = value.encode()[:255]
+        out.append(len(value))
+        out.extend(value)
+
+    def __load(self):
+        """Loads both sections from the cache file, a missing or damaged file leaves the cache empty."""
+        try:
+            with open(self.__CACHE_PATH, "rb") as f:
+                data = f.read()
+            if data[:4] != self.__CACHE_MAGIC:
+                return
+            offset = 4
+            sections = []
+            for _ in range(2):
+                saved = struct.unpack(">I", data[offset:offset + 4])[0]
+                key, offset = self.__read_string(data, offset + 4)
+                count = data[offset]
+                offset += 1
+                values = []
+                for _ in range(count):
+                    value, offset = self.__read_string(data, offset)
+                    values.append(value)
+                sections.append((key, [saved, values] if count else None))
+        except Exception:
+            return
+        (weather_key, weather), (station_key, stations) = sections
+        if weather_key == self.weather_key:
+            self.weather = weather
+        if station_key == self.station_key:
+            self.stations = stations
+
+    def __save(self):
+        """Writes both sections to the cache file, failures only cost the cache."""
+        out = bytearray(self.__CACHE_MAGIC)
+        for section, key in ((self.weather, self.weather_key), (self.stations, self.station_key)):
+            saved, values = section if section is not None else (0, [])
+            out.extend(struct.pack(">I", saved))
+            self.__write_string(out, key)
+            out.append(len(values))
+            for value in values:
+                self.__write_string(out, value)
+        try:
+            with open(self.__CACHE_PATH + ".tmp", "wb") as f:
+                f.write(out)
+            try:
+                os.remove(self.__CACHE_PATH)
+            except OSError:
+                pass
+            os.rename(self.__CACHE_PATH + ".tmp", self.__CACHE_PATH)
+        except OSError:
+            pass
+
+    def __usable(self, section):
+        """
+        Checks whether a section can still be shown.
+
+        Args:
+            section (list): A [time, values] section or None.
+
+        Returns:
+            bool: False if there is no section or it is older than the maximum age. Before the
+            clock is set, the age is unknown and the section is used.
+        """
+        if section is None:
+            return False
+        now = time.time()
+        return now < section[0] or now - section[0] <= self.__MAX_AGE
+
+    def __store(self, section, values):
+        """
+        Updates a section with fresh values, it only has to be saved if they changed or the section got old.
+
+        Args:
+            section (list): The current [time, values] section or None.
+            values (list): The fresh values.
+
+        Returns:
+            tuple: The new section and whether it has to be saved.
+        """
+        now = int(time.time())
+        if section is None or section[1] != values or now - section[0] >= self.__SAVE_INTERVAL:
+            return [now, values], True
+        return section, False
+
+    def get_weather_data(self):
+        """
+        Returns the last known weather data.
+
+        Returns:
+            tuple: The weather data list and the weather icon name, or None if nothing usable is saved.
+        """
+        if not self.__usable(self.weather):
+            return None
+        values = self.weather[1]
+        return values[:-1], values[-1]
+
+    def get_station_data(self):
+        """
+        Returns the last known station data.
+
+        Returns:
+            tuple: The station statuses and the fuel prices, or None if nothing usable is saved.
+        """
+        if not self.__usable(self.stations):
+            return None
+        values = self.stations[1]
+        count = len(values) // 2
+        return values[:count], values[count:]
+
+    def resolve_weather_data(self, weather_data, weather_icon_name):
+        """
+        Saves freshly fetched weather data if it is complete, otherwise replaces the missing values with the last known ones.
+
+        Args:
+            weather_data (list): Weather data as returned by the WeatherManager, "----" for missing values.
+            weather_icon_name (str): The weather icon name, "unknown" if not available.
+
+        Returns:
+            tuple: The weather data, the weather icon name and a list telling which values are stale.
+        """
+        stale = [False] * len(weather_data)
+        if self.__WEATHER_UNAVAILABLE not in weather_data:
+            self.weather, changed = self.__store(self.weather, weather_data + [weather_icon_name])
+            if changed:
+                self.__save()
+            return weather_data, weather_icon_name, stale
+
+        cached = self.get_weather_data()
+        if cached is None:
+            return weather_data, weather_icon_name, stale
+        weather_data = list(weather_data)
+        for i in range(len(weather_data)):
+            if weather_data[i] == self.__WEATHER_UNAVAILABLE:
+                weather_data[i] = cached[0][i]
+                stale[i] = True
+        # The icon is fetched together with the current temperature
+        if weather_icon_name == "unknown" and stale[0]:
+            weather_icon_name = cached[1]
+        return weather_data, weather_icon_name, stale
+
+    def resolve_station_data(self, station_statuses, fuel_prices):
+        """
+        Saves freshly fetched station data if every station is known, otherwise replaces unknown stations with their last known data.
+
+        Args:
+            station_statuses (list): Station statuses as returned by the StationManager.
+            fuel_prices (list): Fuel prices as returned by the StationManager.
+
+        Returns:
+            tuple: The station statuses, the fuel prices and a list telling which stations are stale.
+        """
+        stale = [False] * len(station_statuses)
+        if self.__STATUS_UNKNOWN not in station_statuses:
+            self.stations, changed = self.__store(self.stations, station_statuses + fuel_prices)
+            if changed:
+                self.__save()
+            return station_statuses, fuel_prices, stale
+
+        cached = self.get_station_data()
+        if cached is None or len(cached[0]) != len(station_statuses):
+            return station_statuses, fuel_prices, stale
+        station_statuses = list(station_statuses)
+        fuel_prices = list(fuel_prices)
+        for i in range(len(station_statuses)):
+            if station_statuses[i] == self.__STATUS_UNKNOWN:
+                station_statuses[i] = cached[0][i]
+                fuel_prices[i] = cached[1][i]
+                stale[i] = True
+        return station_statuses, fuel_prices, stale
@@ -1,7 +1,12 @@
 # Import required libraries and ILI9488 driver
 from machine import Pin, SPI
 from drivers.ILI9488 import ILI9488, RGB
-import time
+from ui.compositor import Compositor
+from ui.flushqueue import FlushQueue
+from ui.ticker import Ticker
+from ui.widgets import Screen, Panel, Divider, Icon, Label, Price
+from ui.snapshot import SnapshotRecorder, draw_snapshot
+import time, hashlib
 
 class DisplayManager:
     """Manages all display-related operations for the device."""
@@ -23,6 +28,12 @@ class DisplayManager:
         "NO PRICES": RGB(255, 150, 0),
         "STATUS UNKNOWN": RGB(255, 150, 0)
     }
+    __PRICE_PANEL_COLOR = RGB(140, 240, 140)
+    __STALE_COLOR = ILI9488.GRAY # Text color of last known data that could not be refreshed
+    __STATION_AREA_TOP = 80     # First row of the station rows, below the header and weather rows
+    __STATION_AREA_HEIGHT = 240 # Height shared by the station rows
+    __SNAPSHOT_PATH = "layout.snp666" # Snapshot of the static main layout on flash, drawn at boot
+    __SNAPSHOT_VERSION = 1            # Part of the snapshot key, increase whenever the main layout changes
 
     def __init__(self, ili_font, price_font):
         """
@@ -34,15 +45,15 @@ class DisplayManager:
         """
         spi = SPI(2, baudrate=60000000, polarity=0, phase=0, sck=Pin(10), mosi=Pin(11), miso=None)
         self.display = ILI9488(spi, Pin(14), Pin(12), Pin(13), 0, ili_font)
-        self.currently_displayed = {
-            "timedate" : [None] * 3,
-            "weather_data" : [None] * 4,
-            "weather_icon_name" : None,
-            "station_statuses" : [None] * 3,
-            "fuel_prices" : [None] * 3
-        }
+        # Drawing calls return once their bytes are queued, the bus is driven in the background
+        self.display.attach_queue(FlushQueue(spi, self.display.cs, self.display.dc))
         self.ili_font = ili_font
         self.price_font = price_font
+        self.compositor = Compositor(self.display)
+        self.screen = None  # Widget tree of the main layout
+        self.widgets = {}   # Widgets of the main layout that are updated with new data
+        self.ticker = None
+        self.snapshot_key = None # Key of the layout snapshot currently on screen
         self.clear_display()    
 
     def __ljust(self, s, width, fillchar = ' '):
@@ -59,29 +70,105 @@ class DisplayManager:
         """
         return s + (fillchar * (width - len(s)))
     
+    def __reset_layout(self):
+        """Drops the widget tree, retained regions and ticker of the main layout."""
+        self.compositor.clear()
+        self.screen = None
+        self.widgets = {}
+        if self.ticker is not None:
+            self.ticker.clear()
+            self.ticker = None
+
     def clear_display(self):
         """Clears the entire display by filling it with white color."""
+        self.__reset_layout()
+        self.snapshot_key = None
         self.display.fill_screen(ILI9488.WHITE)
+        self.display.flush(False)
+
+    def __build_main_layout(self, station_icons, weather_symbols, station_labels, fuel_type):
+        """
+        Builds the widget tree of the main layout.
+
+        The station rows share the area below the weather row, their geometry is derived from the row height.
+
+        Args:
+            station_icons (list): A list of image file paths for gas station icons.
+            weather_symbols (list): A list of image file paths for weather symbols.
+            station_labels (list): A list of tuples, each containing station information (e.g., name, fuel type).
+            fuel_type (str): The current fuel type being displayed (e.g., 'e5', 'e10', 'diesel').
+
+        Returns:
+            Screen: The root of the widget tree.
+        """
+        compositor = self.compositor
+        font = self.ili_font
+        black = ILI9488.BLACK
+        white = ILI9488.WHITE
+        screen = Screen(self.display, compositor)
+
+        # Header row with weekday, date and time
+        for x, y, width, height in ((398, 0, 2, 80), (0, 39, 400, 2), (143, 0, 2, 40), (298, 0, 2, 40)):
+            screen.add(Divider(x, y, width, height, black))
+        self.widgets["weekday"] = screen.add(Label(23, 11, 98, 19, font, black, white, align="center", compositor=compositor))
+        self.widgets["date"] = screen.add(Label(167, 11, 109, 19, font, black, white, compositor=compositor))
+        self.widgets["time"] = screen.add(Label(322, 11, 54, 19, font, black, white, compositor=compositor))
+
+        # Weather row, symbols alternate between two heights
+        self.widgets["weather_symbols"] = [screen.add(Icon(3 + 98 * i, 44 - i % 2, 34, 34, weather_symbols[i])) for i in range(4)]
+        self.widgets["weather_data"] = [screen.add(Label(42 + 98 * i, 51, 54, 19, font, black, white, compositor=compositor)) for i in range(4)]
+        self.widgets["weather_icon"] = screen.add(Icon(400, 0, 80, 80))
+
+        # Station rows
+        count = len(station_labels)
+        row_height = self.__STATION_AREA_HEIGHT // count
+        screen.add(Divider(330, self.__STATION_AREA_TOP, 2, self.__STATION_AREA_HEIGHT, black))
+        self.widgets["stations"] = []
+        for i in range(count):
+            top = self.__STATION_AREA_TOP + row_height * i
+            default_name = self.__STATION_DEFAULT_TEXT_LABELS[i] if i < len(self.__STATION_DEFAULT_TEXT_LABELS) else f"Gas Station {i + 1}"
+            name = station_labels[i][1] or default_name
+            fuel_label = station_labels[i][2] or self.__STATION_DEFAULT_FUEL_LABELS.get(fuel_type)
+            screen.add(Divider(0, top, 480, 2, black))
+            screen.add(Icon(8, top + 8, 64, 64, station_icons[i]))
+            screen.add(Label(90, top + 9, 231, 19, font, black, white, name[:21]))
+            screen.add(Label(90, top + 31, 231, 19, font, black, white, fuel_label[:21]))
+            panel = screen.add(Panel(332, top + 2, 148, row_height - 2, self.__PRICE_PANEL_COLOR))
+            self.widgets["stations"].append({
+                "name": name,
+                "status": screen.add(Label(90, top + 53, 153, 19, font, black, white, compositor=compositor)),
+                "price": panel.add(Price(343, top + 11, 126, 66, self.price_font, black, self.__PRICE_PANEL_COLOR, compositor))
+            })
+
+        # Message strip sharing the weather data row, the panel can only scroll full-height bands in landscape
+        self.ticker = Ticker(self.display, 0, 50, 398, 21, font, black, white)
+        return screen
     
+    def flush(self):
+        """Blocks until all queued drawing has been sent to the display."""
+        self.display.flush()
+
     def draw_waiting_screen(self):
         """Draws a generic 'Please wait...' screen."""
         self.clear_display()
         self.display.text(100, 141, "Please wait...", ILI9488.BLACK, 2, ILI9488.WHITE)
+        self.display.flush(False)
 
     def draw_waiting_for_wlan(self, wlan_icon, wlan_ssid):
         """
         Draws a screen indicating that the device is waiting for WLAN connection.
 
         Args:
-            wlan_icon: The image data for the WLAN icon.
+            wlan_icon (str): Path of the WLAN icon image file.
             wlan_ssid (str): The SSID of the WLAN network being connected to.
         """
         self.clear_display()
         wlan_ssid = wlan_ssid if len(wlan_ssid) < 21 else wlan_ssid[:18] + "..."
-        self.display.image(10, 110, 100, 100, wlan_icon)
+        self.display.image_file(10, 110, 100, 100, wlan_icon)
         self.display.text(125, 120, "Waiting for WLAN", ILI9488.BLACK, 2, ILI9488.WHITE)
         self.display.text(125, 160, "Trying to connect to:", ILI9488.BLACK, 1, ILI9488.WHITE)
         self.display.text(125, 180, wlan_ssid, ILI9488.BLACK, 1, ILI9488.WHITE)
+        self.display.flush(False)
 
     def draw_wlan_waiting_time(self, time_left):
         """
@@ -92,6 +179,7 @@ class DisplayManager:
         """
         time_left = f"{time_left}" if len(f"{time_left}") > 1 else f" {time_left}"
         self.display.text(426, 180, f"{time_left}s", ILI9488.BLACK, 1, ILI9488.WHITE)
+        self.display.flush(False)
     
     def draw_error(self, error_number, error_text, error_qr_code):
         """
@@ -101,16 +189,17 @@ class DisplayManager:
         Args:
             error_number (str): The error code or number.
             error_text (list): A list of strings, each representing a line of error description.
-            error_qr_code: The image data for the QR code.
+            error_qr_code (str): Path of the QR code image file.
         """
         self.clear_display()
         self.display.text(10, 10, f"ERROR {error_number}", ILI9488.RED, 2, ILI9488.WHITE)
-        self.display.image(370, 10, 100, 100, error_qr_code)
+        self.display.image_file(370, 10, 100, 100, error_qr_code)
         self.display.text(10, 50, "(Scan QR code for help)", ILI9488.BLACK, 1, ILI9488.WHITE)
         for i in range(len(error_text)):
             self.display.text(10, 120 + 20 * i, error_text[i], ILI9488.BLACK, 1, ILI9488.WHITE)
         if error_number[0] == "1":
             self.display.text(81, 260, "[ Touch anywhere to restart ]", ILI9488.BLACK, 1, ILI9488.WHITE)
+            self.display.flush(False)
         else:
             self.display.text(114, 260, "[ Auto-restart in     ]", ILI9488.BLACK, 1, ILI9488.WHITE)
             for i in range(self.__ERROR_SCREEN_TIMEOUT + 1):
@@ -126,45 +215,112 @@ class DisplayManager:
         """
         time_left = f"{time_left}" if len(f"{time_left}") > 1 else f" {time_left}"
         self.display.text(312, 260, f"{time_left}s", ILI9488.BLACK, 1, ILI9488.WHITE)
+        self.display.flush(False)
+
+    def draw_boot_snapshot(self):
+        """
+        Draws the snapshot of the main layout saved on an earlier boot, so the screen is useful before the network is up.
+
+        Returns:
+            bool: True if a snapshot was drawn.
+        """
+        self.clear_display()
+        key = draw_snapshot(self.display, self.__SNAPSHOT_PATH)
+        self.display.flush(False)
+        self.snapshot_key = key
+        return key is not None
+
+    def __layout_key(self, station_icons, weather_symbols, station_labels, fuel_type):
+        """
+        Computes the snapshot key of a main layout.
+
+        Args:
+            station_icons (list): A list of image file paths for gas station icons.
+            weather_symbols (list): A list of image file paths for weather symbols.
+            station_labels (list): A list of tuples, each containing station information (e.g., name, fuel type).
+            fuel_type (str): The current fuel type being displayed (e.g., 'e5', 'e10', 'diesel').
+
+        Returns:
+            bytes: SHA-256 digest of the layout version and arguments.
+        """
+        layout = (self.__SNAPSHOT_VERSION, station_icons, weather_symbols, station_labels, fuel_type)
+        return hashlib.sha256(repr(layout).encode()).digest()
 
     def draw_main_layout(self, station_icons, weather_symbols, station_labels, fuel_type):
         """
         Draws the main layout of the display, including dividers, weather symbols, and station placeholders.
 
+        The static parts are saved as a snapshot while they are drawn. If the snapshot drawn at boot shows the
+        same layout, they are already on screen and only the widget tree is built.
+
         Args:
-            station_icons (list): A list of image data for gas station icons.
-            weather_symbols (list): A list of image data for weather symbols.
+            station_icons (list): A list of image file paths for gas station icons.
+            weather_symbols (list): A list of image file paths for weather symbols.
             station_labels (list): A list of tuples, each containing station information (e.g., name, fuel type).
             fuel_type (str): The current fuel type being displayed (e.g., 'e5', 'e10', 'diesel').
         """
-        self.clear_display()
-        self.display.fill_rect(398, 0, 2, 80, ILI9488.BLACK)
-        for i in range(2):
-            self.display.fill_rect(0, 80 + 80 * i, 480, 2, ILI9488.BLACK)
-        self.display.fill_rect(0, 39, 400, 2, ILI9488.BLACK)
-        self.display.fill_rect(143, 0, 2, 40, ILI9488.BLACK)
-        self.display.fill_rect(298, 0, 2, 40, ILI9488.BLACK)
-        self.display.fill_rect(0, 160, 480, 2, ILI9488.BLACK)
-        self.display.fill_rect(0, 240, 480, 2, ILI9488.BLACK)
-        self.display.fill_rect(330, 80, 2, 240, ILI9488.BLACK)
-        
-        self.display.image(3, 44, 34, 34, weather_symbols[0])
-        self.display.image(101, 43, 34, 34, weather_symbols[1])
-        self.display.image(199, 44, 34, 34, weather_symbols[2])
-        self.display.image(297, 43, 34, 34, weather_symbols[3])
-
-        for i in range(3):
-            self.display.image(8, 88 + 80 * i, 64, 64, station_icons[i])
-            self.display.fill_rect(332, 82 + 80 * i, 148, 78, RGB(140, 240, 140))
-            if station_labels[i][1] == "":
-                self.display.text(90, 89 + 80 * i, self.__STATION_DEFAULT_TEXT_LABELS[i], ILI9488.BLACK, 1, ILI9488.WHITE)
-            else:
-                self.display.text(90, 89 + 80 * i,  station_labels[i][1][:21], ILI9488.BLACK, 1, ILI9488.WHITE)
-            if station_labels[i][2] == "":
-                self.display.text(90, 89 + 80 * i + 22, self.__STATION_DEFAULT_FUEL_LABELS.get(fuel_type), ILI9488.BLACK, 1, ILI9488.WHITE)
-            else:
-                self.display.text(90, 89 + 80 * i + 22,  station_labels[i][2][:21], ILI9488.BLACK, 1, ILI9488.WHITE)
+        key = self.__layout_key(station_icons, weather_symbols, station_labels, fuel_type)
+        recorder = None
+        if key == self.snapshot_key:
+            self.__reset_layout()
+            self.screen = self.__build_main_layout(station_icons, weather_symbols, station_labels, fuel_type)
+            self.screen.mark_painted()
+        else:
+            self.clear_display()
+            self.screen = self.__build_main_layout(station_icons, weather_symbols, station_labels, fuel_type)
+            try:
+                recorder = SnapshotRecorder(self.__SNAPSHOT_PATH, key)
+            except OSError:
+                pass # No snapshot, the layout is drawn from scratch on the next boot
+            self.display.record(recorder)
+        self.screen.render()
+        self.display.record(None)
+        if recorder is not None:
+            recorder.close()
+        self.snapshot_key = key
+        self.display.flush(False)
     
+    def __set_weather_row_visible(self, visible):
+        """
+        Shows or hides the widgets of the weather data row, which the ticker takes over while it is scrolling.
+
+        Args:
+            visible (bool): True to show the weather data row.
+        """
+        for widget in self.widgets["weather_symbols"] + self.widgets["weather_data"]:
+            widget.set_visible(visible)
+
+    def show_ticker_message(self, message):
+        """
+        Queues a message for the ticker. While messages are scrolling, the ticker takes over the weather data row.
+
+        Args:
+            message (str): The message to show.
+        """
+        if self.ticker is None:
+            return
+        if not self.ticker.active:
+            self.display.fill_rect(0, 41, 398, 39, ILI9488.WHITE)
+            self.__set_weather_row_visible(False)
+        self.ticker.add(message)
+        self.display.flush(False)
+
+    def step_ticker(self):
+        """
+        Scrolls the ticker by one step and restores the weather data row once all messages have scrolled through.
+
+        Returns:
+            bool: True while the ticker is scrolling.
+        """
+        if self.ticker is None or not self.ticker.active:
+            return False
+        scrolling = self.ticker.step()
+        if not scrolling:
+            self.__set_weather_row_visible(True)
+            self.screen.render()
+        self.display.flush(False)
+        return scrolling
+
     def draw_weekday_date_time(self, timedate):
         """
         Draws the weekday, date, and time on the display, updating only changed elements.
@@ -172,72 +328,69 @@ class DisplayManager:
         Args:
             timedate (list): A list containing [weekday (str), date (str), time (str)].
         """
-        if timedate[0] != self.currently_displayed.get("timedate")[0]:
-            self.currently_displayed["timedate"][0] = timedate[0]
-            text_length = self.ili_font.measure_text(timedate[0])
-            self.display.fill_rect(0, 0, 142, 39, ILI9488.WHITE)
-            if timedate[0] == "SUNDAY":
-                self.display.text(23 + (98 - text_length) // 2, 11, timedate[0], ILI9488.RED, 1, ILI9488.WHITE)
-            else:
-                self.display.text(23 + (98 - text_length) // 2, 11, timedate[0], ILI9488.BLACK, 1, ILI9488.WHITE)
-        if timedate[1] != self.currently_displayed.get("timedate")[1]:
-            self.currently_displayed["timedate"][1] = timedate[1]
-            self.display.text(167, 11, timedate[1], ILI9488.BLACK, 1, ILI9488.WHITE)
-        if timedate[2] != self.currently_displayed.get("timedate")[2]:
-            self.currently_displayed["timedate"][2] = timedate[2]
-            self.display.text(322, 11, timedate[2], ILI9488.BLACK, 1, ILI9488.WHITE)
+        self.widgets["weekday"].set(timedate[0], ILI9488.RED if timedate[0] == "SUNDAY" else ILI9488.BLACK)
+        self.widgets["date"].set(timedate[1])
+        self.widgets["time"].set(timedate[2])
+        self.screen.render()
+        self.display.flush(False)
     
-    def draw_weather_data(self, weather_data, weather_icon_name, weather_icon=None):
+    def draw_weather_data(self, weather_data, weather_icon=None, stale=None):
         """
         Draws weather data and updates the weather icon if it has changed.
 
         Args:
             weather_data (list): A list of strings representing various weather metrics.
-            weather_icon_name (str): The name of the current weather icon.
-            weather_icon: The image data for the weather icon (optional, used if name changes).
+            weather_icon (str, optional): Path of the weather icon image file, only redrawn if the path changed.
+            stale (list, optional): Tells for each value whether it is last known data, drawn grayed out. Defaults to None (all fresh).
         """
+        if all(value == "----" for value in weather_data):
+            self.show_ticker_message("Weather data unavailable")
         for i in range(len(weather_data)):
-            if weather_data[i] != self.currently_displayed.get("weather_data")[i]:
-                self.currently_displayed["weather_data"][i] = weather_data[i]
-                self.display.text(42 + 98 * i, 51,  self.__ljust(weather_data[i], 5), ILI9488.BLACK, 1, ILI9488.WHITE)
-        
-        if weather_icon_name != self.currently_displayed.get("weather_icon_name"):
-            self.currently_displayed["weather_icon_name"] = weather_icon_name
-            self.display.image(400, 0, 80, 80, weather_icon)
+            color = self.__STALE_COLOR if stale and stale[i] else ILI9488.BLACK
+            self.widgets["weather_data"][i].set(weather_data[i], color)
+        if weather_icon is not None:
+            self.widgets["weather_icon"].set(weather_icon)
+        self.screen.render()
+        self.display.flush(False)
     
-    def draw_station_data(self, station_statuses, fuel_prices):
+    def draw_station_data(self, station_statuses, fuel_prices, stale=None):
         """
         Draws gas station statuses and fuel prices, updating only changed elements.
 
         Args:
             station_statuses (list): A list of strings representing the status of each gas station.
             fuel_prices (list): A list of strings representing the fuel prices for each station.
+            stale (list, optional): Tells for each station whether it shows last known data, drawn grayed out. Defaults to None (all fresh).
         """
+        stations = self.widgets["stations"]
         for i in range(len(station_statuses)):
-            if station_statuses[i] != self.currently_displayed.get("station_statuses")[i]:
-                self.currently_displayed["station_statuses"][i] = station_statuses[i]
-                status = station_statuses[i]
-                self.display.text(90, 133 + 80 * i, self.__ljust(status, 14), self.__STATION_STATUS_COLOR.get(status), 1, ILI9488.WHITE)
+            status = station_statuses[i]
+            stale_station = stale and stale[i]
+            stations[i]["status"].set(status, self.__STALE_COLOR if stale_station else self.__STATION_STATUS_COLOR.get(status))
+        
+        if all(status == "STATUS UNKNOWN" for status in station_statuses):
+            self.show_ticker_message("Station data unavailable")
         
-        self.display.set_font(self.price_font)
         for i in range(len(fuel_prices)):
-            if fuel_prices[i] != self.currently_displayed.get("fuel_prices")[i]:
-                self.currently_displayed["fuel_prices"][i] = fuel_prices[i]
-                self.display.text(343, 91 + 80 * i, fuel_prices[i], ILI9488.BLACK, 2, RGB(140, 240, 140), 6)
+            price = stations[i]["price"]
+            if price.text not in ("", "-,--") and fuel_prices[i] not in (price.text, "-,--"):
+                self.show_ticker_message(f"{stations[i]['name']}: {price.text} -> {fuel_prices[i]}")
+            price.set(fuel_prices[i], self.__STALE_COLOR if stale and stale[i] else ILI9488.BLACK)
         
-        self.display.set_font(self.ili_font)
+        self.screen.render()
+        self.display.flush(False)
     
     def draw_update_screen(self, update_icon, current_version, update_version):
         """
         Draws a screen indicating a system update or rollback is in progress.
 
         Args:
-            update_icon: The image data for the update icon.
+            update_icon (str): Path of the update icon image file.
             current_version (str): The current version of the system.
             update_version (str): The target version for the update or rollback.
         """
         self.clear_display()
-        self.display.image(10, 110, 100, 100, update_icon)
+        self.display.image_file(10, 110, 100, 100, update_icon)
         self.display.text(125, 120, "Updating System", ILI9488.BLACK, 2, ILI9488.WHITE)
         cur = [int(x) for x in current_version.lstrip("v").split(".")]
         upd = [int(x) for x in update_version.lstrip("v").split(".")]
@@ -248,6 +401,7 @@ class DisplayManager:
             self.display.text(125, 160, f"Updating {current_version} to {update_version}", ILI9488.BLACK, 1, ILI9488.WHITE)
         else:
             self.display.text(125, 160, f"Rollback {current_version} to {update_version}", ILI9488.BLACK, 1, ILI9488.WHITE)
+        self.display.flush(False)
 
     def draw_update_action(self, update_action):
         """
@@ -257,4 +411,5 @@ class DisplayManager:
             update_action (str): A description of the current update step.
         """
         self.display.text(125, 180, self.__ljust(update_action, 22), ILI9488.BLACK, 1, ILI9488.WHITE)
+        self.display.flush(False)
 
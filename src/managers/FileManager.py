@@ -5,6 +5,8 @@ from drivers.sdcard import SDCard
 
 class FileManager:
     """Manages file system operations, including SD card access and configuration validation."""
+    __IMAGE_EXTENSIONS = (".idx666", ".rle666", ".rgb666") # Preferred image formats first
+
     def __init__(self):
         """
         Initializes the FileManager, setting up configuration storage and regex for UUID validation.
@@ -93,18 +95,18 @@ class FileManager:
 
     def __count_station_icons(self):
         """
-        Counts the number of .rgb666 station icon files on the SD card.
+        Counts the number of station icons on the SD card (image files of the same name in different formats count once).
 
         Returns:
-            int: The number of station icon files found.
+            int: The number of station icons found.
         """
         try:
             files = os.listdir("/sd/station_icons")
         except Exception:
             return 0
         
-        rgb666_files = [f for f in files if f.endswith(".rgb666")]
-        return len(rgb666_files)
+        icon_names = set(f[:-7] for f in files if f.endswith(".rgb666") or f.endswith(".rle666") or f.endswith(".idx666"))
+        return len(icon_names)
     
     def __validate_station_icons(self):
         """
@@ -119,14 +121,23 @@ class FileManager:
             return True
 
         for f in files:
+            path = "/sd/station_icons/" + f
             if f.endswith(".rgb666"):
-                path = "/sd/station_icons/" + f
                 try:
                     size = os.stat(path)[6]
                     if size != 64 * 64 * 3:
                         return False
                 except Exception:
                     return False
+            elif f.endswith(".rle666") or f.endswith(".idx666"):
+                try:
+                    with open(path, "rb") as icon:
+                        # Magic followed by width and height (big-endian 16 bit)
+                        magic = b"RLE6" if f.endswith(".rle666") else b"IDX6"
+                        if icon.read(8) != magic + b"\x00\x40\x00\x40":
+                            return False
+                except Exception:
+                    return False
         
         return True
     
@@ -313,9 +324,10 @@ class FileManager:
         else:
             return configuration
         
-    def get_image_file(self, image_category, image_name):
+    def get_image_path(self, image_category, image_name):
         """
-        Retrieves image data from the SD card based on category and name.
+        Resolves the path of an image file based on category and name.
+        Palette-indexed (.idx666) and run-length encoded (.rle666) images are preferred over raw (.rgb666) ones.
         Provides fallback images if the requested image is not found.
 
         Args:
@@ -323,14 +335,14 @@ class FileManager:
             image_name (str): The name of the image file (without extension).
 
         Returns:
-            bytes: The binary data of the image file.
+            str: The path of the image file, to be streamed to the display.
 
         Raises:
             Exception: If an unknown image category is provided.
         """
         if image_category == "station":
             folder = "/sd/station_icons"
-            fallback = "/symbols/unknown-station.rgb666"
+            fallback = "/symbols/unknown-station.idx666"
         elif image_category == "weather":
             folder = "/weather_icons"
             fallback = None
@@ -343,15 +355,18 @@ class FileManager:
         else:
             raise Exception("Unknown Image Category!")
         
+        file_path = fallback
         try:
-            filename = f"{image_name}.rgb666"
             files = os.listdir(folder)
-            file_path = f"{folder}/{filename}" if filename in files else fallback
+            for extension in self.__IMAGE_EXTENSIONS:
+                filename = f"{image_name}{extension}"
+                if filename in files:
+                    file_path = f"{folder}/{filename}"
+                    break
         except Exception:
-            file_path = fallback
+            pass
 
-        with open(file_path, "rb") as f:
-            return f.read()
+        return file_path
         
     def close(self):
         """
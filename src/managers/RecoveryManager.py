@@ -0,0 +1,142 @@
+# Import required libraries
+import time, random
+
+class RecoveryManager:
+    """Tracks failing upstreams (e.g., WLAN, internet access, NTP) and decides when to retry them.
+
+    Every upstream has a circuit breaker. While it works, the circuit is closed and every check
+    runs its probe. After a failure the circuit opens: checks fail right away without probing until
+    the backoff delay has passed, then one check probes again (half open). A success closes the
+    circuit, another failure opens it with twice the delay, up to a maximum. The delays are jittered
+    so retries do not hit a recovering router or server in lockstep.
+
+    Every upstream has a retry budget. Once it fails that many times in a row, the failure is no
+    longer considered transient and is escalated to the caller.
+    """
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+    def __init__(self, clock=time.time, rand=None):
+        """
+        Initializes the RecoveryManager.
+
+        Args:
+            clock (function, optional): Returns the current time in seconds. Defaults to time.time.
+            rand (function, optional): Returns a random number in [0, 1) for the jitter. Defaults to None
+                (random.getrandbits()).
+        """
+        self.clock = clock
+        self.rand = rand if rand is not None else lambda: random.getrandbits(16) / 65536
+        self.upstreams = {} # Name -> [state, failures, retry time, base delay, max delay, budget, last error code, last error text]
+
+    def register(self, name, base_delay=2, max_delay=120, budget=20):
+        """
+        Registers an upstream.
+
+        Args:
+            name (str): Name of the upstream (e.g., "wlan").
+            base_delay (float, optional): Seconds before the first retry. Defaults to 2.
+            max_delay (float, optional): Maximum seconds between retries. Defaults to 120.
+            budget (int, optional): Failures in a row after which the failure is escalated. Defaults to 20.
+        """
+        self.upstreams[name] = [self.CLOSED, 0, 0, base_delay, max_delay, budget, "OK", None]
+
+    def check(self, name, probe):
+        """
+        Probes an upstream unless its circuit is open.
+
+        Args:
+            name (str): Name of the upstream.
+            probe (function): Returns an error code (or "OK") and a list of error messages (or None),
+                like the checks of the other managers.
+
+        Returns:
+            bool: True if the upstream works.
+        """
+        upstream = self.upstreams[name]
+        if upstream[0] == self.OPEN:
+            if self.clock() < upstream[2]:
+                return False
+            upstream[0] = self.HALF_OPEN
+        error_code, error_text = probe()
+        if error_code == "OK":
+            self.success(name)
+            return True
+        self.failure(name, error_code, error_text)
+        return False
+
+    def success(self, name):
+        """
+        Closes the circuit of an upstream.
+
+        Args:
+            name (str): Name of the upstream.
+        """
+        upstream = self.upstreams[name]
+        upstream[0] = self.CLOSED
+        upstream[1] = 0
+        upstream[6] = "OK"
+        upstream[7] = None
+
+    def failure(self, name, error_code, error_text):
+        """
+        Opens the circuit of an upstream and calculates when it is retried.
+
+        Args:
+            name (str): Name of the upstream.
+            error_code (str): The error code of the failure.
+            error_text (list): The error messages of the failure.
+
+        Returns:
+            float: Seconds until the upstream is retried.
+        """
+        upstream = self.upstreams[name]
+        upstream[1] += 1
+        # Exponential backoff, the jitter takes up to half of the delay off
+        delay = min(upstream[4], upstream[3] * 2 ** (upstream[1] - 1))
+        delay *= 1 - self.rand() / 2
+        upstream[0] = self.OPEN
+        upstream[2] = self.clock() + delay
+        upstream[6] = error_code
+        upstream[7] = error_text
+        return delay
+
+    def is_down(self, name):
+        """
+        Checks whether an upstream failed its last check.
+
+        Args:
+            name (str): Name of the upstream.
+
+        Returns:
+            bool: True while its circuit is open or half open.
+        """
+        return self.upstreams[name][0] != self.CLOSED
+
+    def time_until_retry(self, name):
+        """
+        Returns the time until an upstream is probed again.
+
+        Args:
+            name (str): Name of the upstream.
+
+        Returns:
+            float: Seconds until the retry, 0 if it can be probed now.
+        """
+        upstream = self.upstreams[name]
+        if upstream[0] != self.OPEN:
+            return 0
+        return max(0, upstream[2] - self.clock())
+
+    def exhausted(self):
+        """
+        Finds an upstream that has used up its retry budget.
+
+        Returns:
+            tuple: The error code (or "OK") and the error messages (or None) of its last failure.
+        """
+        for upstream in self.upstreams.values():
+            if upstream[1] >= upstream[5]:
+                return upstream[6], upstream[7]
+        return "OK", None
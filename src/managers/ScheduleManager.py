@@ -0,0 +1,114 @@
+# Import required libraries
+import time
+
+class ScheduleManager:
+    """Runs periodic tasks at their due times and sleeps until the next one is due.
+
+    Every task has a period and an offset, it is due whenever the clock minus the offset is a
+    multiple of the period, e.g. a period of 300 and an offset of 61 gives XX:01:01, XX:06:01, etc.
+    The clock and the sleep function are passed in, so the schedule can follow local time and be
+    driven by a simulated clock.
+    """
+    def __init__(self, clock=time.time, sleep=time.sleep):
+        """
+        Initializes the ScheduleManager.
+
+        Args:
+            clock (function, optional): Returns the current time in seconds. Defaults to time.time.
+            sleep (function, optional): Sleeps for the given number of seconds. Defaults to time.sleep.
+        """
+        self.clock = clock
+        self.sleep_function = sleep
+        self.tasks = []     # [due, period, offset, callback], period is None for tasks that run once, tasks due at the same time run in the order they were added
+        self.last_now = None
+
+    def __next_due(self, now, period, offset):
+        """
+        Calculates the first due time of a task after a point in time.
+
+        Args:
+            now (float): The point in time in seconds.
+            period (int): Seconds between two runs.
+            offset (int): Seconds the runs are shifted against multiples of the period.
+
+        Returns:
+            int: The due time in seconds.
+        """
+        return int(now - offset) // period * period + period + offset
+
+    def add(self, callback, period, offset=0):
+        """
+        Adds a periodic task, it first runs at its next due time.
+
+        Args:
+            callback (function): Called without arguments when the task is due.
+            period (int): Seconds between two runs (e.g., 60 for every minute).
+            offset (int, optional): Seconds after each multiple of the period the task is due. Defaults to 0.
+        """
+        self.tasks.append([self.__next_due(self.clock(), period, offset), period, offset, callback])
+
+    def add_once(self, callback, delay):
+        """
+        Adds a task that runs once after a delay (e.g., a retry).
+
+        Args:
+            callback (function): Called without arguments when the task is due.
+            delay (float): Seconds until the task is due.
+        """
+        self.tasks.append([self.clock() + delay, None, 0, callback])
+
+    def __now(self):
+        """
+        Reads the clock and schedules all tasks anew if it went back (e.g., by a time synchronization
+        or the end of summer time), otherwise they would only run once the clock caught up again.
+
+        Returns:
+            float: The current time in seconds.
+        """
+        now = self.clock()
+        if self.last_now is not None and now < self.last_now:
+            # A task due right at the new time still runs (e.g., the minute tick at 02:00:00 after 02:59:59)
+            for task in self.tasks:
+                task[0] = self.__next_due(now - 1, task[1], task[2]) if task[1] is not None else min(task[0], now)
+        self.last_now = now
+        return now
+
+    def run_pending(self):
+        """
+        Runs all tasks that are due and schedules their next run. A task that was due several times
+        (e.g., after the clock jumped ahead) runs only once.
+        """
+        now = self.__now()
+        # Tasks may add tasks while they run
+        for task in list(self.tasks):
+            if task[0] <= now:
+                if task[1] is None:
+                    self.tasks.remove(task)
+                else:
+                    task[0] = self.__next_due(now, task[1], task[2])
+                task[3]()
+
+    def time_until_next(self):
+        """
+        Returns the time until the next task is due.
+
+        Returns:
+            float: Seconds until the earliest due time, 0 if a task is already due or None without tasks.
+        """
+        if not self.tasks:
+            return None
+        now = self.__now()
+        return max(0, min(task[0] for task in self.tasks) - now)
+
+    def sleep(self, max_seconds=None):
+        """
+        Sleeps until the next task is due.
+
+        Args:
+            max_seconds (float, optional): Seconds to sleep at most, e.g. to keep an animation running. Defaults to None.
+        """
+        seconds = self.time_until_next()
+        if max_seconds is not None and (seconds is None or seconds > max_seconds):
+            seconds = max_seconds
+        if seconds:
+            self.sleep_function(seconds)
@@ -1,5 +1,9 @@
-# Import requests library
-import urequests as requests
+# Import HTTP client
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+from net import http
 
 class StationManager:
     """Manages fetching and processing gas station data from the Tankerkoenig API."""
@@ -59,6 +63,22 @@ class StationManager:
         except Exception:
             return "-,--"
         
+    def __process_station_data(self, data):
+        """
+        Extracts statuses and fuel prices of all configured stations from the API response data.
+
+        Args:
+            data (dict): The JSON response data from the Tankerkoenig API, None if the request failed.
+
+        Returns:
+            tuple: A tuple containing two lists: station statuses and fuel prices.
+        """
+        if data is None:
+            return [self.__STATION_STATUSES.get(None)] * len(self.station_ids), ["-,--"] * len(self.station_ids)
+        statuses = [self.__get_station_status(data, sid) for sid in self.station_ids]
+        prices = [self.__get_station_fuel_price(data, sid) for sid in self.station_ids]
+        return statuses, prices
+
     def get_station_data(self):
         """
         Fetches gas station statuses and fuel prices for all configured stations.
@@ -67,15 +87,31 @@ class StationManager:
             tuple: A tuple containing two lists: station statuses and fuel prices.
         """
         try:
-            response = requests.get(f"{self.base_url_station_info}&ids={",".join(self.station_ids)}")
+            response = http.get(f"{self.base_url_station_info}&ids={",".join(self.station_ids)}")
             data = response.json()
             response.close()
-            statuses = [self.__get_station_status(data, sid) for sid in self.station_ids]
-            prices = [self.__get_station_fuel_price(data, sid) for sid in self.station_ids]
-
         except Exception:
-            statuses = [self.__STATION_STATUSES.get(None)] * len(self.station_ids)
-            prices = ["-,--"] * len(self.station_ids)
+            data = None
+        return self.__process_station_data(data)
 
-        return statuses, prices
+    async def get_station_data_async(self, timeout):
+        """
+        Fetches gas station statuses and fuel prices for all configured stations without blocking other tasks.
 
+        Args:
+            timeout (float): Seconds the request may take including the body.
+
+        Returns:
+            tuple: A tuple containing two lists: station statuses and fuel prices.
+        """
+        async def fetch():
+            response = await http.get_async(f"{self.base_url_station_info}&ids={",".join(self.station_ids)}")
+            try:
+                return await response.json()
+            finally:
+                response.close()
+        try:
+            data = await asyncio.wait_for(fetch(), timeout)
+        except Exception:
+            data = None
+        return self.__process_station_data(data)
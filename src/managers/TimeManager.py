@@ -1,16 +1,268 @@
 # Import required libraries
 import ntptime, time
-import urequests as requests
+from net import http
+
+_NEVER = float("inf")
+
+def _days_from_civil(year, month, day):
+    """
+    Counts the days from 1970-01-01 to a date of the proleptic Gregorian calendar.
+
+    Args:
+        year (int): The year.
+        month (int): The month (1-12).
+        day (int): The day of the month (1-31).
+
+    Returns:
+        int: The number of days, negative before 1970.
+    """
+    year -= month <= 2
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    return era * 146097 + year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year - 719468
+
+def _is_leap(year):
+    """
+    Checks whether a year is a leap year.
+
+    Args:
+        year (int): The year.
+
+    Returns:
+        bool: True for leap years.
+    """
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+# Seconds from 1970-01-01 to the epoch of time.time(), which is 2000-01-01 on some MicroPython ports
+_EPOCH = _days_from_civil(time.gmtime(0)[0], 1, 1) * 86400
+
+class PosixTimezone:
+    """Local time offsets from a POSIX TZ rule, e.g. "CET-1CEST,M3.5.0,M10.5.0/3" for central Europe.
+
+    The rule names the standard time and its offset (west of UTC, so CET-1 is UTC+1), optionally
+    followed by the summer time, its offset (one hour ahead if omitted) and the dates and local
+    times it starts and ends: Mm.w.d is weekday d (0 = Sunday) of week w (5 = last) of month m,
+    Jn is day n of the year without February 29 and n is day n of the year counting from 0.
+    """
+    def __init__(self, rule):
+        """
+        Parses a rule.
+
+        Args:
+            rule (str): The POSIX TZ rule.
+
+        Raises:
+            ValueError: If the rule is not valid or not a string.
+        """
+        if not isinstance(rule, str):
+            raise ValueError("Invalid timezone rule: " + repr(rule))
+        self.rule = rule
+        self.position = 0
+        self.__parse_name()
+        self.std_offset = -self.__parse_time()
+        self.dst_offset = None
+        self.start = self.end = None
+        if self.position < len(rule):
+            self.__parse_name()
+            self.dst_offset = self.std_offset + 3600
+            if self.position < len(rule) and rule[self.position] != ",":
+                self.dst_offset = -self.__parse_time()
+            if self.position < len(rule):
+                self.start = self.__parse_transition()
+                self.end = self.__parse_transition()
+            else:
+                # Without dates, POSIX leaves the rules to the implementation, these are the US ones
+                self.start = ("M", 3, 2, 0, 7200)
+                self.end = ("M", 11, 1, 0, 7200)
+        if self.position != len(rule):
+            raise ValueError("Invalid timezone rule: " + rule)
+
+    def __parse_name(self):
+        """Skips a timezone name, either letters or a quoted name in angle brackets."""
+        rule = self.rule
+        start = self.position
+        if rule[start:start + 1] == "<":
+            end = rule.find(">", start)
+            if end < 0:
+                raise ValueError("Invalid timezone rule: " + rule)
+            self.position = end + 1
+            return
+        end = start
+        while end < len(rule) and rule[end].isalpha():
+            end += 1
+        if end - start < 3:
+            raise ValueError("Invalid timezone rule: " + rule)
+        self.position = end
+
+    def __parse_number(self):
+        """
+        Reads an unsigned decimal number.
+
+        Returns:
+            int: The number.
+        """
+        rule = self.rule
+        start = self.position
+        while self.position < len(rule) and rule[self.position].isdigit():
+            self.position += 1
+        if self.position == start:
+            raise ValueError("Invalid timezone rule: " + rule)
+        return int(rule[start:self.position])
+
+    def __parse_time(self):
+        """
+        Reads a signed time of the form [+|-]hh[:mm[:ss]].
+
+        Returns:
+            int: The time in seconds.
+        """
+        rule = self.rule
+        sign = 1
+        if rule[self.position:self.position + 1] in ("+", "-"):
+            sign = -1 if rule[self.position] == "-" else 1
+            self.position += 1
+        seconds = self.__parse_number() * 3600
+        for factor in (60, 1):
+            if rule[self.position:self.position + 1] != ":":
+                break
+            self.position += 1
+            seconds += self.__parse_number() * factor
+        return sign * seconds
+
+    def __parse_transition(self):
+        """
+        Reads a transition of the form ,date[/time].
+
+        Returns:
+            tuple: The kind ("M", "J" or "N"), its numbers and the local time in seconds.
+        """
+        rule = self.rule
+        if rule[self.position:self.position + 1] != ",":
+            raise ValueError("Invalid timezone rule: " + rule)
+        self.position += 1
+        kind = rule[self.position:self.position + 1]
+        if kind == "M":
+            self.position += 1
+            month = self.__parse_number()
+            numbers = [month]
+            for _ in range(2):
+                if rule[self.position:self.position + 1] != ".":
+                    raise ValueError("Invalid timezone rule: " + rule)
+                self.position += 1
+                numbers.append(self.__parse_number())
+            if not (1 <= month <= 12 and 1 <= numbers[1] <= 5 and 0 <= numbers[2] <= 6):
+                raise ValueError("Invalid timezone rule: " + rule)
+        elif kind == "J":
+            self.position += 1
+            numbers = [self.__parse_number()]
+            if not 1 <= numbers[0] <= 365:
+                raise ValueError("Invalid timezone rule: " + rule)
+        else:
+            kind = "N"
+            numbers = [self.__parse_number()]
+            if numbers[0] > 365:
+                raise ValueError("Invalid timezone rule: " + rule)
+        time_of_day = 7200
+        if rule[self.position:self.position + 1] == "/":
+            self.position += 1
+            time_of_day = self.__parse_time()
+        if kind == "M":
+            return kind, numbers[0], numbers[1], numbers[2], time_of_day
+        return kind, numbers[0], time_of_day
+
+    def __transition_day(self, transition, year):
+        """
+        Calculates the day a transition happens in a year.
+
+        Args:
+            transition (tuple): The parsed transition.
+            year (int): The year.
+
+        Returns:
+            int: Days from 1970-01-01 to that day.
+        """
+        kind = transition[0]
+        if kind == "J":
+            day = transition[1] - 1
+            if _is_leap(year) and day >= 59:
+                day += 1 # February 29 is not counted
+            return _days_from_civil(year, 1, 1) + day
+        if kind == "N":
+            return _days_from_civil(year, 1, 1) + transition[1]
+        month, week, weekday = transition[1], transition[2], transition[3]
+        first = _days_from_civil(year, month, 1)
+        # 1970-01-01 was a Thursday, weekday 4 when Sunday is 0
+        day = first + (weekday - (first + 4)) % 7 + (week - 1) * 7
+        next_month = _days_from_civil(year + 1, 1, 1) if month == 12 else _days_from_civil(year, month + 1, 1)
+        while day >= next_month:
+            day -= 7 # Week 5 is the last one, which may be the fourth
+        return day
+
+    def __transitions(self, year):
+        """
+        Calculates the transitions of a year.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            list: (UTC time like time.time(), offset in seconds from then on) for the start and the end of summer time.
+        """
+        # The start is given in standard time, the end in summer time
+        start = self.__transition_day(self.start, year) * 86400 + self.start[-1] - self.std_offset - _EPOCH
+        end = self.__transition_day(self.end, year) * 86400 + self.end[-1] - self.dst_offset - _EPOCH
+        return [(start, self.dst_offset), (end, self.std_offset)]
+
+    def offset_at(self, utc):
+        """
+        Calculates the offset at a point in time and when it changes next.
+
+        Args:
+            utc (int): UTC time like time.time().
+
+        Returns:
+            tuple: The offset to UTC in seconds and the UTC time of the next transition (infinite without summer time).
+        """
+        if self.dst_offset is None:
+            return self.std_offset, _NEVER
+        year = time.gmtime(utc)[0]
+        transitions = sorted(self.__transitions(year - 1) + self.__transitions(year) + self.__transitions(year + 1))
+        offset = self.std_offset
+        for when, after in transitions:
+            if when > utc:
+                return offset, when
+            offset = after
+        return offset, _NEVER
 
 class TimeManager:
     """Manages time synchronization and timezone settings for the device."""
 
     __WEEKDAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY"]
     __HEADERS = {"User-Agent": "ESP32-OTA-Updater"}
+    # Rules of the timezones the lookup may return, so their summer time changes are known without further lookups
+    __TIMEZONE_RULES = {
+        "Europe/Berlin": "CET-1CEST,M3.5.0,M10.5.0/3",
+        "Europe/Amsterdam": "CET-1CEST,M3.5.0,M10.5.0/3",
+        "Europe/Brussels": "CET-1CEST,M3.5.0,M10.5.0/3",
+        "Europe/Copenhagen": "CET-1CEST,M3.5.0,M10.5.0/3",
+        "Europe/Luxembourg": "CET-1CEST,M3.5.0,M10.5.0/3",
+        "Europe/Paris": "CET-1CEST,M3.5.0,M10.5.0/3",
+        "Europe/Prague": "CET-1CEST,M3.5.0,M10.5.0/3",
+        "Europe/Vienna": "CET-1CEST,M3.5.0,M10.5.0/3",
+        "Europe/Warsaw": "CET-1CEST,M3.5.0,M10.5.0/3",
+        "Europe/Zurich": "CET-1CEST,M3.5.0,M10.5.0/3",
+        "Europe/London": "GMT0BST,M3.5.0/1,M10.5.0",
+        "Etc/UTC": "UTC0"
+    }
 
-    def __init__(self):
+    def __init__(self, timezone_rule=None):
         """
         Initializes the TimeManager, setting default timezone offset and sync status.
+
+        Args:
+            timezone_rule (str, optional): POSIX TZ rule of the local timezone (e.g., "CET-1CEST,M3.5.0,M10.5.0/3").
+                An invalid rule (or a value that is not a string) is ignored. Defaults to None (the rule is taken from the timezone lookup).
         """
         self.tz_offset = 0
         self.timezone = "Etc/UTC"
@@ -18,6 +270,14 @@ class TimeManager:
         self.timezone_set = False
         self._time = time.time
         self._localtime = time.localtime
+        self.rule = None
+        self.next_transition = _NEVER # UTC time the offset changes next
+        if timezone_rule:
+            try:
+                self.rule = PosixTimezone(timezone_rule)
+                self.next_transition = 0
+            except ValueError:
+                pass
 
     def sync_time(self):
         """
@@ -37,22 +297,39 @@ class TimeManager:
 
     def set_timezone(self):
         """
-        Determines the local timezone offset using an external API and sets it.
+        Determines the local timezone using an external API and sets it.
         Updates `self.tz_offset` and `self.timezone`.
+
+        Once the POSIX TZ rule of the timezone is known (configured, or looked up for the returned
+        timezone), offset changes are calculated locally and no further lookups are made.
         """
+        if self.timezone_set and self.rule is not None:
+            return
         try:
-            response = requests.get("https://ipapi.co/json", headers = self.__HEADERS)
+            response = http.get("https://ipapi.co/json", headers = self.__HEADERS)
             data = response.json()
             response.close()
             offset = data["utc_offset"]
             sign = 1 if offset[0] == "+" else -1
             hours = int(offset[1:3])
             minutes = int(offset[3:]) if len(offset) > 3 else 0
-            self.tz_offset = sign * (hours * 3600 + minutes * 60)
             self.timezone = data["timezone"]
+            if self.rule is None and self.timezone in self.__TIMEZONE_RULES:
+                self.rule = PosixTimezone(self.__TIMEZONE_RULES[self.timezone])
+            if self.rule is None:
+                # Unknown rule, the offset stays fixed until the next lookup
+                self.tz_offset = sign * (hours * 3600 + minutes * 60)
+                self.next_transition = _NEVER
+            else:
+                self.next_transition = 0
             self.timezone_set = True
         except Exception:
             self.timezone_set = False
+            if self.rule is not None:
+                # The rule gives the local time anyway, the identifier is only needed for the weather forecast
+                self.get_local_time()
+                hours = self.tz_offset // 3600
+                self.timezone = f"Etc/GMT{-hours:+d}" if self.tz_offset % 3600 == 0 and hours else "Etc/UTC"
     
     def get_tz_identifier(self):
         """
@@ -72,6 +349,19 @@ class TimeManager:
         """
         return self.timezone_set
 
+    def get_local_time(self):
+        """
+        Returns the current local time in seconds since the epoch, adjusted for timezone offset.
+        The offset is only recalculated once the next transition of the timezone rule is reached.
+
+        Returns:
+            int: The local time in seconds.
+        """
+        now = self._time()
+        if now >= self.next_transition:
+            self.tz_offset, self.next_transition = self.rule.offset_at(now)
+        return now + self.tz_offset
+
     def get_timestamp(self):
         """
         Returns the current local time as a timestamp tuple, adjusted for timezone offset.
@@ -79,7 +369,7 @@ class TimeManager:
         Returns:
             tuple: A tuple representing the local time (year, month, mday, hour, minute, second, weekday, yearday).
         """
-        return self._localtime(self._time() + self.tz_offset)
+        return self._localtime(self.get_local_time())
     
     def get_timedate(self):
         """
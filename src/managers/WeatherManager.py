@@ -1,8 +1,27 @@
-# Import requests library
-import urequests as requests
+# Import HTTP client and streaming JSON parser
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+from net.cache import cache
+from net.jsonselect import ANY, select, select_async
 
 class WeatherManager:
     """Manages fetching and processing weather data from the Brightsky API."""
+    # Only these values are taken from the responses, the hourly forecast is far too large to be parsed into a dict
+    __CURRENT_WEATHER_PATHS = {
+        "temperature": ("weather", "temperature"),
+        "icon": ("weather", "icon")
+    }
+    __FORECAST_PATHS = {
+        "timestamp": ("weather", ANY, "timestamp"),
+        "temperature": ("weather", ANY, "temperature"),
+        "precipitation_probability": ("weather", ANY, "precipitation_probability")
+    }
+    # Seconds the selected values are used before the server is asked again. The current weather is
+    # based on observations made every 10 minutes, the hourly forecast is updated at most once an hour.
+    __CURRENT_WEATHER_TTL = 600
+    __FORECAST_TTL = 3600
     def __init__(self, lat, long):
         """
         Initializes the WeatherManager with geographical coordinates.
@@ -30,16 +49,16 @@ class WeatherManager:
 
     def __get_current_temperature(self, data):
         """
-        Extracts the current temperature from the API response data.
+        Extracts the current temperature from the selected current weather values.
 
         Args:
-            data (dict): The JSON response data from the Brightsky API.
+            data (dict): The values selected from the current weather response.
 
         Returns:
             str: The current temperature formatted with `C or "----" if not available.
         """
         try:
-            data = data["weather"]["temperature"]
+            data = data["temperature"]
             return f"{self.__round_half_up(data)}`C" if data is not None else "N/A"
 
         except Exception:
@@ -47,10 +66,10 @@ class WeatherManager:
         
     def __get_rain_probability(self, data, hour):
         """
-        Extracts the probability of rain for a specific hour from the API response data.
+        Extracts the probability of rain for a specific hour from the selected forecast values.
 
         Args:
-            data (dict): The JSON response data from the Brightsky API.
+            data (dict): The values selected from the forecast response, one list per field.
             hour (int): The hour to get rain probability for.
 
         Returns:
@@ -58,23 +77,25 @@ class WeatherManager:
         """
         try:
             hour_str = f"{hour:02d}"
-            entry = next(
-                (w for w in data.get("weather", []) 
-                if w.get("timestamp", "")[11:13] == hour_str),
+            timestamps = data["timestamp"]
+            probabilities = data["precipitation_probability"]
+            index = next(
+                (i for i in range(len(timestamps))
+                if (timestamps[i] or "")[11:13] == hour_str),
                 None
             )
-            if entry and entry.get("precipitation_probability") is not None:
-                return f"{entry["precipitation_probability"]}%"
+            if index is not None and index < len(probabilities) and probabilities[index] is not None:
+                return f"{probabilities[index]}%"
             return "0%"
         except Exception:
             return "----"
     
     def __get_min_max_temperature(self, data, current_temperature, date):
         """
-        Extracts the minimum and maximum temperatures for a given date from the API response data.
+        Extracts the minimum and maximum temperatures for a given date from the selected forecast values.
 
         Args:
-            data (dict): The JSON response data from the Brightsky API.
+            data (dict): The values selected from the forecast response, one list per field.
             current_temperature (str): The current temperature string (e.g., "20`C").
             date (str): The date in "YYYY-MM-DD" format.
 
@@ -82,11 +103,13 @@ class WeatherManager:
             tuple: A tuple containing the minimum and maximum temperatures formatted with `C or "----" if not available.
         """
         try:
+            timestamps = data["timestamp"]
+            temperatures = data["temperature"]
             temps = [
-                entry["temperature"]
-                for entry in data.get("weather", [])
-                if entry.get("temperature") is not None
-                and entry.get("timestamp", "").startswith(date)
+                temperatures[i]
+                for i in range(min(len(timestamps), len(temperatures)))
+                if temperatures[i] is not None
+                and (timestamps[i] or "").startswith(date)
             ]
 
             if not temps:
@@ -108,53 +131,130 @@ class WeatherManager:
     
     def __get_weather_icon(self, data):
         """
-        Extracts the weather icon name from the API response data.
+        Extracts the weather icon name from the selected current weather values.
 
         Args:
-            data (dict): The JSON response data from the Brightsky API.
+            data (dict): The values selected from the current weather response.
 
         Returns:
             str: The weather icon name or "unknown" if not available.
         """
         try:
-            data = data["weather"]["icon"]
+            data = data["icon"]
             return str(data) if data is not None else "unknown"
 
         except Exception:
             return "unknown"
 
-    def get_weather_data(self, timestamp, timezone):
+    def __get_forecast_url(self, timestamp, timezone):
         """
-        Fetches and processes current and forecasted weather data.
+        Builds the URL of the forecast for the day of a timestamp.
 
         Args:
             timestamp (tuple): A time tuple (year, month, mday, hour, ...).
             timezone (str): The timezone identifier (e.g., "Europe/Berlin").
 
+        Returns:
+            str: The forecast URL.
+        """
+        return f"{self.base_url_weather}&date={timestamp[0]:04d}-{timestamp[1]:02d}-{timestamp[2]:02d}&tz={timezone}"
+
+    def __fetch(self, url, paths, ttl):
+        """
+        Fetches a response and selects values from it, cached values are used while they are fresh.
+
+        Args:
+            url (str): The URL.
+            paths (dict): The paths to select, see JsonSelector.
+            ttl (int): Seconds the selected values are cached.
+
+        Returns:
+            dict: The selected values or None if the request failed.
+        """
+        try:
+            return cache().get(url, ttl, lambda response: select(response, paths))
+        except Exception:
+            return None
+
+    async def __fetch_async(self, url, paths, ttl, timeout):
+        """
+        Fetches a response and selects values from it without blocking other tasks, cached values are used while they are fresh.
+
+        Args:
+            url (str): The URL.
+            paths (dict): The paths to select, see JsonSelector.
+            ttl (int): Seconds the selected values are cached.
+            timeout (float): Seconds the request may take including the body.
+
+        Returns:
+            dict: The selected values or None if the request failed or timed out.
+        """
+        async def parse(response):
+            return await select_async(response, paths)
+        try:
+            return await asyncio.wait_for(cache().get_async(url, ttl, parse), timeout)
+        except Exception:
+            return None
+
+    def __process_weather_data(self, current, forecast, timestamp):
+        """
+        Processes the selected current weather and forecast values.
+
+        Args:
+            current (dict): The values selected from the current weather response, None if not available.
+            forecast (dict): The values selected from the forecast response, None if not available.
+            timestamp (tuple): A time tuple (year, month, mday, hour, ...).
+
         Returns:
             tuple: A tuple containing a list of weather data [current_temp, rain_prob, min_temp, max_temp] and the weather icon name.
         """
         date = "{:04d}-{:02d}-{:02d}".format(
             timestamp[0], timestamp[1], timestamp[2]
         )
-        try:
-            response = requests.get(self.base_url_current_weather)
-            data = response.json()
-            response.close()
-            current_temperature = self.__get_current_temperature(data)
-            weather_icon_name = self.__get_weather_icon(data)
-        except Exception:
+        if current is not None:
+            current_temperature = self.__get_current_temperature(current)
+            weather_icon_name = self.__get_weather_icon(current)
+        else:
             current_temperature = "----"
             weather_icon_name = "unknown"
 
-        try:
-            response = requests.get(f"{self.base_url_weather}&date={date}&tz={timezone}")
-            data = response.json()
-            response.close()
-            rain_probability = self.__get_rain_probability(data, timestamp[3])
-            min_temp, max_temp = self.__get_min_max_temperature(data, current_temperature, date)
-        except Exception:
+        if forecast is not None:
+            rain_probability = self.__get_rain_probability(forecast, timestamp[3])
+            min_temp, max_temp = self.__get_min_max_temperature(forecast, current_temperature, date)
+        else:
             rain_probability, min_temp, max_temp = "----", "----", "----"
 
         return [current_temperature, rain_probability, min_temp, max_temp], weather_icon_name
 
+    def get_weather_data(self, timestamp, timezone):
+        """
+        Fetches and processes current and forecasted weather data.
+
+        Args:
+            timestamp (tuple): A time tuple (year, month, mday, hour, ...).
+            timezone (str): The timezone identifier (e.g., "Europe/Berlin").
+
+        Returns:
+            tuple: A tuple containing a list of weather data [current_temp, rain_prob, min_temp, max_temp] and the weather icon name.
+        """
+        current = self.__fetch(self.base_url_current_weather, self.__CURRENT_WEATHER_PATHS, self.__CURRENT_WEATHER_TTL)
+        forecast = self.__fetch(self.__get_forecast_url(timestamp, timezone), self.__FORECAST_PATHS, self.__FORECAST_TTL)
+        return self.__process_weather_data(current, forecast, timestamp)
+
+    async def get_weather_data_async(self, timestamp, timezone, timeout):
+        """
+        Fetches current and forecasted weather data concurrently and processes them.
+
+        Args:
+            timestamp (tuple): A time tuple (year, month, mday, hour, ...).
+            timezone (str): The timezone identifier (e.g., "Europe/Berlin").
+            timeout (float): Seconds each request may take, both run at the same time.
+
+        Returns:
+            tuple: A tuple containing a list of weather data [current_temp, rain_prob, min_temp, max_temp] and the weather icon name.
+        """
+        current, forecast = await asyncio.gather(
+            self.__fetch_async(self.base_url_current_weather, self.__CURRENT_WEATHER_PATHS, self.__CURRENT_WEATHER_TTL, timeout),
+            self.__fetch_async(self.__get_forecast_url(timestamp, timezone), self.__FORECAST_PATHS, self.__FORECAST_TTL, timeout)
+        )
+        return self.__process_weather_data(current, forecast, timestamp)
@@ -28,6 +28,22 @@ class WlanManager:
 
         self.wlan.connect(ssid, psk)
 
+    def reconnect(self, ssid, psk):
+        """
+        Starts a new connection attempt after the connection was lost, unless one is already in progress.
+
+        Args:
+            ssid (str): The SSID of the Wi-Fi network.
+            psk (str): The password (pre-shared key) for the Wi-Fi network.
+        """
+        if self.wlan.isconnected() or self.wlan.status() == getattr(network, "STAT_CONNECTING", None):
+            return
+        try:
+            self.wlan.disconnect()
+            self.wlan.connect(ssid, psk)
+        except OSError:
+            pass # The interface is busy, the next retry tries again
+
     def is_connected_boolean(self):
         """
         Checks if the device is currently connected to a WLAN network.
@@ -67,16 +83,24 @@ class WlanManager:
         """
         return self.wlan.ifconfig()[0] if self.wlan.isconnected() else None
 
-    def device_online(self):
+    def device_online(self, timeout=5):
         """
         Checks if the device has an active internet connection by attempting to reach a public IP.
 
+        Args:
+            timeout (float, optional): Seconds the connection attempt may take. Defaults to 5.
+
         Returns:
             tuple: A tuple containing an error code (or "OK") and a list of error messages (or None).
         """
         try:
             addr = socket.getaddrinfo("1.1.1.1", 53)[0][-1]
-            socket.socket().connect(addr)
+            sock = socket.socket()
+            try:
+                sock.settimeout(timeout)
+                sock.connect(addr)
+            finally:
+                sock.close()
             return "OK", None
         
         except Exception as e:
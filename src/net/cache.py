@@ -0,0 +1,354 @@
+# Cache of values parsed from HTTP responses, with time to live and conditional revalidation
+import os, json, time, hashlib
+try:
+    from binascii import hexlify
+except ImportError:
+    from ubinascii import hexlify
+from net import http
+
+RAM_BUDGET = 8192       # Bytes of cached values kept in RAM
+FLASH_BUDGET = 32768    # Bytes of cached values kept on flash
+FLASH_DIR = "http_cache"
+
+# Entry fields, entries are lists to keep them small
+_STORED = 0             # Time the response was received or last revalidated
+_ETAG = 1
+_LAST_MODIFIED = 2
+_VALUE = 3
+_SIZE = 4               # Approximate bytes the entry takes, used for the budgets
+
+class ResponseCache:
+    """Caches the values parsed from responses by URL.
+
+    A value is used without a request while it is younger than the time to live of its endpoint.
+    After that the request carries the validators the server sent (ETag, Last-Modified), so an
+    unchanged resource is answered by 304 Not Modified without a body and the cached value is
+    used for another time to live. Only the parsed values are kept, not the bodies, e.g. the few
+    fields selected from a large JSON document. Error responses are never parsed, the cached value
+    is used instead while there is one.
+
+    Entries live in RAM and, if requested per entry, also in a directory on flash so they survive
+    reboots. Both tiers have a byte budget and drop their least recently used entries first.
+    """
+    def __init__(self, ram_budget=RAM_BUDGET, flash_budget=FLASH_BUDGET, flash_dir=FLASH_DIR):
+        """
+        Initializes the cache.
+
+        Args:
+            ram_budget (int, optional): Bytes of cached values kept in RAM. Defaults to RAM_BUDGET.
+            flash_budget (int, optional): Bytes of cached values kept on flash. Defaults to FLASH_BUDGET.
+            flash_dir (str, optional): Directory of the flash tier, None disables it. Defaults to FLASH_DIR.
+        """
+        self.ram_budget = ram_budget
+        self.flash_budget = flash_budget
+        self.flash_dir = flash_dir
+        self.entries = {}      # URL -> entry
+        self.order = []        # URLs in RAM, least recently used first
+        self.flash_index = None # File name -> size of the flash tier, read on first use
+        self.flash_order = []  # File names on flash, least recently used first
+        self.hits = 0          # Values used without a request
+        self.revalidated = 0   # Requests answered by 304
+        self.misses = 0        # Requests answered with a body
+        self.errors = 0        # Requests answered with an error status
+
+    def get(self, url, ttl, parse, headers=None, persist=False):
+        """
+        Returns the value of a URL, from the cache while it is fresh.
+
+        Args:
+            url (str): The URL.
+            ttl (int): Seconds the value is used without a request, 0 to revalidate every time.
+            parse (function): Takes the Response and returns the value, e.g. selected JSON values.
+            headers (dict, optional): Additional request headers. Defaults to None.
+            persist (bool, optional): Whether the value is also kept on flash. Defaults to False.
+
+        Returns:
+            The cached or freshly parsed value.
+
+        Raises:
+            OSError: If the server cannot be reached, or answers with an error while nothing is cached.
+        """
+        entry, request_headers = self.__begin(url, ttl, headers)
+        if request_headers is None:
+            return entry[_VALUE]
+        response = http.get(url, request_headers)
+        try:
+            value = parse(response) if self.__parseable(entry, response) else None
+        finally:
+            response.close()
+        return self.__finish(url, entry, response, value, persist)
+
+    async def get_async(self, url, ttl, parse, headers=None, persist=False):
+        """
+        Returns the value of a URL, from the cache while it is fresh, without blocking other tasks.
+
+        Args:
+            url (str): The URL.
+            ttl (int): Seconds the value is used without a request, 0 to revalidate every time.
+            parse (function): Coroutine function that takes the AsyncResponse and returns the value.
+            headers (dict, optional): Additional request headers. Defaults to None.
+            persist (bool, optional): Whether the value is also kept on flash. Defaults to False.
+
+        Returns:
+            The cached or freshly parsed value.
+
+        Raises:
+            OSError: If the server cannot be reached, or answers with an error while nothing is cached.
+        """
+        entry, request_headers = self.__begin(url, ttl, headers)
+        if request_headers is None:
+            return entry[_VALUE]
+        response = await http.get_async(url, request_headers)
+        try:
+            value = await parse(response) if self.__parseable(entry, response) else None
+        finally:
+            response.close()
+        return self.__finish(url, entry, response, value, persist)
+
+    def __begin(self, url, ttl, headers):
+        """
+        Looks up a URL and prepares the request if its value is not fresh.
+
+        Args:
+            url (str): The URL.
+            ttl (int): Seconds the value is used without a request.
+            headers (dict): Additional request headers or None.
+
+        Returns:
+            tuple: The entry (or None) and the request headers, None if the entry is fresh.
+        """
+        entry = self.__lookup(url)
+        if entry is None:
+            return None, headers or {}
+        now = int(time.time())
+        # Before the clock is set, entries from flash seem to be from the future and are revalidated
+        if entry[_STORED] <= now < entry[_STORED] + ttl:
+            self.hits += 1
+            return entry, None
+        request_headers = dict(headers) if headers else {}
+        if entry[_ETAG] is not None:
+            request_headers["If-None-Match"] = entry[_ETAG]
+        if entry[_LAST_MODIFIED] is not None:
+            request_headers["If-Modified-Since"] = entry[_LAST_MODIFIED]
+        return entry, request_headers
+
+    def __not_modified(self, entry, response):
+        """
+        Checks whether the server confirmed the cached value.
+
+        Args:
+            entry (list): The entry or None.
+            response (Response or AsyncResponse): The response.
+
+        Returns:
+            bool: True for 304 Not Modified on a cached entry.
+        """
+        return entry is not None and response.status_code == 304
+
+    def __parseable(self, entry, response):
+        """
+        Checks whether a response carries a new value.
+
+        Args:
+            entry (list): The entry or None.
+            response (Response or AsyncResponse): The response.
+
+        Returns:
+            bool: True for 200 OK, error bodies are never parsed.
+        """
+        return response.status_code == 200 and not self.__not_modified(entry, response)
+
+    def __finish(self, url, entry, response, value, persist):
+        """
+        Updates the cache with the outcome of a request.
+
+        Args:
+            url (str): The URL.
+            entry (list): The entry sent for revalidation or None.
+            response (Response or AsyncResponse): The closed response.
+            value: The parsed value, None if the server answered 304 or with an error.
+            persist (bool): Whether the value is also kept on flash.
+
+        Returns:
+            The value to use.
+
+        Raises:
+            OSError: If the server answered with an error and no value is cached.
+        """
+        now = int(time.time())
+        if self.__not_modified(entry, response):
+            self.revalidated += 1
+            entry[_STORED] = now
+            if persist:
+                self.__write_flash(url, entry)
+            return entry[_VALUE]
+        if response.status_code != 200:
+            self.errors += 1
+            if entry is None:
+                raise OSError(f"HTTP {response.status_code}")
+            # The cached value stays stale, so the next request revalidates it again
+            return entry[_VALUE]
+        self.misses += 1
+        headers = response.headers
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        try:
+            size = len(url) + len(json.dumps(value)) + len(etag or "") + len(last_modified or "")
+        except (TypeError, ValueError):
+            return value # Only JSON values can be cached
+        entry = [now, etag, last_modified, value, size]
+        self.__put(url, entry)
+        if persist:
+            self.__write_flash(url, entry)
+        return value
+
+    def __lookup(self, url):
+        """
+        Finds the entry of a URL in RAM or on flash and marks it as most recently used.
+
+        Args:
+            url (str): The URL.
+
+        Returns:
+            list: The entry or None.
+        """
+        entry = self.entries.get(url)
+        if entry is not None:
+            self.order.remove(url)
+            self.order.append(url)
+            return entry
+        entry = self.__read_flash(url)
+        if entry is not None:
+            self.__put(url, entry)
+        return entry
+
+    def __put(self, url, entry):
+        """
+        Puts an entry into RAM, least recently used entries are dropped to stay within the budget.
+
+        Args:
+            url (str): The URL.
+            entry (list): The entry.
+        """
+        if url in self.entries:
+            del self.entries[url]
+            self.order.remove(url)
+        if entry[_SIZE] > self.ram_budget:
+            return
+        self.entries[url] = entry
+        self.order.append(url)
+        used = sum(e[_SIZE] for e in self.entries.values())
+        while used > self.ram_budget:
+            oldest = self.order.pop(0)
+            used -= self.entries.pop(oldest)[_SIZE]
+
+    def __file_name(self, url):
+        """
+        Returns the name of a URL's file in the flash tier.
+
+        Args:
+            url (str): The URL.
+
+        Returns:
+            str: The file name.
+        """
+        return hexlify(hashlib.sha256(url.encode()).digest()[:8]).decode()
+
+    def __load_flash_index(self):
+        """
+        Reads the files of the flash tier once, creating its directory if needed.
+
+        Returns:
+            dict: File name -> size, None if the flash tier is disabled or not available.
+        """
+        if self.flash_dir is None:
+            return None
+        if self.flash_index is None:
+            index = {}
+            try:
+                for name in os.listdir(self.flash_dir):
+                    index[name] = os.stat(f"{self.flash_dir}/{name}")[6]
+                    self.flash_order.append(name)
+            except OSError:
+                try:
+                    os.mkdir(self.flash_dir)
+                except OSError:
+                    self.flash_dir = None
+                    return None
+            self.flash_index = index
+        return self.flash_index
+
+    def __read_flash(self, url):
+        """
+        Reads the entry of a URL from the flash tier.
+
+        Args:
+            url (str): The URL.
+
+        Returns:
+            list: The entry or None.
+        """
+        index = self.__load_flash_index()
+        name = self.__file_name(url)
+        if index is None or name not in index:
+            return None
+        try:
+            with open(f"{self.flash_dir}/{name}", "r") as f:
+                saved_url, entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if saved_url != url:
+            return None
+        self.flash_order.remove(name)
+        self.flash_order.append(name)
+        return entry
+
+    def __write_flash(self, url, entry):
+        """
+        Writes an entry to the flash tier, least recently used files are deleted to stay within the budget.
+        Failures only cost the flash tier.
+
+        Args:
+            url (str): The URL.
+            entry (list): The entry.
+        """
+        index = self.__load_flash_index()
+        if index is None:
+            return
+        name = self.__file_name(url)
+        path = f"{self.flash_dir}/{name}"
+        if index.pop(name, None) is not None:
+            self.flash_order.remove(name)
+        try:
+            data = json.dumps([url, entry])
+            if len(data) > self.flash_budget:
+                os.remove(path)
+                return
+            with open(path, "w") as f:
+                f.write(data)
+        except (OSError, TypeError, ValueError):
+            return
+        index[name] = len(data)
+        self.flash_order.append(name)
+        used = sum(index.values())
+        while used > self.flash_budget:
+            oldest = self.flash_order.pop(0)
+            used -= index.pop(oldest)
+            try:
+                os.remove(f"{self.flash_dir}/{oldest}")
+            except OSError:
+                pass
+
+_cache = None
+
+def cache():
+    """
+    Returns the cache shared by all managers.
+
+    Returns:
+        ResponseCache: The shared cache.
+    """
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
@@ -0,0 +1,983 @@
+# HTTP/1.1 clients, blocking and asyncio, with a per-host pool of keep-alive connections
+import socket, json
+try:
+    import ssl
+except ImportError:
+    import ussl as ssl
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:
+    from time import monotonic
+    def ticks_ms():
+        return int(monotonic() * 1000)
+    def ticks_diff(end, start):
+        return end - start
+
+TIMEOUT = 10             # Seconds a connect, send or receive may block
+IDLE_TIMEOUT = 15000     # Milliseconds an idle connection is kept, servers close them on their own soon after
+MAX_IDLE_PER_HOST = 2    # Idle connections kept per host
+MAX_REDIRECTS = 5
+BUFFER_SIZE = 1024       # Receive buffer of each connection
+DRAIN_LIMIT = 4096       # Unread body bytes that are still read on close to keep the connection
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def _parse_url(url):
+    """
+    Splits a URL into its parts.
+
+    Args:
+        url (str): An http or https URL.
+
+    Returns:
+        tuple: Scheme, host, port and path (including the query).
+
+    Raises:
+        ValueError: If the scheme is not supported.
+    """
+    scheme, _, rest = url.partition("://")
+    if scheme not in DEFAULT_PORTS:
+        raise ValueError("Unsupported URL scheme: " + scheme)
+    host, slash, path = rest.partition("/")
+    port = DEFAULT_PORTS[scheme]
+    if ":" in host:
+        host, port = host.split(":", 1)
+        port = int(port)
+    return scheme, host, port, slash + path if slash else "/"
+
+def _request_head(method, key, path, headers, data):
+    """
+    Builds the request line and headers.
+
+    Args:
+        method (str): The request method.
+        key (tuple): Scheme, host and port.
+        path (str): Path and query.
+        headers (dict): Additional request headers or None.
+        data (bytes): The request body or None.
+
+    Returns:
+        bytes: The request head including the empty line.
+    """
+    scheme, host, port = key
+    lines = [f"{method} {path} HTTP/1.1",
+             f"Host: {host}" if port == DEFAULT_PORTS[scheme] else f"Host: {host}:{port}",
+             "Connection: keep-alive"]
+    if headers:
+        for name, value in headers.items():
+            lines.append(f"{name}: {value}")
+    if data:
+        lines.append(f"Content-Length: {len(data)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+def _parse_status_line(line):
+    """
+    Parses the status line of a response.
+
+    Args:
+        line (bytes): The status line.
+
+    Returns:
+        tuple: The status code and the reason phrase.
+
+    Raises:
+        OSError: If the connection was closed instead.
+    """
+    if not line:
+        raise OSError("Connection closed by the server")
+    parts = line.split(None, 2)
+    return int(parts[1]), parts[2].strip().decode() if len(parts) > 2 else ""
+
+def _parse_header_line(line, headers):
+    """
+    Parses a header line into the headers of a response.
+
+    Args:
+        line (bytes): The header line.
+        headers (dict): Response headers with lowercase names.
+
+    Returns:
+        bool: False at the empty line that ends the header.
+    """
+    if line in (b"\r\n", b"\n", b""):
+        return False
+    name, _, value = line.decode().partition(":")
+    headers[name.strip().lower()] = value.strip()
+    return True
+
+def _chunk_size(line):
+    """
+    Parses the size line of a chunk.
+
+    Args:
+        line (bytes): The size line.
+
+    Returns:
+        int: The chunk size, 0 for the last chunk.
+
+    Raises:
+        OSError: If the connection was closed instead.
+    """
+    if not line:
+        raise OSError("Connection closed before the end of the body")
+    return int(line.split(b";")[0].strip().decode(), 16)
+
+class Connection:
+    """A TCP connection, optionally TLS wrapped, with a small receive buffer."""
+    def __init__(self, key, sock, stream):
+        """
+        Initializes the connection.
+
+        Args:
+            key (tuple): Scheme, host and port the connection belongs to.
+            sock (socket.socket): The TCP socket.
+            stream: The socket itself or its TLS wrapper.
+        """
+        self.key = key
+        self.sock = sock
+        self.stream = stream
+        # Plain and TLS sockets differ between ports, MicroPython streams only provide readinto/write
+        self._recv = getattr(stream, "recv_into", None) or stream.readinto
+        self._send = getattr(stream, "sendall", None) or stream.write
+        self.buffer = bytearray(BUFFER_SIZE)
+        self.start = 0
+        self.end = 0
+        self.last_used = ticks_ms()
+        self.requests = 0
+
+    def send(self, data):
+        """
+        Sends bytes.
+
+        Args:
+            data (bytes): The bytes to send.
+        """
+        self._send(data)
+
+    def __fill(self):
+        """
+        Refills the receive buffer.
+
+        Returns:
+            int: Number of bytes received, 0 if the peer closed the connection.
+        """
+        self.start = 0
+        self.end = self._recv(self.buffer) or 0
+        return self.end
+
+    def readline(self):
+        """
+        Reads a line including its line ending.
+
+        Returns:
+            bytes: The line, b"" if the connection was closed before a line started.
+
+        Raises:
+            ValueError: If the line is longer than the receive buffer allows for headers.
+        """
+        line = b""
+        while True:
+            if self.start == self.end and not self.__fill():
+                return line
+            chunk = bytes(memoryview(self.buffer)[self.start:self.end])
+            i = chunk.find(b"\n")
+            if i >= 0:
+                self.start += i + 1
+                return line + chunk[:i + 1]
+            line += chunk
+            self.start = self.end
+            if len(line) > 4 * BUFFER_SIZE:
+                raise ValueError("Header line too long")
+
+    def readinto(self, dest):
+        """
+        Reads bytes, buffered ones first. Large reads bypass the buffer.
+
+        Args:
+            dest (memoryview): Where to put the bytes.
+
+        Returns:
+            int: Number of bytes read, 0 if the peer closed the connection.
+        """
+        if self.start == self.end:
+            if len(dest) >= len(self.buffer):
+                return self._recv(dest) or 0
+            if not self.__fill():
+                return 0
+        count = min(len(dest), self.end - self.start)
+        dest[:count] = memoryview(self.buffer)[self.start:self.start + count]
+        self.start += count
+        return count
+
+    def close(self):
+        """Closes the connection."""
+        try:
+            self.stream.close()
+            if self.stream is not self.sock:
+                self.sock.close()
+        except OSError:
+            pass
+
+class AsyncConnection:
+    """A TCP connection, optionally TLS wrapped, read and written through asyncio streams."""
+    def __init__(self, key, reader, writer):
+        """
+        Initializes the connection.
+
+        Args:
+            key (tuple): Scheme, host and port the connection belongs to.
+            reader (asyncio.StreamReader): The stream to read from.
+            writer (asyncio.StreamWriter): The stream to write to, the same object on MicroPython.
+        """
+        self.key = key
+        self.reader = reader
+        self.writer = writer
+        self.last_used = ticks_ms()
+        self.requests = 0
+
+    async def send(self, data):
+        """
+        Sends bytes.
+
+        Args:
+            data (bytes): The bytes to send.
+        """
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def readline(self):
+        """
+        Reads a line including its line ending.
+
+        Returns:
+            bytes: The line, b"" if the connection was closed before a line started.
+
+        Raises:
+            ValueError: If the line is longer than the receive buffer allows for headers.
+        """
+        line = await self.reader.readline()
+        if len(line) > 4 * BUFFER_SIZE:
+            raise ValueError("Header line too long")
+        return line
+
+    async def readinto(self, dest):
+        """
+        Reads bytes.
+
+        Args:
+            dest (memoryview): Where to put the bytes.
+
+        Returns:
+            int: Number of bytes read, 0 if the peer closed the connection.
+        """
+        data = await self.reader.read(len(dest))
+        count = len(data)
+        dest[:count] = data
+        return count
+
+    def close(self):
+        """Closes the connection, also after the event loop it was opened in has been closed."""
+        try:
+            self.writer.close()
+        except OSError:
+            pass
+        except RuntimeError:
+            # CPython cannot close the streams of a closed event loop, close their socket instead
+            sock = self.writer.get_extra_info("socket")
+            getattr(sock, "_sock", sock).close()
+
+class _Body:
+    """Status, headers and body framing of a response, shared by Response and AsyncResponse."""
+    def __init__(self, client, connection, method, status_code, reason, headers):
+        """
+        Initializes the response after its header was read.
+
+        Args:
+            client (HttpClient or AsyncHttpClient): The client owning the connection.
+            connection (Connection or AsyncConnection): The connection the body is read from.
+            method (str): The request method.
+            status_code (int): The HTTP status code.
+            reason (str): The reason phrase.
+            headers (dict): Response headers with lowercase names.
+        """
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self._client = client
+        self._connection = connection
+        self._content = None
+        self._chunked = "chunked" in headers.get("transfer-encoding", "").lower()
+        self._chunk_left = 0
+        length = headers.get("content-length")
+        self._remaining = int(length) if length is not None and not self._chunked else None # None reads until close
+        if method == "HEAD" or status_code in (204, 304) or status_code < 200:
+            self._chunked = False
+            self._remaining = 0
+        self._done = self._remaining == 0
+        self._reusable = (headers.get("connection", "").lower() != "close"
+                          and (self._chunked or self._remaining is not None))
+
+class Response(_Body):
+    """The response to a request, the body is read from the connection on demand.
+
+    Closing the response (also done once content has read the whole body) hands the
+    connection back to the pool if the body was read completely and the server keeps it open.
+    """
+    def __init__(self, client, connection, method, status_code, reason, headers):
+        """
+        Initializes the response after its header was read, a response without body is closed right away.
+
+        Args:
+            client (HttpClient): The client owning the connection.
+            connection (Connection): The connection the body is read from.
+            method (str): The request method.
+            status_code (int): The HTTP status code.
+            reason (str): The reason phrase.
+            headers (dict): Response headers with lowercase names.
+        """
+        super().__init__(client, connection, method, status_code, reason, headers)
+        if self._done:
+            self.close()
+
+    def readinto(self, buffer):
+        """
+        Reads the next part of the body.
+
+        Args:
+            buffer (bytearray): Where to put the bytes.
+
+        Returns:
+            int: Number of bytes read, 0 at the end of the body.
+
+        Raises:
+            OSError: If the connection was closed before the body was complete.
+        """
+        if self._done:
+            return 0
+        connection = self._connection
+        dest = memoryview(buffer)
+        if self._chunked:
+            if not self._chunk_left:
+                size = _chunk_size(connection.readline())
+                if not size:
+                    # Skip the trailer up to the empty line
+                    while connection.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    self._done = True
+                    return 0
+                self._chunk_left = size
+            count = connection.readinto(dest[:min(len(dest), self._chunk_left)])
+            if not count:
+                raise OSError("Connection closed within a chunk")
+            self._chunk_left -= count
+            if not self._chunk_left:
+                connection.readline() # Line ending after the chunk data
+            return count
+
+        if self._remaining is None:
+            count = connection.readinto(dest)
+            self._done = not count
+            return count
+        count = connection.readinto(dest[:min(len(dest), self._remaining)])
+        if not count:
+            raise OSError("Connection closed before the end of the body")
+        self._remaining -= count
+        self._done = not self._remaining
+        return count
+
+    @property
+    def content(self):
+        """The whole body as bytes, the response is closed afterwards."""
+        if self._content is None:
+            chunks = []
+            buffer = bytearray(BUFFER_SIZE)
+            while True:
+                count = self.readinto(buffer)
+                if not count:
+                    break
+                chunks.append(bytes(buffer[:count]))
+            self._content = b"".join(chunks)
+            self.close()
+        return self._content
+
+    @property
+    def text(self):
+        """The whole body decoded as UTF-8."""
+        return self.content.decode()
+
+    def json(self):
+        """
+        Parses the body as JSON.
+
+        Returns:
+            The decoded JSON value.
+        """
+        return json.loads(self.content)
+
+    def close(self):
+        """Hands the connection back to the pool or closes it, a small unread body is read first."""
+        connection = self._connection
+        if connection is None:
+            return
+        reusable = self._reusable
+        if not self._done and reusable:
+            try:
+                buffer = bytearray(256)
+                drained = 0
+                while not self._done and drained < DRAIN_LIMIT:
+                    drained += self.readinto(buffer)
+            except OSError:
+                reusable = False
+            reusable = reusable and self._done
+        self._connection = None
+        self._client._release(connection, reusable)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+class AsyncResponse(_Body):
+    """The response to a request sent by AsyncHttpClient, the body is read from the connection on demand.
+
+    Unlike Response, closing does not read the rest of the body, so the connection is only handed
+    back to the pool if the body was read completely (e.g. by read() or json()).
+    """
+    def __init__(self, client, connection, method, status_code, reason, headers):
+        """
+        Initializes the response after its header was read, a response without body is closed right away.
+
+        Args:
+            client (AsyncHttpClient): The client owning the connection.
+            connection (AsyncConnection): The connection the body is read from.
+            method (str): The request method.
+            status_code (int): The HTTP status code.
+            reason (str): The reason phrase.
+            headers (dict): Response headers with lowercase names.
+        """
+        super().__init__(client, connection, method, status_code, reason, headers)
+        if self._done:
+            self.close()
+
+    async def readinto(self, buffer):
+        """
+        Reads the next part of the body.
+
+        Args:
+            buffer (bytearray): Where to put the bytes.
+
+        Returns:
+            int: Number of bytes read, 0 at the end of the body.
+
+        Raises:
+            OSError: If the connection was closed before the body was complete.
+        """
+        if self._done:
+            return 0
+        connection = self._connection
+        dest = memoryview(buffer)
+        if self._chunked:
+            if not self._chunk_left:
+                size = _chunk_size(await connection.readline())
+                if not size:
+                    # Skip the trailer up to the empty line
+                    while await connection.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    self._done = True
+                    return 0
+                self._chunk_left = size
+            count = await connection.readinto(dest[:min(len(dest), self._chunk_left)])
+            if not count:
+                raise OSError("Connection closed within a chunk")
+            self._chunk_left -= count
+            if not self._chunk_left:
+                await connection.readline() # Line ending after the chunk data
+            return count
+
+        if self._remaining is None:
+            count = await connection.readinto(dest)
+            self._done = not count
+            return count
+        count = await connection.readinto(dest[:min(len(dest), self._remaining)])
+        if not count:
+            raise OSError("Connection closed before the end of the body")
+        self._remaining -= count
+        self._done = not self._remaining
+        return count
+
+    async def read(self):
+        """
+        Reads the whole body, the response is closed afterwards.
+
+        Returns:
+            bytes: The body.
+        """
+        if self._content is None:
+            chunks = []
+            buffer = bytearray(BUFFER_SIZE)
+            try:
+                while True:
+                    count = await self.readinto(buffer)
+                    if not count:
+                        break
+                    chunks.append(bytes(buffer[:count]))
+            finally:
+                self.close()
+            self._content = b"".join(chunks)
+        return self._content
+
+    async def json(self):
+        """
+        Reads the body and parses it as JSON.
+
+        Returns:
+            The decoded JSON value.
+        """
+        return json.loads(await self.read())
+
+    def close(self):
+        """Hands the connection back to the pool if the body was read completely, otherwise closes it."""
+        connection = self._connection
+        if connection is None:
+            return
+        self._connection = None
+        self._client._release(connection, self._reusable and self._done)
+
+class _Pool:
+    """Idle keep-alive connections per scheme, host and port, shared by HttpClient and AsyncHttpClient."""
+    def __init__(self, idle_timeout, max_idle):
+        """
+        Initializes the pool.
+
+        Args:
+            idle_timeout (int): Milliseconds an idle connection is kept.
+            max_idle (int): Idle connections kept per host.
+        """
+        self.idle_timeout = idle_timeout
+        self.max_idle = max_idle
+        self.pool = {} # (scheme, host, port) -> idle connections, most recently used last
+        self.connections_opened = 0
+
+    def close(self):
+        """Closes all idle connections."""
+        for idle in self.pool.values():
+            for connection in idle:
+                connection.close()
+        self.pool = {}
+
+    def __expire(self, now):
+        """
+        Closes the idle connections of all hosts that have timed out, so they do not hold their
+        sockets and TLS buffers until the next request to the same host.
+
+        Args:
+            now (int): The current ticks in milliseconds.
+        """
+        for key in list(self.pool):
+            idle = self.pool[key]
+            # Most recently used last, so the timed out ones are at the front
+            while idle and ticks_diff(now, idle[0].last_used) >= self.idle_timeout:
+                idle.pop(0).close()
+            if not idle:
+                del self.pool[key]
+
+    def _acquire(self, key):
+        """
+        Takes the most recently used idle connection of a host that has not timed out.
+
+        Args:
+            key (tuple): Scheme, host and port.
+
+        Returns:
+            Connection or AsyncConnection: The connection or None.
+        """
+        self.__expire(ticks_ms())
+        idle = self.pool.get(key)
+        return idle.pop() if idle else None
+
+    def _release(self, connection, reusable):
+        """
+        Puts a connection back into the pool or closes it, called when a response is closed.
+
+        Args:
+            connection (Connection or AsyncConnection): The connection.
+            reusable (bool): Whether the connection can take another request.
+        """
+        if not reusable:
+            connection.close()
+            return
+        connection.last_used = ticks_ms()
+        self.__expire(connection.last_used)
+        idle = self.pool.setdefault(connection.key, [])
+        idle.append(connection)
+        while len(idle) > self.max_idle:
+            idle.pop(0).close()
+
+class HttpClient(_Pool):
+    """HTTP/1.1 client that keeps connections open between requests.
+
+    Idle connections are pooled per scheme, host and port and reused until they have been idle
+    for longer than the idle timeout. A request on a reused connection that the server closed in
+    the meantime is repeated once on a new connection. If the TLS module exposes sessions
+    (e.g. CPython), the last session per host is resumed on new connections, which skips most of
+    the handshake.
+    """
+    def __init__(self, timeout=TIMEOUT, idle_timeout=IDLE_TIMEOUT, max_idle=MAX_IDLE_PER_HOST, ssl_context=None):
+        """
+        Initializes the client.
+
+        Args:
+            timeout (float, optional): Seconds a connect, send or receive may block. Defaults to TIMEOUT.
+            idle_timeout (int, optional): Milliseconds an idle connection is kept. Defaults to IDLE_TIMEOUT.
+            max_idle (int, optional): Idle connections kept per host. Defaults to MAX_IDLE_PER_HOST.
+            ssl_context (ssl.SSLContext, optional): Context for TLS connections, e.g. one trusting a local
+                test server. Defaults to None (the port's default TLS settings).
+        """
+        super().__init__(idle_timeout, max_idle)
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.sessions = {} # (scheme, host, port) -> TLS session to resume
+
+    def get(self, url, headers=None):
+        """
+        Sends a GET request.
+
+        Args:
+            url (str): The URL.
+            headers (dict, optional): Additional request headers. Defaults to None.
+
+        Returns:
+            Response: The response, close it (or read its content) to give the connection back.
+        """
+        return self.request("GET", url, headers)
+
+    def request(self, method, url, headers=None, data=None):
+        """
+        Sends a request and follows redirects.
+
+        Args:
+            method (str): The request method.
+            url (str): The URL.
+            headers (dict, optional): Additional request headers. Defaults to None.
+            data (bytes or str, optional): The request body. Defaults to None.
+
+        Returns:
+            Response: The response, close it (or read its content) to give the connection back.
+
+        Raises:
+            OSError: If the server cannot be reached or redirects too often.
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        for _ in range(MAX_REDIRECTS + 1):
+            scheme, host, port, path = _parse_url(url)
+            response = self.__send(method, (scheme, host, port), path, headers, data)
+            location = response.headers.get("location")
+            if response.status_code not in REDIRECT_STATUSES or location is None:
+                return response
+            response.close()
+            if location.startswith("/"):
+                location = f"{scheme}://{host}:{port}{location}"
+            url = location
+            if response.status_code == 303:
+                method, data = "GET", None
+        raise OSError("Too many redirects")
+
+    def __send(self, method, key, path, headers, data):
+        """
+        Sends a request on a pooled or new connection and reads the response header.
+
+        Args:
+            method (str): The request method.
+            key (tuple): Scheme, host and port.
+            path (str): Path and query.
+            headers (dict): Additional request headers or None.
+            data (bytes): The request body or None.
+
+        Returns:
+            Response: The response.
+        """
+        head = _request_head(method, key, path, headers, data)
+        connection = self._acquire(key)
+        while True:
+            reused = connection is not None
+            if not reused:
+                connection = self.__connect(key)
+            try:
+                connection.send(head)
+                if data:
+                    connection.send(data)
+                connection.requests += 1
+                status_code, reason = _parse_status_line(connection.readline())
+                response_headers = {}
+                while _parse_header_line(connection.readline(), response_headers):
+                    pass
+            except Exception as e:
+                connection.close()
+                if not reused or not isinstance(e, OSError):
+                    raise
+                # The server closed the idle connection in the meantime, try once more on a new one
+                connection = None
+                continue
+            return Response(self, connection, method, status_code, reason, response_headers)
+
+    def __connect(self, key):
+        """
+        Opens a new connection, resuming the host's TLS session if possible.
+
+        Args:
+            key (tuple): Scheme, host and port.
+
+        Returns:
+            Connection: The new connection.
+        """
+        scheme, host, port = key
+        family, kind, proto, _, address = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)[0]
+        sock = socket.socket(family, kind, proto)
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(address)
+            stream = sock
+            if scheme == "https":
+                context = self.ssl_context
+                session = self.sessions.get(key)
+                if context is None:
+                    stream = ssl.wrap_socket(sock, server_hostname=host)
+                elif session is not None:
+                    stream = context.wrap_socket(sock, server_hostname=host, session=session)
+                else:
+                    stream = context.wrap_socket(sock, server_hostname=host)
+        except Exception:
+            sock.close()
+            raise
+        self.connections_opened += 1
+        return Connection(key, sock, stream)
+
+    def _release(self, connection, reusable):
+        """
+        Puts a connection back into the pool or closes it, called by Response.close().
+
+        Args:
+            connection (Connection): The connection.
+            reusable (bool): Whether the connection can take another request.
+        """
+        # With TLS 1.3 the session ticket only arrives after the handshake, so it is taken here
+        session = getattr(connection.stream, "session", None)
+        if session is not None:
+            self.sessions[connection.key] = session
+        super()._release(connection, reusable)
+
+class AsyncHttpClient(_Pool):
+    """HTTP/1.1 client for asyncio tasks, so several requests can wait for their servers at the same time.
+
+    Connections are pooled like in HttpClient, concurrent requests to the same host each use their
+    own connection. Opening a connection and reading the response header are limited by the timeout,
+    callers bound the whole request including the body with asyncio.wait_for(). TLS sessions are
+    not resumed, asyncio does not expose them.
+    """
+    def __init__(self, timeout=TIMEOUT, idle_timeout=IDLE_TIMEOUT, max_idle=MAX_IDLE_PER_HOST, ssl_context=None):
+        """
+        Initializes the client.
+
+        Args:
+            timeout (float, optional): Seconds opening a connection and reading a response header may take.
+                Defaults to TIMEOUT.
+            idle_timeout (int, optional): Milliseconds an idle connection is kept. Defaults to IDLE_TIMEOUT.
+            max_idle (int, optional): Idle connections kept per host. Defaults to MAX_IDLE_PER_HOST.
+            ssl_context (ssl.SSLContext, optional): Context for TLS connections, e.g. one trusting a local
+                test server. Defaults to None (certificates are not verified, like by ssl.wrap_socket()).
+        """
+        super().__init__(idle_timeout, max_idle)
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.loop = None # Event loop the pooled connections belong to
+
+    async def get(self, url, headers=None):
+        """
+        Sends a GET request.
+
+        Args:
+            url (str): The URL.
+            headers (dict, optional): Additional request headers. Defaults to None.
+
+        Returns:
+            AsyncResponse: The response, read its body (or close it) to give the connection back.
+        """
+        return await self.request("GET", url, headers)
+
+    async def request(self, method, url, headers=None, data=None):
+        """
+        Sends a request and follows redirects.
+
+        Args:
+            method (str): The request method.
+            url (str): The URL.
+            headers (dict, optional): Additional request headers. Defaults to None.
+            data (bytes or str, optional): The request body. Defaults to None.
+
+        Returns:
+            AsyncResponse: The response, read its body (or close it) to give the connection back.
+
+        Raises:
+            OSError: If the server cannot be reached or redirects too often.
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        for _ in range(MAX_REDIRECTS + 1):
+            scheme, host, port, path = _parse_url(url)
+            response = await self.__send(method, (scheme, host, port), path, headers, data)
+            location = response.headers.get("location")
+            if response.status_code not in REDIRECT_STATUSES or location is None:
+                return response
+            response.close()
+            if location.startswith("/"):
+                location = f"{scheme}://{host}:{port}{location}"
+            url = location
+            if response.status_code == 303:
+                method, data = "GET", None
+        raise OSError("Too many redirects")
+
+    async def __send(self, method, key, path, headers, data):
+        """
+        Sends a request on a pooled or new connection and reads the response header.
+
+        Args:
+            method (str): The request method.
+            key (tuple): Scheme, host and port.
+            path (str): Path and query.
+            headers (dict): Additional request headers or None.
+            data (bytes): The request body or None.
+
+        Returns:
+            AsyncResponse: The response.
+        """
+        # Streams only work in the event loop they were opened in, each asyncio.run() of CPython has its own
+        loop = asyncio.get_event_loop()
+        if loop is not self.loop:
+            self.close()
+            self.loop = loop
+        head = _request_head(method, key, path, headers, data)
+        connection = self._acquire(key)
+        while True:
+            reused = connection is not None
+            if not reused:
+                connection = await asyncio.wait_for(self.__connect(key), self.timeout)
+            try:
+                status_code, reason, response_headers = await asyncio.wait_for(
+                    self.__exchange(connection, head, data), self.timeout)
+            except Exception as e:
+                connection.close()
+                if not reused or not isinstance(e, OSError):
+                    raise
+                # The server closed the idle connection in the meantime, try once more on a new one
+                connection = None
+                continue
+            except BaseException:
+                # Cancelled, e.g. by the deadline of the caller
+                connection.close()
+                raise
+            return AsyncResponse(self, connection, method, status_code, reason, response_headers)
+
+    async def __exchange(self, connection, head, data):
+        """
+        Sends the request and reads the response header.
+
+        Args:
+            connection (AsyncConnection): The connection.
+            head (bytes): The request head.
+            data (bytes): The request body or None.
+
+        Returns:
+            tuple: The status code, the reason phrase and the response headers.
+        """
+        await connection.send(head + data if data else head)
+        connection.requests += 1
+        status_code, reason = _parse_status_line(await connection.readline())
+        response_headers = {}
+        while _parse_header_line(await connection.readline(), response_headers):
+            pass
+        return status_code, reason, response_headers
+
+    async def __connect(self, key):
+        """
+        Opens a new connection.
+
+        Args:
+            key (tuple): Scheme, host and port.
+
+        Returns:
+            AsyncConnection: The new connection.
+        """
+        scheme, host, port = key
+        if scheme == "https":
+            if self.ssl_context is None:
+                context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+                if hasattr(context, "check_hostname"):
+                    context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+                self.ssl_context = context
+            reader, writer = await asyncio.open_connection(host, port, ssl=self.ssl_context)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        self.connections_opened += 1
+        return AsyncConnection(key, reader, writer)
+
+_client = None
+
+def client():
+    """
+    Returns the client shared by all managers, so they share its connection pool.
+
+    Returns:
+        HttpClient: The shared client.
+    """
+    global _client
+    if _client is None:
+        _client = HttpClient()
+    return _client
+
+def get(url, headers=None):
+    """
+    Sends a GET request through the shared client.
+
+    Args:
+        url (str): The URL.
+        headers (dict, optional): Additional request headers. Defaults to None.
+
+    Returns:
+        Response: The response, close it (or read its content) to give the connection back.
+    """
+    return client().get(url, headers)
+
+_async_client = None
+
+def async_client():
+    """
+    Returns the asyncio client shared by all managers, so they share its connection pool.
+
+    Returns:
+        AsyncHttpClient: The shared client.
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncHttpClient()
+    return _async_client
+
+async def get_async(url, headers=None):
+    """
+    Sends a GET request through the shared asyncio client.
+
+    Args:
+        url (str): The URL.
+        headers (dict, optional): Additional request headers. Defaults to None.
+
+    Returns:
+        AsyncResponse: The response, read its body (or close it) to give the connection back.
+    """
+    return await async_client().get(url, headers)
@@ -0,0 +1,375 @@
+# Streaming JSON parser that keeps only selected values
+import json
+
+ANY = "*" # Path component matching every array index
+
+# Parser states
+_VALUE = 0   # A value is expected
+_KEY = 1     # An object key is expected
+_COLON = 2   # The colon after a key is expected
+_AFTER = 3   # A comma or the end of the container is expected
+_DONE = 4    # The top-level value is complete
+
+_WHITESPACE = b" \t\r\n"
+_DELIMITERS = b" \t\r\n,]}"
+
+def _decode_string(raw):
+    """
+    Decodes the raw bytes between the quotes of a JSON string.
+
+    Args:
+        raw (bytearray): The raw bytes, escape sequences included.
+
+    Returns:
+        str: The decoded string.
+    """
+    text = bytes(raw).decode()
+    return json.loads('"' + text + '"') if "\\" in text else text
+
+class JsonSelector:
+    """Push parser that picks selected values out of a JSON document without building it.
+
+    The document is fed in chunks of any size. The parser only keeps the stack of open
+    containers and the value currently being read, values are decoded only if their path
+    is selected, so memory use depends on the selected values and not on the document size.
+
+    Paths are tuples of object keys and ANY for array elements, e.g.
+    ("weather", ANY, "temperature"). A path with ANY collects a list aligned with the array
+    indices (None where an element has no such value), a path without it collects one value.
+    Selected paths have to lead to strings, numbers, booleans or null.
+    """
+    def __init__(self, paths):
+        """
+        Initializes the parser.
+
+        Args:
+            paths (dict): Maps result names to the paths to select.
+
+        Raises:
+            ValueError: If a path contains ANY more than once.
+        """
+        self.paths = []
+        self.wildcards = {} # Result name -> depth of the array wildcard, None without one
+        self.values = {}
+        for name, path in paths.items():
+            if path.count(ANY) > 1:
+                raise ValueError("Only one array wildcard per path is supported")
+            wildcard = path.index(ANY) if ANY in path else None
+            self.paths.append((name, path, wildcard))
+            self.wildcards[name] = wildcard
+            self.values[name] = [] if wildcard is not None else None
+        self.state = _VALUE
+        self.allow_close = False # The value expected may instead close an empty array
+        self.stack = []          # Open containers as [is_object, current key or index]
+        self.token = None        # Raw bytes of the string or literal being read
+        self.token_kind = None   # "key", "string" or "literal"
+        self.keep = None         # Result name of the value being read, None to skip it
+        self.escape = False      # The previous chunk ended in a backslash within a string
+
+    def feed(self, data):
+        """
+        Parses the next chunk of the document.
+
+        Args:
+            data (bytes): The chunk.
+
+        Raises:
+            ValueError: If the document is not valid JSON.
+        """
+        data = bytes(data)
+        length = len(data)
+        i = 0
+        while i < length:
+            kind = self.token_kind
+            if kind == "key" or kind == "string":
+                i = self.__read_string(data, i)
+                continue
+            if kind == "literal":
+                i = self.__read_literal(data, i)
+                continue
+
+            c = data[i]
+            i += 1
+            if c in _WHITESPACE:
+                continue
+            state = self.state
+            if state == _VALUE:
+                self.__start_value(c)
+            elif state == _KEY:
+                if c == 0x22: # "
+                    self.__start_token("key", None)
+                elif c == 0x7D and self.allow_close: # }
+                    self.__close(True)
+                else:
+                    raise ValueError("Object key expected")
+                self.allow_close = False
+            elif state == _COLON:
+                if c != 0x3A: # :
+                    raise ValueError("Colon expected")
+                self.state = _VALUE
+            elif state == _AFTER:
+                top = self.stack[-1]
+                if c == 0x2C: # ,
+                    if top[0]:
+                        self.state = _KEY
+                    else:
+                        top[1] += 1
+                        self.state = _VALUE
+                elif c == 0x7D or c == 0x5D: # } or ]
+                    self.__close(c == 0x7D)
+                else:
+                    raise ValueError("Comma or end of container expected")
+            else:
+                raise ValueError("Data after the end of the document")
+
+    def close(self):
+        """
+        Checks that the document was complete.
+
+        Returns:
+            dict: The selected values by result name.
+
+        Raises:
+            ValueError: If the document ended early.
+        """
+        if self.token_kind == "literal" and not self.stack:
+            self.__finish_literal()
+        if self.state != _DONE:
+            raise ValueError("Incomplete JSON document")
+        return self.values
+
+    def __start_value(self, c):
+        """
+        Starts reading a value.
+
+        Args:
+            c (int): Its first byte.
+        """
+        if c == 0x5D and self.allow_close: # ] of an empty array
+            self.allow_close = False
+            self.__close(False)
+            return
+        self.allow_close = False
+        if c == 0x7B: # {
+            self.stack.append([True, None])
+            self.state = _KEY
+            self.allow_close = True
+        elif c == 0x5B: # [
+            self.stack.append([False, 0])
+            self.state = _VALUE
+            self.allow_close = True
+        elif c == 0x22: # "
+            self.__start_token("string", self.__selected())
+        elif c in b"-0123456789tfn":
+            self.__start_token("literal", self.__selected())
+            self.token.append(c)
+        else:
+            raise ValueError("Value expected")
+
+    def __start_token(self, kind, keep):
+        """
+        Starts reading a key, string or literal.
+
+        Args:
+            kind (str): "key", "string" or "literal".
+            keep (str): Result name of a selected value, None otherwise.
+        """
+        self.token_kind = kind
+        self.keep = keep
+        # Keys are always needed for the path, literals are checked once complete
+        self.token = bytearray() if kind != "string" or keep is not None else None
+
+    def __read_string(self, data, i):
+        """
+        Reads string bytes up to the closing quote.
+
+        Args:
+            data (bytes): The chunk.
+            i (int): Position in the chunk.
+
+        Returns:
+            int: Position after the consumed bytes.
+        """
+        token = self.token
+        if self.escape:
+            # The escaped character was split from its backslash
+            if token is not None:
+                token.append(data[i])
+            self.escape = False
+            return i + 1
+        quote = data.find(b'"', i)
+        backslash = data.find(b"\\", i)
+        if backslash != -1 and (quote == -1 or backslash < quote):
+            end = backslash + 2
+            if end > len(data):
+                self.escape = True
+                end = len(data)
+            if token is not None:
+                token.extend(data[i:end])
+            return end
+        if quote == -1:
+            if token is not None:
+                token.extend(data[i:])
+            return len(data)
+        if token is not None:
+            token.extend(data[i:quote])
+        self.__finish_string()
+        return quote + 1
+
+    def __finish_string(self):
+        """Stores a complete key or emits a complete string value."""
+        kind = self.token_kind
+        token = self.token
+        self.token_kind = None
+        self.token = None
+        if kind == "key":
+            self.stack[-1][1] = _decode_string(token)
+            self.state = _COLON
+            return
+        if self.keep is not None:
+            self.__emit(self.keep, _decode_string(token))
+        self.__value_done()
+
+    def __read_literal(self, data, i):
+        """
+        Reads a number, true, false or null up to the next delimiter.
+
+        Args:
+            data (bytes): The chunk.
+            i (int): Position in the chunk.
+
+        Returns:
+            int: Position of the delimiter or the end of the chunk.
+        """
+        start = i
+        length = len(data)
+        while i < length and data[i] not in _DELIMITERS:
+            i += 1
+        self.token.extend(data[start:i])
+        if i < length:
+            self.__finish_literal()
+        return i
+
+    def __finish_literal(self):
+        """Emits a complete literal if it is selected."""
+        token = self.token
+        self.token_kind = None
+        self.token = None
+        try:
+            value = json.loads(bytes(token).decode())
+        except ValueError:
+            raise ValueError("Invalid literal")
+        if self.keep is not None:
+            self.__emit(self.keep, value)
+        self.__value_done()
+
+    def __close(self, is_object):
+        """
+        Closes the innermost container.
+
+        Args:
+            is_object (bool): True for }, False for ].
+
+        Raises:
+            ValueError: If it does not match the open container.
+        """
+        if not self.stack or self.stack[-1][0] != is_object:
+            raise ValueError("Mismatched end of container")
+        self.stack.pop()
+        self.__value_done()
+
+    def __value_done(self):
+        """Moves on after a complete value."""
+        self.keep = None
+        self.state = _AFTER if self.stack else _DONE
+
+    def __selected(self):
+        """
+        Finds the selected path of the value about to be read.
+
+        Returns:
+            str: The result name, None if the value is not selected.
+        """
+        stack = self.stack
+        depth = len(stack)
+        for name, path, wildcard in self.paths:
+            if len(path) != depth:
+                continue
+            for i in range(depth):
+                if i == wildcard:
+                    if stack[i][0]:
+                        break
+                elif path[i] != stack[i][1]:
+                    break
+            else:
+                return name
+        return None
+
+    def __emit(self, name, value):
+        """
+        Stores a selected value.
+
+        Args:
+            name (str): The result name.
+            value: The decoded value.
+        """
+        wildcard = self.wildcards[name]
+        if wildcard is None:
+            self.values[name] = value
+            return
+        values = self.values[name]
+        index = self.stack[wildcard][1]
+        while len(values) < index:
+            values.append(None)
+        if len(values) == index:
+            values.append(value)
+        else:
+            values[index] = value
+
+def select(stream, paths, chunk_size=512):
+    """
+    Reads a JSON document from a stream and returns the selected values.
+
+    Args:
+        stream: Object providing readinto(), e.g. an HTTP response.
+        paths (dict): Maps result names to the paths to select, see JsonSelector.
+        chunk_size (int, optional): Bytes read at once. Defaults to 512.
+
+    Returns:
+        dict: The selected values by result name.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    selector = JsonSelector(paths)
+    buffer = bytearray(chunk_size)
+    while True:
+        count = stream.readinto(buffer)
+        if not count:
+            break
+        selector.feed(memoryview(buffer)[:count])
+    return selector.close()
+
+async def select_async(stream, paths, chunk_size=512):
+    """
+    Reads a JSON document from an asyncio stream and returns the selected values.
+
+    Args:
+        stream: Object providing an awaitable readinto(), e.g. an asynchronous HTTP response.
+        paths (dict): Maps result names to the paths to select, see JsonSelector.
+        chunk_size (int, optional): Bytes read at once. Defaults to 512.
+
+    Returns:
+        dict: The selected values by result name.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    selector = JsonSelector(paths)
+    buffer = bytearray(chunk_size)
+    while True:
+        count = await stream.readinto(buffer)
+        if not count:
+            break
+        selector.feed(memoryview(buffer)[:count])
+    return selector.close()
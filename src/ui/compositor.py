@@ -0,0 +1,234 @@
+# Retained off-screen regions with dirty rectangle tracking
+MERGE_SLACK = 64 # Extra pixels two dirty rectangles may waste when merged, cheaper than a second window setup
+
+class Region:
+    """An off-screen RGB666 buffer retaining the content of a rectangular screen area.
+
+    Drawing operations use absolute screen coordinates, are clipped to the region and only
+    mark the rows they actually changed as dirty. Nothing is sent to the display until the
+    owning compositor is flushed.
+    """
+    def __init__(self, x, y, width, height, background):
+        """
+        Initializes the region with a solid background.
+
+        Args:
+            x (int): X-coordinate of the top-left corner on screen.
+            y (int): Y-coordinate of the top-left corner on screen.
+            width (int): Width of the region.
+            height (int): Height of the region.
+            background (tuple): RGB color (r, g, b) the area currently shows on screen.
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.background = background
+        self.buffer = bytearray(bytes(background) * (width * height))
+        self.dirty = []
+
+    def mark_dirty(self, x0, y0, x1, y1):
+        """
+        Marks a rectangle (inclusive, region coordinates) as changed.
+
+        Args:
+            x0 (int): Left column.
+            y0 (int): Top row.
+            x1 (int): Right column.
+            y1 (int): Bottom row.
+        """
+        self.dirty.append([x0, y0, x1, y1])
+
+    def blit(self, x, y, width, height, data):
+        """
+        Copies row-major RGB666 pixel data into the region.
+
+        Args:
+            x (int): X-coordinate of the top-left corner on screen.
+            y (int): Y-coordinate of the top-left corner on screen.
+            width (int): Width of the pixel data.
+            height (int): Height of the pixel data.
+            data (bytes): Pixel data (3 bytes per pixel).
+        """
+        x0 = max(x - self.x, 0)
+        y0 = max(y - self.y, 0)
+        x1 = min(x - self.x + width, self.width) - 1
+        y1 = min(y - self.y + height, self.height) - 1
+        if x0 > x1 or y0 > y1:
+            return
+
+        buf = self.buffer
+        stride = 3 * self.width
+        src_stride = 3 * width
+        src_x = 3 * (x0 - (x - self.x))
+        length = 3 * (x1 - x0 + 1)
+        first_row = -1
+        last_row = -1
+        for row in range(y0, y1 + 1):
+            src = (row - (y - self.y)) * src_stride + src_x
+            dest = row * stride + 3 * x0
+            new = data[src:src + length]
+            if buf[dest:dest + length] != new:
+                buf[dest:dest + length] = new
+                if first_row < 0:
+                    first_row = row
+                last_row = row
+
+        if first_row >= 0:
+            self.mark_dirty(x0, first_row, x1, last_row)
+
+    def fill_rect(self, x, y, width, height, color):
+        """
+        Fills a rectangle of the region with a solid color.
+
+        Args:
+            x (int): X-coordinate of the top-left corner on screen.
+            y (int): Y-coordinate of the top-left corner on screen.
+            width (int): Width of the rectangle.
+            height (int): Height of the rectangle.
+            color (tuple): RGB color (r, g, b).
+        """
+        width = min(width, self.x + self.width - x)
+        if width <= 0 or height <= 0:
+            return
+        row = bytes(color) * width
+        for i in range(height):
+            self.blit(x, y + i, width, 1, row)
+
+    def text(self, x, y, text_str, color, font, scale=1, background_color=None, spacing=1):
+        """
+        Draws text into the region, mirroring ILI9488.text.
+
+        Args:
+            x (int): Starting X-coordinate for the text.
+            y (int): Starting Y-coordinate for the text.
+            text_str (str): The string of text to display.
+            color (tuple): RGB color (r, g, b) of the text.
+            font (XglcdFont): Font to render the text with.
+            scale (int, optional): Scaling factor for the font. Defaults to 1.
+            background_color (tuple, optional): RGB background color. Defaults to the region background.
+            spacing (int, optional): Additional pixel spacing between characters. Defaults to 1.
+        """
+        if background_color is None:
+            background_color = self.background
+        current_x = x
+        for i in range(len(text_str)):
+            char_data, char_width, char_height = font.get_glyph(text_str[i], color, background_color, max(scale, 1))
+            if char_data:
+                if current_x > x:
+                    self.fill_rect(current_x - spacing, y, spacing, char_height, background_color)
+                self.blit(current_x, y, char_width, char_height, char_data)
+                current_x += char_width + spacing
+
+    def take_dirty(self):
+        """
+        Returns the merged dirty rectangles and clears them.
+
+        Overlapping rectangles, and rectangles whose bounding box wastes at most MERGE_SLACK
+        pixels, are merged so that every pixel is sent at most once per frame.
+
+        Returns:
+            list: Rectangles [x0, y0, x1, y1] in region coordinates.
+        """
+        rects = self.dirty
+        self.dirty = []
+        merged = True
+        while merged and len(rects) > 1:
+            merged = False
+            for i in range(len(rects)):
+                a = rects[i]
+                for j in range(i + 1, len(rects)):
+                    b = rects[j]
+                    u = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    if _area(u) <= _area(a) + _area(b) + MERGE_SLACK:
+                        rects[i] = u
+                        rects.pop(j)
+                        merged = True
+                        break
+                if merged:
+                    break
+        return rects
+
+def _area(rect):
+    return (rect[2] - rect[0] + 1) * (rect[3] - rect[1] + 1)
+
+class Compositor:
+    """Collects drawing into retained regions and sends only the changed spans to the display."""
+    def __init__(self, display):
+        """
+        Initializes the compositor.
+
+        Args:
+            display (ILI9488): The display driver to flush to.
+        """
+        self.display = display
+        self.regions = []
+        self.frame_pixels = 0  # Pixels pushed by the last flush
+        self.frame_rects = 0   # Windows opened by the last flush
+        self.total_pixels = 0  # Pixels pushed since creation
+
+    def region(self, x, y, width, height, background):
+        """
+        Creates and registers a new region.
+
+        Args:
+            x (int): X-coordinate of the top-left corner on screen.
+            y (int): Y-coordinate of the top-left corner on screen.
+            width (int): Width of the region.
+            height (int): Height of the region.
+            background (tuple): RGB color (r, g, b) the area currently shows on screen.
+
+        Returns:
+            Region: The new region.
+        """
+        region = Region(x, y, width, height, background)
+        self.regions.append(region)
+        return region
+
+    def clear(self):
+        """Forgets all regions, e.g. after the screen has been redrawn from scratch."""
+        self.regions = []
+
+    def flush(self):
+        """
+        Sends the merged dirty rectangles of all regions to the display.
+
+        Returns:
+            int: Number of pixels pushed in this frame.
+        """
+        display = self.display
+        pixels = 0
+        rects = 0
+        for region in self.regions:
+            stride = 3 * region.width
+            buf = memoryview(region.buffer)
+            for x0, y0, x1, y1 in region.take_dirty():
+                with display.transaction() as tx:
+                    display.set_window(region.x + x0, region.y + y0, region.x + x1, region.y + y1)
+                    if x0 == 0 and x1 == region.width - 1:
+                        # Full-width rectangle, the rows are contiguous in the buffer
+                        tx.data(buf[y0 * stride:(y1 + 1) * stride])
+                    else:
+                        for row in range(y0, y1 + 1):
+                            start = row * stride + 3 * x0
+                            tx.data(buf[start:start + 3 * (x1 - x0 + 1)])
+                pixels += (x1 - x0 + 1) * (y1 - y0 + 1)
+                rects += 1
+
+        self.frame_pixels = pixels
+        self.frame_rects = rects
+        self.total_pixels += pixels
+        return pixels
+
+    def frame_stats(self):
+        """
+        Returns statistics of the last flushed frame.
+
+        Returns:
+            dict: Pixels and windows pushed by the last flush, and pixels pushed in total.
+        """
+        return {
+            "pixels": self.frame_pixels,
+            "rects": self.frame_rects,
+            "total_pixels": self.total_pixels
+        }
@@ -0,0 +1,90 @@
+# Fixed-position text fields with per-character redraw
+class TextField:
+    """A fixed-position text field drawn into a region.
+
+    The field remembers the string, positions and color it last drew and, on update,
+    only re-rasterizes the character cells that differ. Cells that are no longer covered
+    by the new string are cleared with the background color.
+    """
+    def __init__(self, surface, x, y, font, color, background, scale=1, spacing=1):
+        """
+        Initializes the text field.
+
+        Args:
+            surface (Region): Surface providing blit() and fill_rect() in screen coordinates.
+            x (int): X-coordinate of the first character.
+            y (int): Y-coordinate of the top of the characters.
+            font (XglcdFont): Font to render the text with.
+            color (tuple): Default RGB text color (r, g, b).
+            background (tuple): RGB background color (r, g, b).
+            scale (int, optional): Scaling factor for the font. Defaults to 1.
+            spacing (int, optional): Additional pixel spacing between characters. Defaults to 1.
+        """
+        self.surface = surface
+        self.x = x
+        self.y = y
+        self.font = font
+        self.color = color
+        self.background = background
+        self.scale = scale
+        self.spacing = spacing
+        self.text = ""
+        self.cells = []   # [x, width] of each drawn character
+        self.drawn_color = None
+        self.cells_drawn = 0 # Character cells rasterized by the last update
+
+    def set(self, text, color=None):
+        """
+        Updates the field, redrawing only the character cells that changed.
+
+        Args:
+            text (str): The new text.
+            color (tuple, optional): RGB text color (r, g, b). Defaults to the field color.
+
+        Returns:
+            bool: False if text and color are unchanged and nothing was drawn.
+        """
+        color = self.color if color is None else color
+        if text == self.text and color == self.drawn_color:
+            return False
+
+        font = self.font
+        surface = self.surface
+        old_text = self.text
+        old_cells = self.cells
+        recolor = color != self.drawn_color
+        cells = []
+        current_x = self.x
+        height = font.height * self.scale
+        drawn = 0
+        for i in range(len(text)):
+            char_data, char_width, char_height = font.get_glyph(text[i], color, self.background, self.scale)
+            if not char_data:
+                cells.append([current_x, 0])
+                continue
+            if (recolor or i >= len(old_text) or i >= len(old_cells) or text[i] != old_text[i]
+                    or old_cells[i][0] != current_x or old_cells[i][1] != char_width):
+                surface.blit(current_x, self.y, char_width, char_height, char_data)
+                if self.spacing > 0:
+                    surface.fill_rect(current_x + char_width, self.y, self.spacing, char_height, self.background)
+                drawn += 1
+            cells.append([current_x, char_width])
+            current_x += char_width + self.spacing
+
+        # Clear what is left of the previous, longer string
+        if old_cells:
+            old_end = old_cells[-1][0] + old_cells[-1][1] + self.spacing
+            if old_end > current_x:
+                surface.fill_rect(current_x, self.y, old_end - current_x, height, self.background)
+
+        self.text = text
+        self.cells = cells
+        self.drawn_color = color
+        self.cells_drawn = drawn
+        return True
+
+    def reset(self):
+        """Forgets the drawn state, the next update redraws every character."""
+        self.text = ""
+        self.cells = []
+        self.drawn_color = None
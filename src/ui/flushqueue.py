@@ -0,0 +1,134 @@
+# Double-buffered background flush queue for the display bus
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+class FlushQueue:
+    """Double-buffered queue that shifts display writes out in the background.
+
+    Command and data bytes are copied into one of two buffers together with the level of the
+    data/command line for each segment. A full (or explicitly submitted) buffer becomes a job
+    that a background thread sends within one chip select frame, while the renderer keeps
+    filling the other buffer. Without thread support, jobs are sent synchronously on submit.
+    """
+    def __init__(self, spi, cs, dc, buffer_size=16384, threaded=True):
+        """
+        Initializes the queue and, if possible, starts the worker thread.
+
+        Args:
+            spi (machine.SPI): Configured SPI bus object.
+            cs (machine.Pin): Chip Select pin object.
+            dc (machine.Pin): Data/Command pin object.
+            buffer_size (int, optional): Size of each of the two buffers in bytes. Defaults to 16384.
+            threaded (bool, optional): Send jobs from a background thread if available. Defaults to True.
+        """
+        self.spi = spi
+        self.cs = cs
+        self.dc = dc
+        self.size = buffer_size
+        self.buffers = [bytearray(buffer_size), bytearray(buffer_size)]
+        self.segments = [[], []] # [dc level, start, end] per buffer
+        self.current = 0         # Buffer the renderer is filling
+        self.length = 0          # Bytes used in the current buffer
+        self.jobs = []
+        self.jobs_sent = 0
+        self.threaded = threaded and _thread is not None
+
+        if self.threaded:
+            # A buffer's lock is held while it is being filled or waiting to be sent
+            self.free = [_thread.allocate_lock(), _thread.allocate_lock()]
+            self.free[0].acquire()
+            self.jobs_lock = _thread.allocate_lock()
+            self.wake = _thread.allocate_lock()
+            self.wake.acquire()
+            _thread.start_new_thread(self.__worker, ())
+
+    def write(self, mode, data):
+        """
+        Copies bytes into the current buffer, submitting it whenever it is full.
+
+        Args:
+            mode (int): Data/command line level, 0 for command bytes and 1 for data bytes.
+            data (bytes): Buffer to send (bytes, bytearray or memoryview).
+        """
+        src = memoryview(data)
+        total = len(src)
+        pos = 0
+        while pos < total:
+            if self.length == self.size:
+                self.submit()
+            start = self.length
+            chunk = min(self.size - start, total - pos)
+            memoryview(self.buffers[self.current])[start:start + chunk] = src[pos:pos + chunk]
+            segments = self.segments[self.current]
+            if segments and segments[-1][0] == mode and segments[-1][2] == start:
+                segments[-1][2] += chunk
+            else:
+                segments.append([mode, start, start + chunk])
+            self.length += chunk
+            pos += chunk
+
+    def submit(self):
+        """Hands the current buffer over for sending and switches to the other one."""
+        if self.length == 0:
+            return
+        index = self.current
+        if self.threaded:
+            self.jobs_lock.acquire()
+            self.jobs.append(index)
+            self.jobs_lock.release()
+            try:
+                self.wake.release()
+            except RuntimeError:
+                pass # Worker is already awake
+            # Wait until the other buffer has been sent, then take it over
+            self.current = index ^ 1
+            self.free[self.current].acquire()
+        else:
+            self.__send(index)
+            self.current = index ^ 1
+        self.length = 0
+
+    def flush(self, wait=True):
+        """
+        Submits pending bytes and optionally waits until everything has been sent.
+
+        Args:
+            wait (bool, optional): Block until the bus is idle. Defaults to True.
+        """
+        self.submit()
+        if wait and self.threaded:
+            other = self.free[self.current ^ 1]
+            other.acquire()
+            other.release()
+
+    def __send(self, index):
+        """
+        Sends one buffer within a single chip select frame.
+
+        Args:
+            index (int): Index of the buffer to send.
+        """
+        buf = memoryview(self.buffers[index])
+        segments = self.segments[index]
+        self.cs.value(0) # Assert Chip Select
+        for mode, start, end in segments:
+            self.dc.value(mode) # Set Data/Command mode
+            self.spi.write(buf[start:end])
+        self.cs.value(1) # De-assert Chip Select
+        del segments[:]
+        self.jobs_sent += 1
+
+    def __worker(self):
+        """Background thread, sends submitted buffers in order."""
+        while True:
+            self.wake.acquire()
+            while True:
+                self.jobs_lock.acquire()
+                index = self.jobs.pop(0) if self.jobs else None
+                self.jobs_lock.release()
+                if index is None:
+                    break
+                self.__send(index)
+                self.free[index].release()
@@ -0,0 +1,235 @@
+# Snapshots of drawn screen content, recorded from the display writes and replayed at boot
+import os
+from drivers.ILI9488 import RLE_MAGIC, TFT_CASET, TFT_PASET, TFT_RAMWR
+
+# Screen snapshots (.snp666): magic, key length, key, then one record per drawn window: x and y
+# (big-endian 16 bit), image length (big-endian 32 bit), then the window pixels as a .rle666 image.
+SNAPSHOT_MAGIC = b"SNP6"
+
+class SnapshotRecorder:
+    """Records the windows written to the display into a snapshot file.
+
+    Attached with ILI9488.record(), the recorder follows the command stream: the column and page
+    address parameters give the window, the memory write data its pixels. Every window is run-length
+    encoded in RAM while it is drawn and written to the file as one record when the next command
+    starts. The snapshot is written to a temporary file and only replaces the previous one if it
+    could be recorded completely.
+    """
+    def __init__(self, path, key):
+        """
+        Initializes the recorder and creates the temporary snapshot file.
+
+        Args:
+            path (str): Path of the snapshot file.
+            key (bytes): Key identifying the recorded content, at most 255 bytes.
+
+        Raises:
+            OSError: If the temporary file cannot be created.
+        """
+        self.path = path
+        self.temp_path = path + ".tmp"
+        self.file = open(self.temp_path, "wb")
+        self.file.write(SNAPSHOT_MAGIC + bytes((len(key),)) + key)
+        self.valid = True
+        self.records = 0
+        self.command = None
+        self.params = bytearray()
+        self.window = [0, 0, 0, 0]
+        self.out = bytearray()       # Runs of the current window
+        self.remaining = 0           # Pixels the current window can still take
+        self.written = 0             # Pixels written to the current window
+        self.run_pixel = None        # Pixel of the current run as 0xRRGGBB
+        self.run_count = 0
+        self.literal = bytearray(3 * 128)
+        self.literal_count = 0
+        self.carry = bytearray()     # Bytes of a pixel split across two writes
+
+    def write(self, mode, data):
+        """
+        Follows a write to the display.
+
+        Args:
+            mode (int): 0 for command bytes, 1 for data bytes.
+            data (bytes): The bytes written.
+        """
+        if not self.valid:
+            return
+        if mode == 0:
+            for command in data:
+                self.__command(command)
+        elif self.command == TFT_RAMWR:
+            self.__pixels(data)
+        elif self.command == TFT_CASET or self.command == TFT_PASET:
+            self.params.extend(data)
+            if len(self.params) >= 4:
+                p = self.params
+                axis = 0 if self.command == TFT_CASET else 1
+                self.window[axis] = (p[0] << 8) | p[1]
+                self.window[axis + 2] = (p[2] << 8) | p[3]
+
+    def close(self):
+        """
+        Finishes recording and replaces the previous snapshot.
+
+        Returns:
+            bool: True if the snapshot was saved.
+        """
+        if self.command == TFT_RAMWR:
+            self.__end_window()
+        saved = self.valid and self.records > 0
+        try:
+            self.file.close()
+            if saved:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+                os.rename(self.temp_path, self.path)
+            else:
+                os.remove(self.temp_path)
+        except OSError:
+            saved = False
+        return saved
+
+    def __command(self, command):
+        """
+        Ends the current window on a new command and starts a new one on a memory write.
+
+        Args:
+            command (int): The command byte.
+        """
+        if self.command == TFT_RAMWR:
+            self.__end_window()
+        self.command = command
+        self.params = bytearray()
+        if command == TFT_RAMWR:
+            x0, y0, x1, y1 = self.window
+            self.remaining = (x1 - x0 + 1) * (y1 - y0 + 1)
+            self.written = 0
+            self.carry = bytearray()
+
+    def __pixels(self, data):
+        """
+        Run-length encodes the pixels of a memory write.
+
+        Args:
+            data (bytes): Pixel data, pixels may be split across writes.
+        """
+        if self.carry:
+            data = self.carry + bytes(data)
+            self.carry = bytearray()
+        mv = memoryview(data)
+        length = len(mv) - len(mv) % 3
+        if length < len(mv):
+            self.carry = bytearray(mv[length:])
+        if length // 3 > self.remaining:
+            # The window wrapped around, the recorded pixels would not match the screen
+            self.valid = False
+            return
+        self.remaining -= length // 3
+        self.written += length // 3
+        run_pixel = self.run_pixel
+        run_count = self.run_count
+        for i in range(0, length, 3):
+            pixel = (mv[i] << 16) | (mv[i + 1] << 8) | mv[i + 2]
+            if pixel == run_pixel and run_count < 128:
+                run_count += 1
+                continue
+            self.__end_run(run_pixel, run_count)
+            run_pixel = pixel
+            run_count = 1
+        self.run_pixel = run_pixel
+        self.run_count = run_count
+
+    def __end_run(self, pixel, count):
+        """
+        Emits a finished run, single pixels are collected as literals.
+
+        Args:
+            pixel (int): Pixel of the run as 0xRRGGBB.
+            count (int): Length of the run.
+        """
+        if count == 1:
+            offset = 3 * self.literal_count
+            self.literal[offset] = pixel >> 16
+            self.literal[offset + 1] = (pixel >> 8) & 0xFF
+            self.literal[offset + 2] = pixel & 0xFF
+            self.literal_count += 1
+            if self.literal_count == 128:
+                self.__flush_literal()
+        elif count:
+            self.__flush_literal()
+            self.out.append(0x80 | (count - 1))
+            self.out.append(pixel >> 16)
+            self.out.append((pixel >> 8) & 0xFF)
+            self.out.append(pixel & 0xFF)
+
+    def __flush_literal(self):
+        """Emits the collected literal pixels."""
+        if self.literal_count:
+            self.out.append(self.literal_count - 1)
+            self.out.extend(memoryview(self.literal)[:3 * self.literal_count])
+            self.literal_count = 0
+
+    def __end_window(self):
+        """Writes the current window as a record, windows that were only partly drawn are cut to whole rows."""
+        self.__end_run(self.run_pixel, self.run_count)
+        self.__flush_literal()
+        self.run_pixel = None
+        self.run_count = 0
+        out = self.out
+        self.out = bytearray()
+        x0, y0, x1, _ = self.window
+        width = x1 - x0 + 1
+        if not self.written:
+            return
+        if self.written % width or self.carry:
+            self.valid = False
+            return
+        height = self.written // width
+        header = bytearray(8)
+        header[0] = x0 >> 8
+        header[1] = x0 & 0xFF
+        header[2] = y0 >> 8
+        header[3] = y0 & 0xFF
+        length = 8 + len(out)
+        for i in range(4):
+            header[4 + i] = (length >> (24 - 8 * i)) & 0xFF
+        image = RLE_MAGIC + bytes((width >> 8, width & 0xFF, height >> 8, height & 0xFF))
+        try:
+            self.file.write(header)
+            self.file.write(image)
+            self.file.write(out)
+            self.records += 1
+        except OSError:
+            self.valid = False
+
+def draw_snapshot(display, path):
+    """
+    Draws a snapshot recorded by SnapshotRecorder.
+
+    Args:
+        display (ILI9488): The display driver to draw with.
+        path (str): Path of the snapshot file.
+
+    Returns:
+        bytes: Key of the drawn snapshot, None if there is no valid snapshot.
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(5)
+            if len(header) < 5 or header[:4] != SNAPSHOT_MAGIC:
+                return None
+            key = f.read(header[4])
+            record = bytearray(8)
+            while f.readinto(record) == 8:
+                start = f.tell()
+                x = (record[0] << 8) | record[1]
+                y = (record[2] << 8) | record[3]
+                length = (record[4] << 24) | (record[5] << 16) | (record[6] << 8) | record[7]
+                # The image decoder reads ahead, so the next record is found through the record length
+                display.image_rle(x, y, f)
+                f.seek(start + length)
+            return key
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,200 @@
+# Scrolling message ticker with hardware scrolling where the panel supports it
+from drivers.ILI9488 import SCROLL_LINES
+
+MESSAGE_GAP = 48 # Pixels between the end of a message and the start of the next queued one
+
+class Ticker:
+    """A strip that scrolls queued text messages from right to left, one after another.
+
+    The messages form one stream of pixel columns that moves through the strip. If the strip is a
+    full-height band in rotation 0, frame memory is a ring of the strip columns and the panel's
+    hardware scrolling moves its start, so a step only writes the newly exposed columns. Anywhere
+    else the panel cannot scroll the strip, so a step redraws the text rows of the messages on
+    screen at their new position, straight from the glyph cache. Rows and columns that only show
+    background are not resent and no copy of the strip is kept in RAM.
+    """
+    def __init__(self, display, x, y, width, height, font, color, background, step=2, spacing=1):
+        """
+        Initializes the ticker, nothing is drawn until a message is added.
+
+        Args:
+            display (ILI9488): The display driver.
+            x (int): X-coordinate of the top-left corner of the strip.
+            y (int): Y-coordinate of the top-left corner of the strip.
+            width (int): Width of the strip.
+            height (int): Height of the strip, at least the font height.
+            font (XglcdFont): Font to render the messages with.
+            color (tuple): RGB text color (r, g, b).
+            background (tuple): RGB background color (r, g, b).
+            step (int, optional): Pixels scrolled per step. Defaults to 2.
+            spacing (int, optional): Additional pixel spacing between characters. Defaults to 1.
+        """
+        self.display = display
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.font = font
+        self.color = color
+        self.background = background
+        self.step_width = min(step, width)
+        self.spacing = spacing
+        self.hardware = display.rotation == 0 and y == 0 and height == display.height
+        self.messages = []
+        self.active = False
+        self.head = 0      # Ring column shown at the left edge of the strip (hardware scrolling)
+        self.position = 0  # Stream columns scrolled in so far
+        self.runs = []     # [first stream column, layout, text width] of the messages that may be on screen
+        # One row of the columns drawn per step, every step draws the same columns in all rows
+        self.row = bytearray(3 * (self.step_width if self.hardware else width))
+        self.text_y = (height - font.height) // 2
+
+    def add(self, message):
+        """
+        Queues a message, starting the ticker if it is idle.
+
+        Args:
+            message (str): The text to scroll through the strip.
+        """
+        self.messages.append(message)
+        if not self.active:
+            self.active = True
+            self.head = 0
+            self.position = 0
+            self.runs = []
+            if self.hardware:
+                self.display.define_scroll(self.x, self.width)
+                self.display.scroll(self.x)
+            self.display.fill_rect(self.x, self.y, self.width, self.height, self.background)
+            self.__next_message()
+
+    def clear(self):
+        """Drops all messages and blanks the strip."""
+        self.messages = []
+        if self.active:
+            self.__stop()
+            self.display.fill_rect(self.x, self.y, self.width, self.height, self.background)
+
+    def step(self):
+        """
+        Scrolls the strip by one step.
+
+        Returns:
+            bool: False if the ticker is idle (all messages have scrolled through).
+        """
+        if not self.active:
+            return False
+        last = self.runs[-1]
+        text_end = last[0] + last[2]
+        if self.messages and self.position >= text_end + MESSAGE_GAP:
+            self.__next_message()
+        elif self.position >= text_end + self.width:
+            self.__stop()
+            return False
+
+        count = self.step_width
+        first = self.position
+        self.position += count
+        # Messages whose text and the background behind it have left the strip are dropped
+        left = self.position - self.width
+        while self.runs[0][0] + self.runs[0][2] + count <= left:
+            self.runs.pop(0)
+
+        if self.hardware:
+            head = self.head
+            self.head = (head + count) % self.width
+            split = min(count, self.width - head) # Columns before the ring wraps
+            self.__draw(first, first + split, self.x + head)
+            if split < count:
+                self.__draw(first + split, first + count, self.x)
+            self.display.scroll(self.x + self.head)
+            return True
+
+        # The text moved left, the columns it uncovered behind its end are redrawn as well
+        last = self.runs[-1]
+        start = max(left, self.runs[0][0])
+        end = min(self.position, last[0] + last[2] + count)
+        if start < end:
+            self.__draw(start, end, self.x + start - left)
+        return True
+
+    def __next_message(self):
+        """
+        Lays out the next queued message, it scrolls in from the right starting with the next step.
+
+        Returns:
+            bool: False if no message is queued.
+        """
+        if not self.messages:
+            return False
+        message = self.messages.pop(0)
+        layout = []
+        current_x = 0
+        for letter in message:
+            _, letter_width, _ = self.font.get_glyph(letter, self.color, self.background)
+            if letter_width:
+                layout.append([current_x, letter, letter_width])
+                current_x += letter_width + self.spacing
+        self.runs.append([self.position, layout, current_x])
+        return True
+
+    def __stop(self):
+        """Stops scrolling and restores the unscrolled frame memory mapping."""
+        self.active = False
+        if self.hardware:
+            self.display.define_scroll(0, SCROLL_LINES)
+            self.display.scroll(0)
+        self.head = 0
+        self.runs = []
+
+    def __draw(self, start, end, x):
+        """
+        Draws the text rows of stream columns start to end - 1 at a position of the strip.
+
+        The rows above and below the text keep the background the strip was cleared with. Letters
+        cover the same columns in every row, so the row buffer is filled with the background once
+        and only the letter slices are copied per row.
+
+        Args:
+            start (int): First stream column.
+            end (int): Stream column after the last one.
+            x (int): X-coordinate the first column is drawn at.
+        """
+        font = self.font
+        count = end - start
+        row_bytes = 3 * count
+        buf = memoryview(self.row)
+        buf[0], buf[1], buf[2] = self.background
+        filled = 3
+        while filled < row_bytes:
+            chunk = min(filled, row_bytes - filled)
+            buf[filled:filled + chunk] = buf[:chunk]
+            filled += chunk
+
+        # (glyph, offset of the first copied byte, glyph row bytes, offset in the row, bytes copied) per visible letter
+        slices = []
+        for run_start, layout, text_width in self.runs:
+            if run_start >= end:
+                break
+            if run_start + text_width <= start:
+                continue
+            for letter_x, letter, letter_width in layout:
+                first = run_start + letter_x
+                if first >= end:
+                    break
+                if first + letter_width <= start:
+                    continue
+                glyph = font.get_glyph(letter, self.color, self.background)[0]
+                lo = max(start, first)
+                hi = min(end, first + letter_width)
+                slices.append((memoryview(glyph), 3 * (lo - first), 3 * letter_width, 3 * (lo - start), 3 * (hi - lo)))
+
+        display = self.display
+        top = self.y + self.text_y
+        with display.transaction() as tx:
+            display.set_window(x, top, x + count - 1, top + font.height - 1)
+            for row in range(font.height):
+                for glyph, src, glyph_row_bytes, dest, length in slices:
+                    src += row * glyph_row_bytes
+                    buf[dest:dest + length] = glyph[src:src + length]
+                tx.data(buf[:row_bytes])
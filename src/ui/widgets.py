@@ -0,0 +1,302 @@
+# Retained widget tree for screens that are updated incrementally
+from ui.fields import TextField
+
+class Widget:
+    """Base class of all widgets, a rectangle on screen with child widgets.
+
+    A widget caches the state it shows and is marked dirty when that state changes. Rendering
+    the tree only paints dirty widgets, unless the screen content below a widget was lost
+    (after it was hidden, or when an opaque parent repainted), then the widget is repainted fully.
+    """
+    opaque = False # Painting covers the whole bounds, so children have to repaint afterwards
+
+    def __init__(self, x, y, width, height):
+        """
+        Initializes the widget.
+
+        Args:
+            x (int): X-coordinate of the top-left corner.
+            y (int): Y-coordinate of the top-left corner.
+            width (int): Width of the widget.
+            height (int): Height of the widget.
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.children = []
+        self.visible = True
+        self.dirty = True    # Cached state changed since the last paint
+        self.damaged = False # Screen content of the widget was lost and has to be painted fully
+
+    def add(self, child):
+        """
+        Adds a child widget.
+
+        Args:
+            child (Widget): The widget to add.
+
+        Returns:
+            Widget: The added widget, for chaining.
+        """
+        self.children.append(child)
+        return child
+
+    def invalidate(self):
+        """Marks the widget for repainting."""
+        self.dirty = True
+
+    def set_visible(self, visible):
+        """
+        Shows or hides the widget and its children.
+
+        Hidden widgets keep their state but are not painted. The area of a hidden widget belongs to
+        whoever hid it, so the widget is repainted fully once it is shown again.
+
+        Args:
+            visible (bool): True to show the widget.
+        """
+        if visible and not self.visible:
+            self.damaged = True
+        self.visible = visible
+
+    def mark_painted(self):
+        """Marks the widget and its children as painted, for content that is already on screen (e.g. a snapshot)."""
+        self.dirty = False
+        self.damaged = False
+        for child in self.children:
+            child.mark_painted()
+
+    def paint(self, display, full):
+        """
+        Draws the widget itself, overridden by subclasses.
+
+        Args:
+            display (ILI9488): The display driver to draw with.
+            full (bool): Whether the screen content of the widget was lost.
+        """
+        pass
+
+    def render(self, display, changed_only=True):
+        """
+        Paints the widget if needed, then renders its children.
+
+        Args:
+            display (ILI9488): The display driver to draw with.
+            changed_only (bool, optional): Only paint widgets whose state changed. Defaults to True.
+
+        Returns:
+            int: Number of widgets painted.
+        """
+        if not self.visible:
+            return 0
+        full = self.damaged or not changed_only
+        painted = 0
+        if self.dirty or full:
+            self.paint(display, full)
+            self.dirty = False
+            self.damaged = False
+            painted = 1
+        children_only_changed = changed_only and not (painted and self.opaque) and not full
+        for child in self.children:
+            painted += child.render(display, children_only_changed)
+        return painted
+
+class Panel(Widget):
+    """A filled rectangle that contains other widgets."""
+    opaque = True
+
+    def __init__(self, x, y, width, height, background):
+        """
+        Initializes the panel.
+
+        Args:
+            x (int): X-coordinate of the top-left corner.
+            y (int): Y-coordinate of the top-left corner.
+            width (int): Width of the panel.
+            height (int): Height of the panel.
+            background (tuple): RGB background color (r, g, b).
+        """
+        super().__init__(x, y, width, height)
+        self.background = background
+
+    def paint(self, display, full):
+        display.fill_rect(self.x, self.y, self.width, self.height, self.background)
+
+class Divider(Panel):
+    """A solid line or bar separating parts of the layout."""
+    pass
+
+class Icon(Widget):
+    """An image streamed from a file."""
+    def __init__(self, x, y, width, height, source=None):
+        """
+        Initializes the icon.
+
+        Args:
+            x (int): X-coordinate of the top-left corner.
+            y (int): Y-coordinate of the top-left corner.
+            width (int): Width of the image.
+            height (int): Height of the image.
+            source (str, optional): Path of the image file. Defaults to None (nothing is drawn).
+        """
+        super().__init__(x, y, width, height)
+        self.source = source
+
+    def set(self, source):
+        """
+        Changes the image, it is only repainted if the path differs.
+
+        Args:
+            source (str): Path of the image file.
+        """
+        if source != self.source:
+            self.source = source
+            self.dirty = True
+
+    def paint(self, display, full):
+        if self.source is not None:
+            display.image_file(self.x, self.y, self.width, self.height, self.source)
+
+class Label(Widget):
+    """A line of text.
+
+    Without a compositor the text is drawn directly and the label is cleared before every change.
+    With a compositor the label is retained in an off-screen region and only the character cells
+    that changed are sent to the display when the compositor is flushed.
+    """
+    def __init__(self, x, y, width, height, font, color, background, text="", scale=1, spacing=1,
+                 align="left", compositor=None):
+        """
+        Initializes the label.
+
+        Args:
+            x (int): X-coordinate of the top-left corner.
+            y (int): Y-coordinate of the top-left corner, the top of the characters.
+            width (int): Width of the label.
+            height (int): Height of the label.
+            font (XglcdFont): Font to render the text with.
+            color (tuple): RGB text color (r, g, b).
+            background (tuple): RGB background color (r, g, b).
+            text (str, optional): Initial text. Defaults to "".
+            scale (int, optional): Scaling factor for the font. Defaults to 1.
+            spacing (int, optional): Additional pixel spacing between characters. Defaults to 1.
+            align (str, optional): "left" or "center". Defaults to "left".
+            compositor (Compositor, optional): Compositor to retain the label in. Defaults to None.
+        """
+        super().__init__(x, y, width, height)
+        self.font = font
+        self.color = color
+        self.background = background
+        self.text = text
+        self.scale = scale
+        self.spacing = spacing
+        self.align = align
+        self.painted = False
+        self.field = None
+        if compositor is not None:
+            region = compositor.region(x, y, width, height, background)
+            self.field = TextField(region, x, y, font, color, background, scale, spacing)
+
+    def set(self, text, color=None):
+        """
+        Changes the text and optionally its color, the label is only repainted if either differs.
+
+        Args:
+            text (str): The new text.
+            color (tuple, optional): RGB text color (r, g, b). Defaults to the current color.
+        """
+        color = self.color if color is None else color
+        if text != self.text or color != self.color:
+            self.text = text
+            self.color = color
+            self.dirty = True
+
+    def mark_painted(self):
+        super().mark_painted()
+        self.painted = True
+
+    def __text_x(self):
+        """
+        Returns the X-coordinate of the first character.
+
+        Returns:
+            int: X-coordinate on screen.
+        """
+        if self.align == "center":
+            return self.x + (self.width - self.font.measure_text(self.text, self.scale, self.spacing)) // 2
+        return self.x
+
+    def paint(self, display, full):
+        text_x = self.__text_x()
+        field = self.field
+        if field is None:
+            if self.painted and not full:
+                display.fill_rect(self.x, self.y, self.width, self.height, self.background)
+            if display.font is not self.font:
+                display.set_font(self.font)
+            display.text(text_x, self.y, self.text, self.color, self.scale, self.background, self.spacing)
+            self.painted = True
+            return
+
+        region = field.surface
+        if text_x != field.x:
+            # Aligned text moved, start over from a blank region
+            region.fill_rect(self.x, self.y, self.width, self.height, self.background)
+            field.reset()
+            field.x = text_x
+        if full and self.painted:
+            # A region starts out showing its background, after that the screen content has to be resent
+            region.mark_dirty(0, 0, region.width - 1, region.height - 1)
+        field.set(self.text, self.color)
+        self.painted = True
+
+class Price(Label):
+    """A retained, large fuel price label."""
+    def __init__(self, x, y, width, height, font, color, background, compositor, text="", scale=2, spacing=6):
+        """
+        Initializes the price label.
+
+        Args:
+            x (int): X-coordinate of the top-left corner.
+            y (int): Y-coordinate of the top-left corner.
+            width (int): Width of the label.
+            height (int): Height of the label.
+            font (XglcdFont): Price font.
+            color (tuple): RGB text color (r, g, b).
+            background (tuple): RGB background color (r, g, b).
+            compositor (Compositor): Compositor to retain the label in.
+            text (str, optional): Initial price. Defaults to "".
+            scale (int, optional): Scaling factor for the font. Defaults to 2.
+            spacing (int, optional): Additional pixel spacing between characters. Defaults to 6.
+        """
+        super().__init__(x, y, width, height, font, color, background, text, scale, spacing, "left", compositor)
+
+class Screen(Widget):
+    """Root of a widget tree, flushes the retained labels after every render pass."""
+    def __init__(self, display, compositor):
+        """
+        Initializes the screen.
+
+        Args:
+            display (ILI9488): The display driver to draw with.
+            compositor (Compositor): Compositor holding the retained labels of the tree.
+        """
+        super().__init__(0, 0, display.width, display.height)
+        self.display = display
+        self.compositor = compositor
+
+    def render(self, display=None, changed_only=True):
+        """
+        Renders the tree and sends the changed parts of retained labels.
+
+        Args:
+            display (ILI9488, optional): The display driver to draw with. Defaults to the screen's display.
+            changed_only (bool, optional): Only paint widgets whose state changed. Defaults to True.
+
+        Returns:
+            int: Number of widgets painted.
+        """
+        painted = super().render(display or self.display, changed_only)
+        self.compositor.flush()
+        return painted
@@ -1,12 +1,14 @@
 # Import required libraries
 import machine, os, gzip, tarfile, hashlib, shutil, ubinascii
-import urequests as requests
+from net import http
+from net.cache import cache
 
 class UpdateManager:
     """Manages the over-the-air (OTA) firmware update process by interacting with a GitHub repository."""
 
     __HEADERS = {"User-Agent": "ESP32-OTA-Updater"} # Custom User-Agent for API requests
     __OTA_API_URL = "https://api.github.com/repos/smolinde/iot-dashboard/releases/latest" # GitHub API endpoint for latest release
+    __RELEASE_TTL = 0 # The release is revalidated on every check, GitHub answers 304 without the release JSON if it is unchanged
 
     def __init__(self):
         """
@@ -17,6 +19,20 @@ class UpdateManager:
         self.browser_download_url = None # Stores the download URL for the release asset
         self.digest = None # Stores the SHA256 digest of the release asset for verification
 
+    def __parse_release(self, response):
+        """
+        Extracts the release information needed for an update from the GitHub API response.
+
+        Args:
+            response (Response): The response of the latest release request.
+
+        Returns:
+            list: Tag name, asset name, asset download URL and asset SHA256 digest.
+        """
+        data = response.json()
+        asset = data["assets"][0]
+        return [data["tag_name"], asset["name"], asset["browser_download_url"], asset["digest"][7:]]
+
     def update_available(self):
         """
         Checks if a new firmware update is available by comparing the current version with the latest GitHub release.
@@ -35,17 +51,12 @@ class UpdateManager:
                 f.write("v0.0.0")
 
         try:
-            # Fetch latest release information from GitHub API
-            response = requests.get(self.__OTA_API_URL, headers = self.__HEADERS)
-            data = response.json()
-            response.close()
-            
-            # Parse release data
-            self.tag_name = data["tag_name"]
-            self.name = data["assets"][0]["name"]
-            self.browser_download_url = data["assets"][0]["browser_download_url"]
-            # Extract SHA256 digest from the asset information
-            self.digest = data["assets"][0]["digest"][7:] 
+            # Fetch latest release information from GitHub API, kept on flash so an unchanged release is not downloaded again
+            release = cache().get(self.__OTA_API_URL, self.__RELEASE_TTL, self.__parse_release,
+                                  headers = self.__HEADERS, persist = True)
+
+            # Release data, the SHA256 digest of the asset is used for verification
+            self.tag_name, self.name, self.browser_download_url, self.digest = release
             return current_version, self.tag_name
         except Exception:
             return None, None
@@ -58,10 +69,15 @@ class UpdateManager:
             tuple: "OK" and None on success, or an error code and message on failure.
         """
         try:
-            response = requests.get(self.browser_download_url, headers = self.__HEADERS)
-            # Write the downloaded content to a file in the root directory
+            response = http.get(self.browser_download_url, headers = self.__HEADERS)
+            # Stream the download to a file in the root directory, the archive does not fit into the heap
+            buffer = bytearray(4096)
             with open("/" + self.name, "wb") as f:
-                f.write(response.content)
+                while True:
+                    count = response.readinto(buffer)
+                    if not count:
+                        break
+                    f.write(memoryview(buffer)[:count])
             response.close()
             return "OK", None
         except Exception:
@@ -0,0 +1,8 @@
+# Makes the firmware sources importable on the host
+import os, sys, time, types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+if not hasattr(time, "sleep_ms"):
+    time.sleep_ms = lambda ms: None
+sys.modules.setdefault("ntptime", types.ModuleType("ntptime"))
@@ -0,0 +1,157 @@
+# Host stand-ins for the MicroPython hardware objects the drivers use
+
+class FakePin:
+    """Stand-in for machine.Pin that counts falling edges (chip select assertions)."""
+    OUT = 1
+
+    def __init__(self):
+        self.level = 1
+        self.falling_edges = 0
+        self.toggles = 0
+
+    def init(self, mode, value=1):
+        self.level = value
+
+    def value(self, level):
+        if level != self.level:
+            self.toggles += 1
+            if not level:
+                self.falling_edges += 1
+        self.level = level
+
+class FakeSPI:
+    """Stand-in for machine.SPI that counts write calls and bytes."""
+    def __init__(self):
+        self.writes = 0
+        self.bytes = 0
+
+    def write(self, data):
+        self.writes += 1
+        self.bytes += len(data)
+
+def measure(display, cs, dc, action):
+    """Runs an action and returns the bus activity it caused.
+
+    Args:
+        display (ILI9488): Display driven through a FakeSPI.
+        cs (FakePin): Its chip select pin.
+        dc (FakePin): Its data/command pin.
+        action (function): Called without arguments.
+
+    Returns:
+        tuple: (chip select transactions, SPI write calls, bytes sent, data/command toggles).
+    """
+    spi = display.spi
+    start = (cs.falling_edges, spi.writes, spi.bytes, dc.toggles)
+    action()
+    return (cs.falling_edges - start[0], spi.writes - start[1], spi.bytes - start[2], dc.toggles - start[3])
+
+class FakePanel:
+    """Stand-in for machine.SPI that emulates the ILI9488 frame memory in landscape (rotation 0).
+
+    Window writes (CASET, PASET, RAMWR) are decoded from the byte stream, the data/command level is
+    read from the pin passed in. Every window that received pixels is recorded, and the hardware
+    scrolling commands (VSCRDEF, VSCRSADD) are applied to what screen() returns.
+    """
+    WIDTH = 480
+    HEIGHT = 320
+
+    def __init__(self, dc=None):
+        """
+        Args:
+            dc (FakePin, optional): The data/command pin of the display, it can be set later. Defaults to None.
+        """
+        self.dc = dc
+        self.memory = bytearray(3 * self.WIDTH * self.HEIGHT)
+        self.command = None
+        self.params = bytearray()
+        self.columns = (0, self.WIDTH - 1)
+        self.pages = (0, self.HEIGHT - 1)
+        self.cursor = None            # (x, y) of the next pixel of a memory write
+        self.partial = bytearray()    # Bytes of an incomplete pixel
+        self.scroll_area = (0, 480, 0)
+        self.scroll_start = 0
+        self.windows = []             # [x0, y0, x1, y1, pixels] of every memory write
+        self.writes = 0
+        self.bytes = 0
+
+    def write(self, data):
+        self.writes += 1
+        self.bytes += len(data)
+        data = bytes(data)
+        if self.dc.level == 0:
+            for command in data:
+                self.__end_command()
+                self.command = command
+                self.params = bytearray()
+                if command == 0x2C:
+                    self.cursor = (self.columns[0], self.pages[0])
+                    self.partial = bytearray()
+                    self.windows.append([self.columns[0], self.pages[0], self.columns[1], self.pages[1], 0])
+            return
+        if self.command == 0x2C:
+            self.__pixels(self.partial + data)
+        else:
+            self.params += data
+            self.__end_command()
+
+    def __end_command(self):
+        """Applies the parameters received for the current command."""
+        p = self.params
+        if self.command == 0x2A and len(p) >= 4:
+            self.columns = ((p[0] << 8) | p[1], (p[2] << 8) | p[3])
+        elif self.command == 0x2B and len(p) >= 4:
+            self.pages = ((p[0] << 8) | p[1], (p[2] << 8) | p[3])
+        elif self.command == 0x33 and len(p) >= 6:
+            self.scroll_area = ((p[0] << 8) | p[1], (p[2] << 8) | p[3], (p[4] << 8) | p[5])
+        elif self.command == 0x37 and len(p) >= 2:
+            self.scroll_start = (p[0] << 8) | p[1]
+
+    def __pixels(self, data):
+        """Stores pixel bytes row by row within the current window, wrapping like the panel."""
+        x0, x1 = self.columns
+        y0, y1 = self.pages
+        x, y = self.cursor
+        whole = len(data) - len(data) % 3
+        self.partial = bytearray(data[whole:])
+        self.windows[-1][4] += whole // 3
+        pos = 0
+        while pos < whole:
+            count = min(x1 - x + 1, (whole - pos) // 3)
+            if 0 <= y < self.HEIGHT and x < self.WIDTH:
+                visible = min(count, self.WIDTH - x)
+                offset = 3 * (y * self.WIDTH + x)
+                self.memory[offset:offset + 3 * visible] = data[pos:pos + 3 * visible]
+            pos += 3 * count
+            x += count
+            if x > x1:
+                x = x0
+                y = y + 1 if y < y1 else y0
+        self.cursor = (x, y)
+
+    def pixel(self, x, y):
+        """Returns the (r, g, b) bytes in frame memory at a position."""
+        offset = 3 * (y * self.WIDTH + x)
+        return tuple(self.memory[offset:offset + 3])
+
+    def region(self, x, y, width, height):
+        """Returns what the panel shows in an area, frame memory with the scrolling area applied.
+
+        Returns:
+            bytes: RGB666 pixels of the area row by row.
+        """
+        top, lines, _ = self.scroll_area
+        shown = bytearray()
+        for row in range(y, y + height):
+            for column in range(x, x + width):
+                if top <= column < top + lines:
+                    column = top + (self.scroll_start - top + column - top) % lines
+                offset = 3 * (row * self.WIDTH + column)
+                shown += self.memory[offset:offset + 3]
+        return bytes(shown)
+
+    def reset_windows(self):
+        """Forgets the recorded windows and bus counters."""
+        self.windows = []
+        self.writes = 0
+        self.bytes = 0
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from net import cache as cache_module
+from net.cache import ResponseCache
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class FakeServer:
+    """Answers requests with queued responses and records the request headers."""
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+    async def get_async(self, url, headers=None):
+        return self.get(url, headers)
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeServer()
+    monkeypatch.setattr(cache_module.http, "get", server.get)
+    monkeypatch.setattr(cache_module.http, "get_async", server.get_async)
+    return server
+
+def parse(response):
+    if response.status_code != 200:
+        raise AssertionError("Error bodies must not be parsed")
+    return response.body
+
+async def parse_async(response):
+    return parse(response)
+
+URL = "https://api.example/weather"
+
+def test_fresh_value_is_used_without_request(server):
+    cache = ResponseCache(flash_dir=None)
+    server.responses.append(FakeResponse(200, {"t": 1}, {"etag": '"a"'}))
+    assert cache.get(URL, 600, parse) == {"t": 1}
+    assert cache.get(URL, 600, parse) == {"t": 1}
+    assert len(server.requests) == 1
+    assert cache.hits == 1
+
+def test_not_modified_keeps_the_cached_value(server):
+    cache = ResponseCache(flash_dir=None)
+    server.responses += [FakeResponse(200, {"t": 1}, {"etag": '"a"'}), FakeResponse(304)]
+    cache.get(URL, 0, parse)
+    assert cache.get(URL, 0, parse) == {"t": 1}
+    assert server.requests[1]["If-None-Match"] == '"a"'
+    assert cache.revalidated == 1
+
+@pytest.mark.parametrize("status", [404, 500, 503])
+def test_error_status_keeps_the_stale_value(server, status):
+    cache = ResponseCache(flash_dir=None)
+    server.responses += [FakeResponse(200, {"t": 1}, {"etag": '"a"'}), FakeResponse(status, {"error": "down"}),
+                         FakeResponse(200, {"t": 2})]
+    cache.get(URL, 0, parse)
+    assert cache.get(URL, 0, parse) == {"t": 1}
+    assert cache.errors == 1
+    # The stale value is revalidated again on the next request
+    assert cache.get(URL, 0, parse) == {"t": 2}
+
+def test_error_status_without_cached_value_raises(server):
+    cache = ResponseCache(flash_dir=None)
+    response = FakeResponse(500, {"error": "down"})
+    server.responses.append(response)
+    with pytest.raises(OSError):
+        cache.get(URL, 600, parse)
+    assert response.closed
+    assert cache.entries == {}
+
+def test_error_status_is_handled_the_same_without_blocking(server):
+    cache = ResponseCache(flash_dir=None)
+    server.responses += [FakeResponse(200, {"t": 1}), FakeResponse(502, {"error": "down"}), FakeResponse(502)]
+    assert asyncio.run(cache.get_async(URL, 0, parse_async)) == {"t": 1}
+    assert asyncio.run(cache.get_async(URL, 0, parse_async)) == {"t": 1}
+    with pytest.raises(OSError):
+        asyncio.run(ResponseCache(flash_dir=None).get_async(URL, 0, parse_async))
@@ -0,0 +1,184 @@
+import os, sys, types
+
+import pytest
+
+from drivers.ILI9488 import ILI9488, RGB
+from drivers.xglcd_font import XglcdFont
+from fakes import FakePanel, FakePin
+from ui.compositor import Compositor
+from ui.fields import TextField
+import ui.flushqueue
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+BLACK = ILI9488.BLACK
+WHITE = ILI9488.WHITE
+GREEN = RGB(140, 240, 140)
+STATUS_COLORS = {"OPEN": RGB(0, 205, 0), "CLOSED": RGB(230, 0, 0), "STATUS UNKNOWN": RGB(255, 150, 0)}
+
+STATION_ICONS = [os.path.join(SRC, "symbols", "unknown-station.idx666")] * 3
+WEATHER_SYMBOLS = [os.path.join(SRC, "symbols", name) for name in
+                   ("thermometer.idx666", "raindrop.rle666", "lowest-temperature.rle666", "highest-temperature.idx666")]
+STATION_LABELS = [("id1", "ARAL Tankstelle", "Super E10"), ("id2", "", ""), ("id3", "Shell", "")]
+FUEL_TYPE = "e10"
+TIMEDATE = ["SUNDAY", "12.10.2025", "14:05"]
+WEATHER_DATA = ["18`C", "20%", "11`C", "21`C"]
+WEATHER_ICON = os.path.join(SRC, "weather_icons", "partly-cloudy-day.rle666")
+STATUSES = ["OPEN", "CLOSED", "STATUS UNKNOWN"]
+PRICES = ["1,79", "1,84", "-,--"]
+
+@pytest.fixture(scope="module")
+def fonts():
+    return (XglcdFont(os.path.join(SRC, "fonts", "ILIFont10x19.xfnt")),
+            XglcdFont(os.path.join(SRC, "fonts", "PriceFont15x33.xfnt")))
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path, fonts):
+    """A DisplayManager driving a FakePanel, with the bus wiring of the dashboard."""
+    panel = FakePanel()
+    def pin(number, *args, **kwargs):
+        fake = FakePin()
+        if number == 12:
+            panel.dc = fake # Data/command pin of the display
+        return fake
+    machine = types.ModuleType("machine")
+    machine.Pin = pin
+    machine.SPI = lambda *args, **kwargs: panel
+    monkeypatch.setitem(sys.modules, "machine", machine)
+    monkeypatch.delitem(sys.modules, "managers.DisplayManager", raising=False)
+    monkeypatch.setattr(ui.flushqueue, "_thread", None) # Send queued writes right away
+    monkeypatch.chdir(tmp_path) # The layout snapshot is written to the working directory
+    from managers.DisplayManager import DisplayManager
+    return DisplayManager(fonts[0], fonts[1]), panel
+
+def draw_before(fonts, timedate, weather_data, weather_icon, statuses, prices):
+    """Draws the main layout with data the way DisplayManager did before the widget tree.
+
+    Returns:
+        FakePanel: The panel it was drawn on.
+    """
+    font, price_font = fonts
+    dc = FakePin()
+    panel = FakePanel(dc)
+    display = ILI9488(panel, FakePin(), dc, FakePin(), 0, font)
+
+    # Static layout
+    display.fill_screen(WHITE)
+    display.fill_rect(398, 0, 2, 80, BLACK)
+    for i in range(2):
+        display.fill_rect(0, 80 + 80 * i, 480, 2, BLACK)
+    display.fill_rect(0, 39, 400, 2, BLACK)
+    display.fill_rect(143, 0, 2, 40, BLACK)
+    display.fill_rect(298, 0, 2, 40, BLACK)
+    display.fill_rect(0, 160, 480, 2, BLACK)
+    display.fill_rect(0, 240, 480, 2, BLACK)
+    display.fill_rect(330, 80, 2, 240, BLACK)
+    for x, y, symbol in zip((3, 101, 199, 297), (44, 43, 44, 43), WEATHER_SYMBOLS):
+        display.image_file(x, y, 34, 34, symbol)
+    default_names = ["First Gas Station", "Second Gas Station", "Third Gas Station"]
+    for i in range(3):
+        display.image_file(8, 88 + 80 * i, 64, 64, STATION_ICONS[i])
+        display.fill_rect(332, 82 + 80 * i, 148, 78, GREEN)
+        display.text(90, 89 + 80 * i, STATION_LABELS[i][1][:21] or default_names[i], BLACK, 1, WHITE)
+        display.text(90, 111 + 80 * i, STATION_LABELS[i][2][:21] or "Gas Price (E10)", BLACK, 1, WHITE)
+
+    # Retained fields
+    compositor = Compositor(display)
+    def field(x, y, width, height, background, field_font=font, scale=1, spacing=1):
+        region = compositor.region(x, y, width, height, background)
+        return TextField(region, x, y, field_font, BLACK, background, scale, spacing)
+    weekday = compositor.region(0, 0, 142, 39, WHITE)
+    date, clock = field(167, 11, 109, 19, WHITE), field(322, 11, 54, 19, WHITE)
+    weather_fields = [field(42 + 98 * i, 51, 54, 19, WHITE) for i in range(4)]
+    status_fields = [field(90, 133 + 80 * i, 153, 19, WHITE) for i in range(3)]
+    price_fields = [field(343, 91 + 80 * i, 126, 66, GREEN, price_font, 2, 6) for i in range(3)]
+
+    weekday.fill_rect(0, 0, 142, 39, WHITE)
+    weekday.text(23 + (98 - font.measure_text(timedate[0])) // 2, 11, timedate[0],
+                 ILI9488.RED if timedate[0] == "SUNDAY" else BLACK, font)
+    date.set(timedate[1])
+    clock.set(timedate[2])
+    for weather_field, value in zip(weather_fields, weather_data):
+        weather_field.set(value)
+    compositor.flush()
+    display.image_file(400, 0, 80, 80, weather_icon)
+    for status_field, status in zip(status_fields, statuses):
+        status_field.set(status, STATUS_COLORS[status])
+    for price_field, price in zip(price_fields, prices):
+        price_field.set(price)
+    compositor.flush()
+    return panel
+
+def draw_text(font, text):
+    """Renders a line of text with display.text and returns its pixels."""
+    dc = FakePin()
+    panel = FakePanel(dc)
+    display = ILI9488(panel, FakePin(), dc, FakePin(), 0, font)
+    display.text(0, 0, text, BLACK, 1, WHITE)
+    width = sum(font.get_glyph(letter, BLACK, WHITE)[1] + 1 for letter in text) - 1
+    return panel.region(0, 0, width, font.height)
+
+def draw_all(manager, timedate, weather_data, weather_icon, statuses, prices):
+    manager.draw_weekday_date_time(timedate)
+    manager.draw_weather_data(weather_data, weather_icon)
+    manager.draw_station_data(statuses, prices)
+    manager.flush()
+
+def inside(windows, x, y, width, height):
+    return all(x <= x0 <= x1 < x + width and y <= y0 <= y1 < y + height for x0, y0, x1, y1, _ in windows)
+
+def test_widget_tree_draws_the_layout_as_before(manager, fonts):
+    manager, panel = manager
+    manager.draw_main_layout(STATION_ICONS, WEATHER_SYMBOLS, STATION_LABELS, FUEL_TYPE)
+    draw_all(manager, TIMEDATE, WEATHER_DATA, WEATHER_ICON, STATUSES, PRICES)
+    before = draw_before(fonts, TIMEDATE, WEATHER_DATA, WEATHER_ICON, STATUSES, PRICES)
+    assert panel.memory == before.memory
+
+def test_unchanged_data_is_not_redrawn(manager):
+    manager, panel = manager
+    manager.draw_main_layout(STATION_ICONS, WEATHER_SYMBOLS, STATION_LABELS, FUEL_TYPE)
+    draw_all(manager, TIMEDATE, WEATHER_DATA, WEATHER_ICON, STATUSES, PRICES)
+    panel.reset_windows()
+    draw_all(manager, TIMEDATE, WEATHER_DATA, WEATHER_ICON, STATUSES, PRICES)
+    assert panel.windows == []
+
+def test_only_changed_widgets_are_redrawn(manager, fonts):
+    manager, panel = manager
+    manager.draw_main_layout(STATION_ICONS, WEATHER_SYMBOLS, STATION_LABELS, FUEL_TYPE)
+    draw_all(manager, TIMEDATE, WEATHER_DATA, WEATHER_ICON, STATUSES, PRICES)
+
+    timedate = TIMEDATE[:2] + ["14:06"]
+    panel.reset_windows()
+    manager.draw_weekday_date_time(timedate)
+    manager.flush()
+    assert panel.windows and inside(panel.windows, 322, 11, 54, 19)
+
+    weather_data = WEATHER_DATA[:1] + ["30%"] + WEATHER_DATA[2:]
+    panel.reset_windows()
+    manager.draw_weather_data(weather_data, WEATHER_ICON)
+    manager.flush()
+    assert panel.windows and inside(panel.windows, 140, 51, 54, 19)
+
+    weather_icon = os.path.join(SRC, "weather_icons", "rain.rle666")
+    panel.reset_windows()
+    manager.draw_weather_data(weather_data, weather_icon)
+    manager.flush()
+    assert panel.windows and inside(panel.windows, 400, 0, 80, 80)
+
+    statuses = STATUSES[:1] + ["OPEN"] + STATUSES[2:]
+    panel.reset_windows()
+    manager.draw_station_data(statuses, PRICES)
+    manager.flush()
+    assert panel.windows and inside(panel.windows, 90, 213, 153, 19)
+
+    before = draw_before(fonts, timedate, weather_data, weather_icon, statuses, PRICES)
+    assert panel.memory == before.memory
+
+def test_more_stations_get_default_names(manager, fonts):
+    manager, panel = manager
+    labels = STATION_LABELS + [("id4", "", "")]
+    manager.draw_main_layout(STATION_ICONS + STATION_ICONS[:1], WEATHER_SYMBOLS, labels, FUEL_TYPE)
+    assert [station["name"] for station in manager.widgets["stations"]] == \
+        ["ARAL Tankstelle", "Second Gas Station", "Shell", "Gas Station 4"]
+    # The fourth row starts at 80 + 3 * 60 and shows the default name
+    expected = draw_text(fonts[0], "Gas Station 4")
+    assert panel.region(90, 269, len(expected) // (3 * 19), 19) == expected
@@ -0,0 +1,199 @@
+import asyncio, json, shutil, socket, ssl, subprocess, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from net import http
+
+class Handler(BaseHTTPRequestHandler):
+    """Answers with the path and the number of the connection it was received on."""
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections.append(self.connection)
+            self.number = len(self.server.connections)
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path == "/redirect":
+            self.__send(302, b"", {"Location": "/data"})
+        elif self.path == "/moved":
+            self.__send(301, b"moved", {"Location": f"https://localhost:{self.server.server_port}/data"})
+        elif self.path == "/loop":
+            self.__send(302, b"", {"Location": "/loop"})
+        elif self.path == "/close":
+            self.__send(200, self.__body(), {"Connection": "close"})
+            self.close_connection = True
+        else:
+            self.__send(200, self.__body())
+
+    def __body(self):
+        return json.dumps({"path": self.path, "connection": self.number}).encode()
+
+    def __send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class LocalServer(ThreadingHTTPServer):
+    """Stand-in HTTPS server on localhost that records its connections."""
+    daemon_threads = True
+
+    def __init__(self, context):
+        super().__init__(("localhost", 0), Handler)
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+        self.lock = threading.Lock()
+        self.connections = []
+        self.requests = []
+
+    def drop_connections(self):
+        """Closes all open connections, like a server whose keep-alive timeout expired."""
+        with self.lock:
+            for connection in self.connections:
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+@pytest.fixture(scope="module")
+def certificate(tmp_path_factory):
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is needed to create the certificate of the local server")
+    directory = tmp_path_factory.mktemp("tls")
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost",
+                    "-keyout", str(key), "-out", str(cert)], check=True, capture_output=True)
+    return str(cert), str(key)
+
+def serve(certificate):
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(*certificate)
+    server = LocalServer(context)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.drop_connections()
+    server.server_close()
+
+@pytest.fixture
+def server(certificate):
+    yield from serve(certificate)
+
+@pytest.fixture
+def other_server(certificate):
+    yield from serve(certificate)
+
+@pytest.fixture
+def client(certificate):
+    client = http.HttpClient(timeout=5, ssl_context=ssl.create_default_context(cafile=certificate[0]))
+    yield client
+    client.close()
+
+@pytest.fixture
+def async_client(certificate):
+    client = http.AsyncHttpClient(timeout=5, ssl_context=ssl.create_default_context(cafile=certificate[0]))
+    yield client
+    client.close()
+
+def url(server, path):
+    return f"https://localhost:{server.server_port}{path}"
+
+def fetch(client, server, path):
+    response = client.get(url(server, path))
+    try:
+        return response.status_code, response.json()
+    finally:
+        response.close()
+
+def test_connection_is_reused(client, server):
+    answers = [fetch(client, server, f"/data?{i}") for i in range(3)]
+    assert [status for status, _ in answers] == [200] * 3
+    assert [body["connection"] for _, body in answers] == [1, 1, 1]
+    assert client.connections_opened == 1
+    assert len(server.connections) == 1
+
+def test_unread_body_is_drained_to_keep_the_connection(client, server):
+    client.get(url(server, "/data")).close()
+    assert fetch(client, server, "/data")[1]["connection"] == 1
+    assert client.connections_opened == 1
+
+def test_reconnects_after_the_server_closed_the_idle_connection(client, server):
+    assert fetch(client, server, "/data")[1]["connection"] == 1
+    server.drop_connections()
+    status, body = fetch(client, server, "/data")
+    assert status == 200
+    assert body["connection"] == 2
+    assert client.connections_opened == 2
+    # The new connection resumed the TLS session of the first one
+    assert client.pool[("https", "localhost", server.server_port)][-1].stream.session_reused
+
+def test_connection_close_is_honoured(client, server):
+    assert fetch(client, server, "/close")[1]["connection"] == 1
+    assert client.pool.get(("https", "localhost", server.server_port)) in (None, [])
+    assert fetch(client, server, "/data")[1]["connection"] == 2
+
+def test_idle_connection_times_out(certificate, server):
+    client = http.HttpClient(timeout=5, idle_timeout=0, ssl_context=ssl.create_default_context(cafile=certificate[0]))
+    try:
+        fetch(client, server, "/data")
+        fetch(client, server, "/data")
+        assert client.connections_opened == 2
+    finally:
+        client.close()
+
+def test_timed_out_connections_of_other_hosts_are_closed(client, server, other_server, monkeypatch):
+    now = [0]
+    monkeypatch.setattr(http, "ticks_ms", lambda: now[0])
+    fetch(client, server, "/data")
+    old = client.pool[("https", "localhost", server.server_port)][-1]
+    now[0] += http.IDLE_TIMEOUT
+    fetch(client, other_server, "/data")
+    assert old.sock.fileno() == -1
+    assert list(client.pool) == [("https", "localhost", other_server.server_port)]
+
+def test_redirects_are_followed_on_the_same_connection(client, server):
+    for path in ("/redirect", "/moved"):
+        status, body = fetch(client, server, path)
+        assert status == 200
+        assert body["path"] == "/data"
+    assert server.requests == ["/redirect", "/data", "/moved", "/data"]
+    assert client.connections_opened == 1
+
+def test_redirect_loop_is_stopped(client, server):
+    with pytest.raises(OSError):
+        client.get(url(server, "/loop"))
+    assert len(server.requests) == http.MAX_REDIRECTS + 1
+
+async def fetch_async(client, server, path):
+    response = await client.get(url(server, path))
+    try:
+        return response.status_code, await response.json()
+    finally:
+        response.close()
+
+def test_async_connection_is_reused(async_client, server):
+    async def run():
+        return [await fetch_async(async_client, server, "/data") for _ in range(3)]
+    assert [body["connection"] for _, body in asyncio.run(run())] == [1, 1, 1]
+    assert async_client.connections_opened == 1
+
+def test_async_pool_of_a_finished_event_loop_is_closed(async_client, server):
+    key = ("https", "localhost", server.server_port)
+    asyncio.run(fetch_async(async_client, server, "/data"))
+    old = async_client.pool[key][-1]
+    assert old.writer.get_extra_info("socket").fileno() != -1
+    # The next asyncio.run() has a new event loop, the connection of the previous one cannot be reused
+    assert asyncio.run(fetch_async(async_client, server, "/data"))[1]["connection"] == 2
+    assert old.writer.get_extra_info("socket").fileno() == -1
+    assert async_client.pool[key] == [async_client.pool[key][-1]] and async_client.pool[key][-1] is not old
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from drivers.ILI9488 import ILI9488
+from drivers.xglcd_font import XglcdFont
+from fakes import FakePin, FakeSPI, measure
+
+FONTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "fonts")
+
+@pytest.fixture
+def bus():
+    spi, cs, dc, rst = FakeSPI(), FakePin(), FakePin(), FakePin()
+    font = XglcdFont(os.path.join(FONTS, "ILIFont10x19.xfnt"))
+    display = ILI9488(spi, cs, dc, rst, 0, font)
+    return display, cs, dc
+
+def test_init_display_is_one_transaction(bus):
+    display, cs, dc = bus
+    frames, writes, _, _ = measure(display, cs, dc, display.init_display)
+    assert frames == 1
+    assert writes == 26 # 14 commands, 12 of them with parameters
+
+def test_set_window_is_one_transaction(bus):
+    display, cs, dc = bus
+    assert measure(display, cs, dc, lambda: display.set_window(10, 10, 20, 20)) == (1, 5, 11, 5)
+
+def test_pixel_is_one_transaction(bus):
+    display, cs, dc = bus
+    assert measure(display, cs, dc, lambda: display.pixel(10, 10, ILI9488.RED)) == (1, 6, 14, 6)
+
+def test_rotate_is_one_transaction(bus):
+    display, cs, dc = bus
+    assert measure(display, cs, dc, lambda: display.rotate(0)) == (1, 2, 2, 2)
+
+def test_fill_rect_is_one_transaction(bus):
+    display, cs, dc = bus
+    frames, writes, sent, toggles = measure(display, cs, dc, lambda: display.fill_rect(332, 82, 148, 78, ILI9488.GREEN))
+    assert frames == 1
+    assert sent == 11 + 3 * 148 * 78
+    # Window commands, then the pixels in stripe-sized bursts without switching back to commands
+    assert toggles == 6
+    assert writes == 5 + -(-3 * 148 * 78 // len(display._stripe))
+
+def test_text_with_background_is_one_window_write(bus):
+    display, cs, dc = bus
+    text = "STATUS UNKNOWN"
+    frames, writes, sent, toggles = measure(display, cs, dc, lambda: display.text(90, 133, text, ILI9488.BLACK, 1, ILI9488.WHITE))
+    widths = [display.font.get_glyph(letter, ILI9488.BLACK, ILI9488.WHITE)[1] for letter in text]
+    assert (frames, writes, toggles) == (1, 6, 6)
+    assert sent == 11 + 3 * (sum(widths) + len(text) - 1) * display.font.height
+
+def test_nested_transactions_assert_chip_select_once(bus):
+    display, cs, dc = bus
+    def draw():
+        with display.transaction():
+            display.fill_rect(0, 0, 10, 10, ILI9488.RED)
+            display.pixel(20, 20, ILI9488.BLUE)
+            display.write_cmd(0x00)
+    frames, _, _, _ = measure(display, cs, dc, draw)
+    assert frames == 1
+    assert cs.level == 1
+
+def record_pixels(display, action):
+    """Runs a drawing action and counts how often each pixel was sent by fill_rect."""
+    pixels = {}
+    def fill_rect(x, y, width, height, color):
+        for px in range(x, x + width):
+            for py in range(y, y + height):
+                pixels[(px, py)] = pixels.get((px, py), 0) + 1
+    display.fill_rect = fill_rect
+    try:
+        action()
+    finally:
+        del display.fill_rect
+    return pixels
+
+@pytest.mark.parametrize("w, h, r", [(1, 1, 0), (21, 21, 10), (81, 81, 40), (148, 78, 10), (30, 9, 4), (9, 40, 4)])
+def test_filled_shapes_send_every_pixel_once(bus, w, h, r):
+    display = bus[0]
+    outline = record_pixels(display, lambda: display.round_rect(100, 100, w, h, r, ILI9488.BLACK))
+    filled = record_pixels(display, lambda: display.fill_round_rect(100, 100, w, h, r, ILI9488.BLACK))
+    assert max(filled.values()) == 1
+    # The filled shape spans each row of the outline from its leftmost to its rightmost pixel
+    rows = {}
+    for x, y in outline:
+        low, high = rows.get(y, (x, x))
+        rows[y] = (min(low, x), max(high, x))
+    assert set(filled) == {(x, y) for y, (low, high) in rows.items() for x in range(low, high + 1)}
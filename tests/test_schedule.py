@@ -0,0 +1,98 @@
+import calendar, time
+
+import pytest
+
+from managers.ScheduleManager import ScheduleManager
+from managers.TimeManager import TimeManager
+
+CENTRAL_EUROPE = "CET-1CEST,M3.5.0,M10.5.0/3"
+UPDATE_HOUR = 3
+
+class FakeClock:
+    """UTC clock that only moves when the scheduler sleeps."""
+    def __init__(self, utc):
+        self.utc = utc
+
+    def time(self):
+        return self.utc
+
+    def sleep(self, seconds):
+        assert seconds > 0
+        self.utc += seconds
+
+def run(start, end, rule=CENTRAL_EUROPE):
+    """Runs the schedule of the dashboard on a fake clock from one UTC time to another.
+
+    Returns:
+        dict: The local times (year, month, mday, hour, minute, second) each task ran at.
+    """
+    clock = FakeClock(start)
+    tmgr = TimeManager(rule)
+    tmgr._time = clock.time
+    tmgr._localtime = time.gmtime
+    runs = {"sync": [], "minute": [], "update": [], "data": []}
+    def task(name):
+        return lambda: runs[name].append(tuple(tmgr.get_timestamp()[:6]))
+
+    # Same tasks and order as the main loop
+    scheduler = ScheduleManager(tmgr.get_local_time, clock.sleep)
+    scheduler.add(task("sync"), 3600)
+    scheduler.add(task("minute"), 60)
+    scheduler.add(task("update"), 24 * 3600, UPDATE_HOUR * 3600 + 61)
+    scheduler.add(task("data"), 300, 61)
+    while clock.utc <= end:
+        scheduler.run_pending()
+        scheduler.sleep()
+    return runs
+
+def utc(*date):
+    return calendar.timegm(date + (0,) * (6 - len(date)))
+
+def clock_times(runs):
+    return [(hour, minute, second) for _, _, _, hour, minute, second in runs]
+
+def test_ordinary_day():
+    # Local midnight of 2025-10-20 is 22:00 UTC the day before (CEST, UTC+2)
+    runs = run(utc(2025, 10, 19, 22), utc(2025, 10, 20, 22))
+    assert clock_times(runs["minute"]) == [(m // 60 % 24, m % 60, 0) for m in range(1, 24 * 60 + 1)]
+    assert clock_times(runs["data"]) == [(m // 60, m % 60, 1) for m in range(1, 24 * 60, 5)]
+    assert runs["update"] == [(2025, 10, 20, 3, 1, 1)]
+    assert clock_times(runs["sync"]) == [(h % 24, 0, 0) for h in range(1, 25)]
+
+def test_end_of_summer_time():
+    # 2025-10-26 has 25 hours, at 03:00 CEST the clock goes back to 02:00 CET
+    runs = run(utc(2025, 10, 25, 22), utc(2025, 10, 26, 23))
+    repeated = [(2, m, 0) for m in range(60)]
+    minutes = [(m // 60 % 24, m % 60, 0) for m in range(1, 24 * 60 + 1)]
+    assert clock_times(runs["minute"]) == minutes[:179] + repeated + minutes[179:]
+    assert len(runs["data"]) == 300
+    assert all(minute % 5 == 1 and second == 1 for _, minute, second in clock_times(runs["data"]))
+    # The update check runs once, after the clock went back
+    assert runs["update"] == [(2025, 10, 26, 3, 1, 1)]
+    assert len(runs["sync"]) == 25
+
+def test_start_of_summer_time():
+    # 2025-03-30 has 23 hours, at 02:00 CET the clock jumps to 03:00 CEST
+    runs = run(utc(2025, 3, 29, 23), utc(2025, 3, 30, 22))
+    minutes = [(m // 60 % 24, m % 60, 0) for m in range(1, 24 * 60 + 1)]
+    # The tick due at 02:00 runs once at 03:00, the skipped hour is not made up for
+    assert clock_times(runs["minute"]) == minutes[:119] + minutes[179:]
+    # The update due at 02:01:01 runs once when the clock reaches 03:00:00
+    data = clock_times(runs["data"])
+    assert data == [(m // 60, m % 60, 1) for m in range(1, 120, 5)] + [(3, 0, 0)] + [(m // 60, m % 60, 1) for m in range(181, 24 * 60, 5)]
+    assert runs["update"] == [(2025, 3, 30, 3, 1, 1)]
+    assert len(runs["sync"]) == 23
+
+def test_clock_set_back_by_synchronization():
+    clock = FakeClock(utc(2025, 10, 20, 12, 0, 30))
+    ran = []
+    scheduler = ScheduleManager(clock.time, clock.sleep)
+    scheduler.add(lambda: ran.append(clock.utc), 300, 61)
+    scheduler.run_pending()
+    assert scheduler.time_until_next() == 31
+    # Without rescheduling, the task would only run again in an hour
+    clock.utc -= 3600
+    assert scheduler.time_until_next() == 31
+    scheduler.sleep()
+    scheduler.run_pending()
+    assert ran == [utc(2025, 10, 20, 11, 1, 1)]
@@ -0,0 +1,128 @@
+import os
+
+import pytest
+
+from drivers.ILI9488 import ILI9488
+from drivers.xglcd_font import XglcdFont
+from fakes import FakePanel, FakePin
+from ui.ticker import Ticker
+
+FONTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "fonts")
+BLACK = ILI9488.BLACK
+WHITE = ILI9488.WHITE
+
+@pytest.fixture(scope="module")
+def font():
+    return XglcdFont(os.path.join(FONTS, "ILIFont10x19.xfnt"))
+
+def make_display(font):
+    dc = FakePin()
+    panel = FakePanel(dc)
+    display = ILI9488(panel, FakePin(), dc, FakePin(), 0, font)
+    display.fill_screen(WHITE)
+    return display, panel
+
+def text_image(font, message):
+    """Renders a message with display.text and returns its columns and width."""
+    display, panel = make_display(font)
+    display.text(0, 0, message, BLACK, 1, WHITE)
+    width = sum(font.get_glyph(letter, BLACK, WHITE)[1] + 1 for letter in message) - 1
+    return panel, width
+
+def expected_strip(font, ticker, starts, images, width):
+    """Builds the text rows the strip should show from the messages scrolled in so far."""
+    left = ticker.position - width
+    rows = []
+    for row in range(font.height):
+        line = bytearray(bytes(WHITE) * width)
+        for start, (panel, text_width) in zip(starts, images):
+            first = max(start, left)
+            last = min(start + text_width, left + width)
+            if first < last:
+                line[3 * (first - left):3 * (last - left)] = panel.region(first - start, row, last - first, 1)
+        rows.append(bytes(line))
+    return b"".join(rows)
+
+def run_ticker(font, ticker, panel, messages, area, late_message=None):
+    """Steps a ticker until it stops and checks the strip after every step.
+
+    Returns:
+        int: The most pixels sent in a single step.
+    """
+    images = []
+    starts = []
+    seen = []
+    for message in messages:
+        ticker.add(message)
+    queued = list(messages)
+    most = 0
+    steps = 0
+    while True:
+        panel.reset_windows()
+        if not ticker.step():
+            break
+        steps += 1
+        if late_message is not None and steps == 40:
+            ticker.add(late_message)
+            queued.append(late_message)
+        most = max(most, sum(window[4] for window in panel.windows))
+        for run in ticker.runs:
+            if not any(run is other for other in seen):
+                seen.append(run)
+                starts.append(run[0])
+                images.append(text_image(font, queued[len(images)]))
+        x, y, width = area
+        assert panel.region(x, y + ticker.text_y, width, font.height) == expected_strip(font, ticker, starts, images, width)
+    assert len(images) == len(queued)
+    return most
+
+def test_software_strip_redraws_only_the_text(font):
+    display, panel = make_display(font)
+    ticker = Ticker(display, 0, 50, 398, 21, font, BLACK, WHITE)
+    most = run_ticker(font, ticker, panel, ["Weather data unavailable", "ARAL: 1,79 -> 1,75"], (0, 50, 398), "Connection restored")
+    # At most the text rows are sent, never the whole strip
+    assert most <= 398 * font.height
+    assert not ticker.active
+    assert ticker.runs == []
+    # The rows above and below the text were only cleared when the ticker started
+    assert panel.region(0, 50, 398, 1) == bytes(WHITE) * 398
+    assert panel.region(0, 70, 398, 1) == bytes(WHITE) * 398
+
+def test_software_strip_sends_only_the_columns_of_the_text(font):
+    display, panel = make_display(font)
+    ticker = Ticker(display, 0, 50, 398, 21, font, BLACK, WHITE)
+    _, text_width = text_image(font, "Connection restored")
+    most = run_ticker(font, ticker, panel, ["Connection restored"], (0, 50, 398))
+    assert most <= (text_width + 1 + ticker.step_width) * font.height
+
+def test_software_strip_stays_within_its_bounds(font):
+    display, panel = make_display(font)
+    ticker = Ticker(display, 0, 50, 398, 21, font, BLACK, WHITE)
+    ticker.add("Station data unavailable")
+    while True:
+        panel.reset_windows()
+        if not ticker.step():
+            break
+        for x0, y0, x1, y1, pixels in panel.windows:
+            assert 0 <= x0 <= x1 < 398 and 51 <= y0 <= y1 <= 69
+
+def test_full_height_band_scrolls_in_hardware(font):
+    display, panel = make_display(font)
+    ticker = Ticker(display, 100, 0, 200, 320, font, BLACK, WHITE)
+    assert ticker.hardware
+    most = run_ticker(font, ticker, panel, ["Connection restored", "Hi"], (100, 0, 200), "Price 1,79")
+    # Only the newly exposed columns are written, the panel moves the rest
+    assert most == ticker.step_width * font.height
+    assert panel.scroll_area == (0, 480, 0)
+    assert panel.scroll_start == 0
+
+def test_clear_blanks_the_strip(font):
+    display, panel = make_display(font)
+    ticker = Ticker(display, 0, 50, 398, 21, font, BLACK, WHITE)
+    ticker.add("Weather data unavailable")
+    for _ in range(100):
+        ticker.step()
+    ticker.clear()
+    assert not ticker.active
+    assert not ticker.step()
+    assert panel.region(0, 50, 398, 21) == bytes(WHITE) * (398 * 21)
@@ -0,0 +1,20 @@
+import pytest
+
+from managers.TimeManager import PosixTimezone, TimeManager
+
+@pytest.mark.parametrize("rule", [3600, 1.5, ["CET-1CEST,M3.5.0,M10.5.0/3"], {"rule": "UTC0"}, "CET-1CEST,M3"])
+def test_invalid_rule_is_rejected(rule):
+    with pytest.raises(ValueError):
+        PosixTimezone(rule)
+
+@pytest.mark.parametrize("rule", [3600, ["CET-1CEST,M3.5.0,M10.5.0/3"], "CET-1CEST,M3"])
+def test_invalid_configured_rule_is_ignored(rule):
+    tmgr = TimeManager(rule)
+    tmgr._time = lambda: 1760000000
+    assert tmgr.rule is None
+    assert tmgr.get_local_time() == 1760000000
+
+def test_configured_rule_sets_the_offset():
+    tmgr = TimeManager("CET-1CEST,M3.5.0,M10.5.0/3")
+    tmgr._time = lambda: 1760000000 # 2025-10-09, summer time
+    assert tmgr.get_local_time() == 1760000000 + 7200